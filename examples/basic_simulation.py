@@ -6,17 +6,19 @@ This script demonstrates how to run a basic simulation and visualize results.
 """
 
 import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import matplotlib
+if not sys.stdout.isatty():
+    # Headless/batch run: skip GUI backend initialization
+    matplotlib.use('Agg')
 
-from reserveflow import ReserveFlowSimulation, DefaultConfig
+from reserveflow import ReserveFlowSimulation, DefaultConfig, make_rng
+from reserveflow.analysis import save_results
 from reserveflow.visualization.charts import (
     create_exchange_rate_chart, 
     create_precious_metals_chart,
     create_risk_dashboard,
     create_matplotlib_summary
 )
-import pandas as pd
 
 
 def main():
@@ -26,7 +28,7 @@ def main():
     
     # Create simulation with default configuration
     config = DefaultConfig()
-    config.random_seed = 42  # For reproducible results
+    config.rng = make_rng(42)  # For reproducible results
     
     sim = ReserveFlowSimulation(config)
     
@@ -40,31 +42,30 @@ def main():
     print("\nSimulation Summary:")
     print("-" * 20)
     
+    # Summary statistics are accumulated during the run, no pass over results needed
+    stats = sim.running_stats
+    
     # Gold price statistics
-    if 'gold_price' in results.columns:
-        initial_gold = results['gold_price'].iloc[0]
-        final_gold = results['gold_price'].iloc[-1]
-        gold_return = (final_gold / initial_gold - 1) * 100
-        print(f"Gold Price: ${initial_gold:.2f} → ${final_gold:.2f} ({gold_return:+.1f}%)")
+    gold = stats['gold_price']
+    if gold.count:
+        gold_return = (gold.last / gold.first - 1) * 100
+        print(f"Gold Price: ${gold.first:.2f} → ${gold.last:.2f} ({gold_return:+.1f}%)")
     
     # Geopolitical risk statistics
-    if 'geopolitical_risk' in results.columns:
-        avg_risk = float(results['geopolitical_risk'].mean())
-        max_risk = float(results['geopolitical_risk'].max())
-        print(f"Geopolitical Risk: Avg={avg_risk:.3f}, Max={max_risk:.3f}")
+    geo_risk = stats['geopolitical_risk']
+    if geo_risk.count:
+        print(f"Geopolitical Risk: Avg={geo_risk.mean:.3f}, Max={geo_risk.max:.3f}")
     
     # Market stress statistics
-    if 'market_stress' in results.columns:
-        avg_stress = float(results['market_stress'].mean())
-        max_stress = float(results['market_stress'].max())
-        print(f"Market Stress: Avg={avg_stress:.3f}, Max={max_stress:.3f}")
+    market_stress = stats['market_stress']
+    if market_stress.count:
+        print(f"Market Stress: Avg={market_stress.mean:.3f}, Max={market_stress.max:.3f}")
     
     # USD Index statistics
-    if 'usd_index' in results.columns:
-        initial_usd = float(results['usd_index'].iloc[0])
-        final_usd = float(results['usd_index'].iloc[-1])
-        usd_change = final_usd - initial_usd
-        print(f"USD Index: {initial_usd:.2f} → {final_usd:.2f} ({usd_change:+.2f})")
+    usd = stats['usd_index']
+    if usd.count:
+        usd_change = usd.last - usd.first
+        print(f"USD Index: {usd.first:.2f} → {usd.last:.2f} ({usd_change:+.2f})")
     
     # Create and display visualizations
     print("\nGenerating visualizations...")
@@ -97,9 +98,8 @@ def main():
     except Exception as e:
         print(f"Warning: Could not create all visualizations: {e}")
     
-    # Save results to CSV
-    results_file = "simulation_results.csv"
-    results.to_csv(results_file)
+    # Save results
+    results_file = save_results(results, "simulation_results.csv")
     print(f"✓ Results saved to '{results_file}'")
     
     print("\nBasic simulation completed successfully!")
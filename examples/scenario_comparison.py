@@ -5,14 +5,81 @@ ReserveFlow Scenario Comparison Example
 This script runs multiple scenarios and compares their outcomes.
 """
 
+import multiprocessing
 import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import matplotlib
+if not sys.stdout.isatty():
+    # Headless/batch run: skip GUI backend initialization
+    matplotlib.use('Agg')
 
 from reserveflow import ReserveFlowSimulation, DefaultConfig
+from reserveflow.analysis import crisis_days, save_records, save_results_many
 from reserveflow.visualization.charts import create_scenario_comparison, save_charts_to_html
-import pandas as pd
-import matplotlib.pyplot as plt
+import numpy as np
+
+
+DURATION_MONTHS = 18
+
+# Bar colors for the summary chart, one per scenario
+SCENARIO_COLORS = ('blue', 'red', 'green', 'orange')
+
+
+def _run_one(scenario_name):
+    """Run a single scenario in a worker process"""
+    config = DefaultConfig()
+    config.random_seed = 42  # Same seed in every worker for reproducible results
+    sim = ReserveFlowSimulation(config)
+    try:
+        results = sim.run_scenario(scenario_name, duration_months=DURATION_MONTHS)
+        return scenario_name, results, None
+    except Exception as e:
+        return scenario_name, None, str(e)
+
+
+def _column(df, col):
+    """Pull a results column into a float64 NumPy array"""
+    return np.asarray(df[col].to_numpy(), dtype=np.float64)
+
+
+def _summarize(df) -> dict:
+    """Compute the comparison metrics for one scenario, one pass per column"""
+    metrics = {}
+    
+    # Gold price performance
+    if 'gold_price' in df.columns:
+        gold = _column(df, 'gold_price')
+        metrics['Gold Return (%)'] = (gold[-1] / gold[0] - 1) * 100
+        metrics['Gold Volatility (%)'] = np.std(np.diff(gold) / gold[:-1], ddof=1) * 100
+    
+    # Geopolitical risk metrics
+    if 'geopolitical_risk' in df.columns:
+        geo_risk = _column(df, 'geopolitical_risk')
+        metrics['Avg Geo Risk'] = geo_risk.mean()
+        metrics['Max Geo Risk'] = geo_risk.max()
+    
+    # Market stress metrics
+    if 'market_stress' in df.columns:
+        stress = _column(df, 'market_stress')
+        metrics['Avg Market Stress'] = stress.mean()
+        metrics['Crisis Days'] = crisis_days(df)
+    
+    # USD strength
+    if 'usd_index' in df.columns:
+        usd = _column(df, 'usd_index')
+        metrics['USD Change'] = usd[-1] - usd[0]
+    
+    return metrics
+
+
+def _format_table(rows) -> str:
+    """Render a list of metric dicts as a right-aligned text table"""
+    columns = list(dict.fromkeys(key for row in rows for key in row))
+    cells = [[f"{row[col]:.2f}" if isinstance(row.get(col), float) else str(row.get(col, 'NaN'))
+              for col in columns] for row in rows]
+    widths = [max(len(col), *(len(line[i]) for line in cells)) for i, col in enumerate(columns)]
+    lines = ['  '.join(col.rjust(width) for col, width in zip(columns, widths))]
+    lines.extend('  '.join(cell.rjust(width) for cell, width in zip(line, widths)) for line in cells)
+    return '\n'.join(lines)
 
 
 def main():
@@ -20,28 +87,25 @@ def main():
     print("ReserveFlow Scenario Comparison Example")
     print("=" * 45)
     
-    # Initialize simulation
-    sim = ReserveFlowSimulation(DefaultConfig())
-    
     # Define scenarios to run
     scenarios = ['baseline', 'crisis', 'dedollarization', 'inflation_surge']
-    duration_months = 18
+    duration_months = DURATION_MONTHS
     
     # Store results for each scenario
     scenario_results = {}
     
     print(f"Running {len(scenarios)} scenarios for {duration_months} months each...\n")
     
-    # Run each scenario
-    for i, scenario in enumerate(scenarios, 1):
-        print(f"Running scenario {i}/{len(scenarios)}: {scenario}")
-        try:
-            results = sim.run_scenario(scenario, duration_months=duration_months)
-            scenario_results[scenario] = results
-            print(f"✓ {scenario} completed ({len(results)} data points)")
-        except Exception as e:
-            print(f"✗ {scenario} failed: {e}")
+    # Scenarios are independent, so run them in parallel worker processes
+    with multiprocessing.Pool(processes=len(scenarios)) as pool:
+        outcomes = pool.map(_run_one, scenarios)
+    
+    for scenario, results, error in outcomes:
+        if error is not None:
+            print(f"✗ {scenario} failed: {error}")
             continue
+        scenario_results[scenario] = results
+        print(f"✓ {scenario} completed ({len(results)} data points)")
     
     if not scenario_results:
         print("No scenarios completed successfully!")
@@ -56,47 +120,9 @@ def main():
     comparison_data = []
     
     for scenario_name, results in scenario_results.items():
-        metrics = {}
-        metrics['Scenario'] = scenario_name
-        
-        # Gold price performance
-        if 'gold_price' in results.columns:
-            initial_gold = results['gold_price'].iloc[0]
-            final_gold = results['gold_price'].iloc[-1]
-            metrics['Gold Return (%)'] = (final_gold / initial_gold - 1) * 100
-            metrics['Gold Volatility (%)'] = results['gold_price'].pct_change().std() * 100
-        
-        # Geopolitical risk metrics
-        if 'geopolitical_risk' in results.columns:
-            avg_geo = results['geopolitical_risk'].mean()
-            max_geo = results['geopolitical_risk'].max()
-            # Ensure scalars
-            if hasattr(avg_geo, 'mean'):
-                avg_geo = avg_geo.mean()
-            if hasattr(max_geo, 'max'):
-                max_geo = max_geo.max()
-            metrics['Avg Geo Risk'] = avg_geo
-            metrics['Max Geo Risk'] = max_geo
-        
-        # Market stress metrics
-        if 'market_stress' in results.columns:
-            avg_stress = results['market_stress'].mean()
-            if hasattr(avg_stress, 'mean'):
-                avg_stress = avg_stress.mean()
-            metrics['Avg Market Stress'] = avg_stress
-            metrics['Crisis Days'] = (results['market_stress'] > 0.7).sum()
-        
-        # USD strength
-        if 'usd_index' in results.columns:
-            initial_usd = results['usd_index'].iloc[0]
-            final_usd = results['usd_index'].iloc[-1]
-            metrics['USD Change'] = final_usd - initial_usd
-        
-        comparison_data.append(metrics)
+        comparison_data.append({'Scenario': scenario_name, **_summarize(results)})
     
-    # Create comparison DataFrame
-    comparison_df = pd.DataFrame(comparison_data)
-    print(comparison_df.to_string(index=False, float_format='%.2f'))
+    print(_format_table(comparison_data))
     
     # Create visualizations
     print("\nGenerating comparison visualizations...")
@@ -109,60 +135,53 @@ def main():
         save_charts_to_html({'scenario_comparison': comparison_fig}, "output")
         print("✓ Scenario comparison chart saved to 'output/scenario_comparison.html'")
         
-        # Create summary statistics chart
+        # Create summary statistics chart; pandas is only needed for plotting
+        import matplotlib.pyplot as plt
+        import pandas as pd
+        
         fig, axes = plt.subplots(2, 2, figsize=(15, 10))
         fig.suptitle('Scenario Comparison Summary', fontsize=16)
         
-        # Gold return comparison
-        scenarios_list = list(scenario_results.keys())
-        gold_returns = [comparison_data[i].get('Gold Return (%)', 0) for i in range(len(scenarios_list))]
-        
-        axes[0, 0].bar(scenarios_list, gold_returns, color=['blue', 'red', 'green', 'orange'][:len(scenarios_list)])
-        axes[0, 0].set_title('Gold Price Returns by Scenario')
-        axes[0, 0].set_ylabel('Return (%)')
-        axes[0, 0].tick_params(axis='x', rotation=45)
-        
-        # Average geopolitical risk
-        geo_risks = [comparison_data[i].get('Avg Geo Risk', 0) for i in range(len(scenarios_list))]
-        
-        axes[0, 1].bar(scenarios_list, geo_risks, color=['blue', 'red', 'green', 'orange'][:len(scenarios_list)])
-        axes[0, 1].set_title('Average Geopolitical Risk')
-        axes[0, 1].set_ylabel('Risk Level')
-        axes[0, 1].tick_params(axis='x', rotation=45)
-        
-        # Crisis days
-        crisis_days = [comparison_data[i].get('Crisis Days', 0) for i in range(len(scenarios_list))]
-        
-        axes[1, 0].bar(scenarios_list, crisis_days, color=['blue', 'red', 'green', 'orange'][:len(scenarios_list)])
-        axes[1, 0].set_title('Crisis Days (Market Stress > 0.7)')
-        axes[1, 0].set_ylabel('Number of Days')
-        axes[1, 0].tick_params(axis='x', rotation=45)
-        
-        # USD strength change
-        usd_changes = [comparison_data[i].get('USD Change', 0) for i in range(len(scenarios_list))]
-        
-        axes[1, 1].bar(scenarios_list, usd_changes, color=['blue', 'red', 'green', 'orange'][:len(scenarios_list)])
-        axes[1, 1].set_title('USD Index Change')
-        axes[1, 1].set_ylabel('Index Points')
-        axes[1, 1].tick_params(axis='x', rotation=45)
+        # Plot all four metrics in one call, one subplot per metric
+        summary_metrics = [
+            ('Gold Return (%)', 'Gold Price Returns by Scenario', 'Return (%)'),
+            ('Avg Geo Risk', 'Average Geopolitical Risk', 'Risk Level'),
+            ('Crisis Days', 'Crisis Days (Market Stress > 0.7)', 'Number of Days'),
+            ('USD Change', 'USD Index Change', 'Index Points'),
+        ]
+        metrics_df = (pd.DataFrame.from_records(comparison_data, index='Scenario')
+                      .reindex(columns=[metric for metric, _, _ in summary_metrics])
+                      .fillna(0))
+        colors = SCENARIO_COLORS[:len(metrics_df)]
+        
+        metrics_df.plot.bar(subplots=True, ax=axes.ravel(), legend=False, rot=45)
+        
+        for ax, (_, title, ylabel) in zip(axes.ravel(), summary_metrics):
+            ax.set_title(title)
+            ax.set_ylabel(ylabel)
+            ax.set_xlabel('')
+            # Color bars by scenario rather than by metric
+            for bar, color in zip(ax.patches, colors):
+                bar.set_color(color)
         
         plt.tight_layout()
-        plt.savefig('scenario_comparison_summary.png', dpi=300, bbox_inches='tight')
-        plt.show()
+        plt.savefig('scenario_comparison_summary.png', dpi=150, bbox_inches='tight')
+        if sys.stdout.isatty():
+            plt.show()
         print("✓ Summary comparison chart saved as 'scenario_comparison_summary.png'")
         
     except Exception as e:
         print(f"Warning: Could not create all visualizations: {e}")
     
     # Save comparison data
-    comparison_df.to_csv('scenario_comparison.csv', index=False)
-    print("✓ Comparison data saved to 'scenario_comparison.csv'")
-    
-    # Save individual scenario results
-    for scenario_name, results in scenario_results.items():
-        filename = f"scenario_{scenario_name}_results.csv"
-        results.to_csv(filename)
-        print(f"✓ {scenario_name} results saved to '{filename}'")
+    comparison_file = save_records(comparison_data, 'scenario_comparison.csv')
+    print(f"✓ Comparison data saved to '{comparison_file}'")
+    
+    # Save individual scenario results, writing the files concurrently
+    targets = {f"scenario_{name}_results.csv": name for name in scenario_results}
+    written = save_results_many({path: scenario_results[name] for path, name in targets.items()})
+    for path, scenario_name in targets.items():
+        print(f"✓ {scenario_name} results saved to '{written[path]}'")
     
     print("\nScenario comparison completed successfully!")
     print("Key insights:")
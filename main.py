@@ -5,13 +5,8 @@ ReserveFlow - Main Entry Point
 Quick start script for running ReserveFlow simulations
 """
 
-import sys
-import os
-
-# Add src to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
-
-from reserveflow import ReserveFlowSimulation, DefaultConfig
+from reserveflow import ReserveFlowSimulation, DefaultConfig, make_rng
+from reserveflow.analysis import save_results
 from reserveflow.visualization.charts import create_matplotlib_summary
 
 
@@ -24,7 +19,7 @@ def main():
     
     # Create and run simulation
     config = DefaultConfig()
-    config.random_seed = 42  # For reproducible results
+    config.rng = make_rng(42)  # For reproducible results
     
     sim = ReserveFlowSimulation(config)
     results = sim.run_simulation(duration_months=12)
@@ -35,32 +30,25 @@ def main():
     print("\nKey Results:")
     print("-" * 12)
     
-    if 'gold_price' in results.columns:
-        initial_gold = results['gold_price'].iloc[0]
-        final_gold = results['gold_price'].iloc[-1]
-        gold_return = (final_gold / initial_gold - 1) * 100
-        print(f"Gold: ${initial_gold:.0f} → ${final_gold:.0f} ({gold_return:+.1f}%)")
+    # Statistics are accumulated during the run, no pass over results needed
+    stats = sim.running_stats
+    
+    gold = stats['gold_price']
+    if gold.count:
+        gold_return = (gold.last / gold.first - 1) * 100
+        print(f"Gold: ${gold.first:.0f} → ${gold.last:.0f} ({gold_return:+.1f}%)")
     
-    if 'geopolitical_risk' in results.columns:
-        avg_risk = results['geopolitical_risk'].mean()
-        max_risk = results['geopolitical_risk'].max()
-        # Ensure avg_risk and max_risk are scalars before formatting
-        if hasattr(avg_risk, 'mean'):
-            avg_risk = avg_risk.mean()
-        if hasattr(max_risk, 'max'):
-            max_risk = max_risk.max()
-        print(f"Geopolitical Risk: Avg={avg_risk:.3f}, Max={max_risk:.3f}")
+    geo_risk = stats['geopolitical_risk']
+    if geo_risk.count:
+        print(f"Geopolitical Risk: Avg={geo_risk.mean:.3f}, Max={geo_risk.max:.3f}")
     
-    if 'market_stress' in results.columns:
-        avg_stress = results['market_stress'].mean()
-        crisis_days = (results['market_stress'] > 0.7).sum()
-        if hasattr(avg_stress, 'mean'):
-            avg_stress = avg_stress.mean()
-        print(f"Market Stress: Avg={avg_stress:.3f}, Crisis Days={crisis_days}")
+    market_stress = stats['market_stress']
+    if market_stress.count:
+        print(f"Market Stress: Avg={market_stress.mean:.3f}, Crisis Days={market_stress.above}")
     
     # Save results
-    results.to_csv('quick_simulation_results.csv')
-    print("\n✓ Results saved to 'quick_simulation_results.csv'")
+    results_file = save_results(results, 'quick_simulation_results.csv')
+    print(f"\n✓ Results saved to '{results_file}'")
     
     # Create summary chart
     try:
@@ -3,11 +3,10 @@
 CLI Test Script for ReserveFlow
 """
 
-import sys
-import os
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+import multiprocessing
 
-from reserveflow import ReserveFlowSimulation
+from reserveflow import ReserveFlowSimulation, make_rng
+from reserveflow.analysis import crisis_days, endpoints, save_results
 from reserveflow.config import CrisisConfig, DepollarizationConfig, InflationSurgeConfig
 from reserveflow.visualization.charts import create_scenario_comparison, save_charts_to_html
 
@@ -18,7 +17,7 @@ def simulate_crisis_scenario():
     
     # Create crisis simulation
     config = CrisisConfig()
-    config.random_seed = 42
+    config.rng = make_rng(42)
     
     sim = ReserveFlowSimulation(config)
     results = sim.run_simulation(duration_months=12)
@@ -27,35 +26,42 @@ def simulate_crisis_scenario():
     
     # Key crisis metrics
     if 'gold_price' in results.columns:
-        gold_return = (results['gold_price'].iloc[-1] / results['gold_price'].iloc[0] - 1) * 100
+        initial_gold, final_gold = endpoints(results, 'gold_price')
+        gold_return = (final_gold / initial_gold - 1) * 100
         print(f"Gold price performance: {gold_return:+.1f}%")
     
     if 'market_stress' in results.columns:
-        crisis_days = (results['market_stress'] > 0.7).sum()
-        avg_stress = float(results['market_stress'].mean())
-        print(f"Market stress: Avg={avg_stress:.3f}, Crisis days={crisis_days}")
+        stress_days = crisis_days(results)
+        avg_stress = float(results['market_stress'].to_numpy().mean())
+        print(f"Market stress: Avg={avg_stress:.3f}, Crisis days={stress_days}")
     
     # Save results
-    results.to_csv('crisis_scenario_results.csv')
-    print("✓ Crisis results saved to 'crisis_scenario_results.csv'")
+    results_file = save_results(results, 'crisis_scenario_results.csv')
+    print(f"✓ Crisis results saved to '{results_file}'")
     
     return results
 
+def _run_extreme_scenario(name):
+    """Run one extreme scenario in a worker process"""
+    scenario_configs = {
+        'crisis': CrisisConfig,
+        'inflation_surge': InflationSurgeConfig
+    }
+    config = scenario_configs[name]()
+    config.rng = make_rng(42)
+    sim = ReserveFlowSimulation(config)
+    return name, sim.run_simulation(duration_months=6)
+
 def compare_extreme_scenarios():
     """Compare extreme scenarios (crisis vs inflation surge)"""
     print("\nComparing Extreme Scenarios")
     print("=" * 28)
     
-    scenarios = {
-        'crisis': CrisisConfig(),
-        'inflation_surge': InflationSurgeConfig()
-    }
+    scenarios = ['crisis', 'inflation_surge']
     
-    results = {}
-    for name, config in scenarios.items():
-        config.random_seed = 42
-        sim = ReserveFlowSimulation(config)
-        results[name] = sim.run_simulation(duration_months=6)
+    with multiprocessing.Pool(processes=len(scenarios)) as pool:
+        results = dict(pool.map(_run_extreme_scenario, scenarios))
+    for name in results:
         print(f"✓ {name} scenario completed")
     
     # Create comparison chart
@@ -72,7 +78,8 @@ def compare_extreme_scenarios():
     
     for name, df in results.items():
         if 'gold_price' in df.columns:
-            gold_return = (df['gold_price'].iloc[-1] / df['gold_price'].iloc[0] - 1) * 100
+            initial_gold, final_gold = endpoints(df, 'gold_price')
+            gold_return = (final_gold / initial_gold - 1) * 100
             print(f"{name}: Gold return = {gold_return:+.1f}%")
 
 if __name__ == "__main__":
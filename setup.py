@@ -41,6 +41,9 @@ setup(
             "flake8>=6.0",
             "mypy>=1.0",
         ],
+        "parquet": [
+            "pyarrow>=12.0",
+        ],
     },
     entry_points={
         "console_scripts": [
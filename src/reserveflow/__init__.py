@@ -11,11 +11,12 @@ __author__ = "ReserveFlow Development Team"
 __email__ = "dev@reserveflow.org"
 
 from .simulation import ReserveFlowSimulation
-from .config import DefaultConfig, CrisisConfig, DepollarizationConfig
+from .config import DefaultConfig, CrisisConfig, DepollarizationConfig, make_rng
 
 __all__ = [
     "ReserveFlowSimulation",
     "DefaultConfig", 
     "CrisisConfig",
-    "DepollarizationConfig"
+    "DepollarizationConfig",
+    "make_rng"
 ] 
\ No newline at end of file
@@ -0,0 +1,188 @@
+"""
+Helpers for summarizing and exporting simulation results
+"""
+
+import csv
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+
+# Output format for saved results: 'csv' (default) or 'parquet'
+RESULTS_FORMAT = os.environ.get('RESERVEFLOW_FORMAT', 'csv').lower()
+
+# Fixed float format for CSV output; avoids pandas' per-value repr() and
+# keeps enough significant digits for prices, rates and returns
+CSV_FLOAT_FORMAT = '%.10g'
+CSV_CHUNKSIZE = 100_000
+
+
+def as_scalar(value: Any) -> float:
+    """Convert a per-step value (scalar or size-1 array) to a float"""
+    return float(np.ravel(value)[0])
+
+
+class OnlineStats:
+    """
+    Running statistics for one metric, updated one observation at a time
+
+    Tracks count, mean and variance (Welford's algorithm), min/max, the
+    first and last observations and, optionally, how many observations
+    exceeded a threshold, so summaries need no second pass over results.
+    """
+    
+    def __init__(self, threshold: Optional[float] = None):
+        """
+        Initialize an empty accumulator
+        
+        Args:
+            threshold: Count observations strictly above this level (optional)
+        """
+        self.threshold = threshold
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.first = np.nan
+        self.last = np.nan
+        self.above = 0
+    
+    def update(self, value: float) -> None:
+        """Add one observation"""
+        if self.count == 0:
+            self.first = value
+        self.last = value
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if self.threshold is not None and value > self.threshold:
+            self.above += 1
+    
+    def update_many(self, values: np.ndarray) -> None:
+        """Add a batch of observations (Chan et al. parallel merge)"""
+        values = np.asarray(values, dtype=np.float64)
+        n = len(values)
+        if n == 0:
+            return
+        
+        batch_mean = values.mean()
+        batch_m2 = np.square(values - batch_mean).sum()
+        total = self.count + n
+        delta = batch_mean - self.mean
+        self._m2 += batch_m2 + delta * delta * self.count * n / total
+        self.mean += delta * n / total
+        
+        if self.count == 0:
+            self.first = values[0]
+        self.last = values[-1]
+        self.count = total
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+        if self.threshold is not None:
+            self.above += int(np.count_nonzero(values > self.threshold))
+    
+    def variance(self, ddof: int = 1) -> float:
+        """Variance of the observations (sample variance by default, like pandas)"""
+        if self.count <= ddof:
+            return np.nan
+        return self._m2 / (self.count - ddof)
+    
+    def std(self, ddof: int = 1) -> float:
+        """Standard deviation of the observations"""
+        return float(np.sqrt(self.variance(ddof)))
+
+
+def endpoints(results: pd.DataFrame, column: str) -> Tuple[Any, Any]:
+    """Get the first and last values of a results column"""
+    values = results[column].to_numpy()
+    return values[0], values[-1]
+
+
+def crisis_days(results: pd.DataFrame, column: str = 'market_stress',
+                threshold: float = 0.7) -> int:
+    """Count the steps where a results column is above a crisis threshold"""
+    return int(np.count_nonzero(results[column].to_numpy() > threshold))
+
+
+def save_results(results: pd.DataFrame, path: str, index: bool = True) -> str:
+    """
+    Save a results DataFrame in the configured output format
+
+    Args:
+        results: DataFrame to save
+        path: Target path, normally ending in '.csv'
+        index: Whether to write the index
+
+    Returns:
+        Path of the file actually written
+    """
+    if RESULTS_FORMAT == 'parquet':
+        path = os.path.splitext(path)[0] + '.parquet'
+        # Nested per-step structures (dicts, event lists) have no fixed
+        # columnar type, so store them as text just like the CSV writer does
+        object_cols = results.select_dtypes(include='object').columns
+        results = results.astype({col: str for col in object_cols})
+        results.to_parquet(path, engine='pyarrow', compression='zstd', index=index)
+    else:
+        results.to_csv(path, index=index, float_format=CSV_FLOAT_FORMAT,
+                       chunksize=CSV_CHUNKSIZE)
+    return path
+
+
+def save_records(records: List[Dict[str, Any]], path: str) -> str:
+    """
+    Save a small table given as a list of row dicts, without building a DataFrame
+
+    Args:
+        records: Rows to save; columns are the union of keys in first-seen order
+        path: Target path, normally ending in '.csv'
+
+    Returns:
+        Path of the file actually written
+    """
+    if RESULTS_FORMAT == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        
+        path = os.path.splitext(path)[0] + '.parquet'
+        pq.write_table(pa.Table.from_pylist(records), path, compression='zstd')
+    else:
+        columns = list(dict.fromkeys(key for row in records for key in row))
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns)
+            writer.writeheader()
+            for row in records:
+                writer.writerow({key: CSV_FLOAT_FORMAT % value if isinstance(value, float) else value
+                                 for key, value in row.items()})
+    return path
+
+
+def save_results_many(frames: Mapping[str, pd.DataFrame], index: bool = True) -> Dict[str, str]:
+    """
+    Save several results DataFrames concurrently
+
+    Writing is IO-bound and releases the GIL, so one thread per file lets
+    the writes overlap.
+
+    Args:
+        frames: Mapping of target path to DataFrame
+        index: Whether to write the index
+
+    Returns:
+        Mapping of target path to the path actually written
+    """
+    if not frames:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=len(frames)) as executor:
+        written = executor.map(lambda item: save_results(item[1], item[0], index=index),
+                               frames.items())
+        return dict(zip(frames.keys(), written))
@@ -6,48 +6,83 @@ Command Line Interface for ReserveFlow
 import argparse
 import sys
 import os
+import functools
+import dataclasses
+import multiprocessing
 from typing import Optional, Dict, Any
 import logging
+import logging.handlers
 
 from .simulation import ReserveFlowSimulation
+from .analysis import save_results, save_results_many
 from .config import DefaultConfig, CrisisConfig, DepollarizationConfig, InflationSurgeConfig
-from .visualization.charts import create_matplotlib_summary, save_charts_to_html
-from .visualization.dashboard import ReserveFlowDashboard
+
+
+log = logging.getLogger('reserveflow.cli')
 
 
 def setup_logging(verbose: bool = False):
     """Setup logging configuration"""
     level = logging.DEBUG if verbose else logging.INFO
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if verbose:
+        # Only keep a log file for verbose runs
+        handlers.append(logging.FileHandler('reserveflow.log'))
+        log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    else:
+        # Plain progress output; skip timestamp formatting
+        log_format = '%(message)s'
     logging.basicConfig(
         level=level,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler('reserveflow.log')
-        ]
+        format=log_format,
+        handlers=handlers
     )
 
 
+def _init_worker_logging(queue):
+    """Send a worker process's log records to the parent through a queue"""
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(queue)]
+
+
+_SCENARIO_CONFIGS = {
+    'baseline': DefaultConfig,
+    'crisis': CrisisConfig,
+    'dedollarization': DepollarizationConfig,
+    'inflation_surge': InflationSurgeConfig
+}
+
+
+@functools.lru_cache(maxsize=None)
 def get_scenario_config(scenario: str):
-    """Get configuration for a specific scenario"""
-    configs = {
-        'baseline': DefaultConfig(),
-        'crisis': CrisisConfig(),
-        'dedollarization': DepollarizationConfig(),
-        'inflation_surge': InflationSurgeConfig()
-    }
+    """Get configuration for a specific scenario
     
-    if scenario not in configs:
-        raise ValueError(f"Unknown scenario: {scenario}. Available: {list(configs.keys())}")
+    The returned instance is cached and shared between callers, so use
+    dataclasses.replace() rather than mutating it.
+    """
+    config_cls = _SCENARIO_CONFIGS.get(scenario)
+    if config_cls is None:
+        raise ValueError(f"Unknown scenario: {scenario}. Available: {list(_SCENARIO_CONFIGS.keys())}")
     
-    return configs[scenario]
+    return config_cls()
+
+
+def _run_scenario_worker(task):
+    """Run one comparison scenario in a worker process"""
+    scenario, duration = task
+    try:
+        sim = ReserveFlowSimulation(get_scenario_config(scenario))
+        results = sim.run_simulation(duration_months=duration)
+        return scenario, results, None
+    except Exception as e:
+        return scenario, None, str(e)
 
 
 def run_simulation_command(args):
     """Run simulation command"""
-    print(f"Running ReserveFlow simulation: {args.scenario}")
-    print(f"Duration: {args.duration} months")
-    print(f"Output directory: {args.output}")
+    log.info(f"Running ReserveFlow simulation: {args.scenario}")
+    log.info(f"Duration: {args.duration} months")
+    log.info(f"Output directory: {args.output}")
     
     # Setup output directory
     os.makedirs(args.output, exist_ok=True)
@@ -56,9 +91,9 @@ def run_simulation_command(args):
     try:
         config = get_scenario_config(args.scenario)
         if args.seed:
-            config.random_seed = args.seed
+            config = dataclasses.replace(config, random_seed=args.seed)
     except ValueError as e:
-        print(f"Error: {e}")
+        log.error(f"Error: {e}")
         return 1
     
     # Run simulation
@@ -66,42 +101,46 @@ def run_simulation_command(args):
         sim = ReserveFlowSimulation(config)
         results = sim.run_simulation(duration_months=args.duration)
         
-        print(f"✓ Simulation completed: {len(results)} data points generated")
+        log.info(f"✓ Simulation completed: {len(results)} data points generated")
         
         # Save results
-        results_file = os.path.join(args.output, f"{args.scenario}_results.csv")
-        results.to_csv(results_file)
-        print(f"✓ Results saved to {results_file}")
+        results_file = save_results(results, os.path.join(args.output, f"{args.scenario}_results.csv"))
+        log.info(f"✓ Results saved to {results_file}")
         
-        # Generate summary statistics
-        summary_stats = sim.get_summary_statistics(results)
-        print("\nSimulation Summary:")
-        print("-" * 20)
+        # Summary statistics come from the accumulators updated during the run
+        summary_stats = sim.get_summary_statistics()
+        log.info("\nSimulation Summary:")
+        log.info("-" * 20)
         for category, stats in summary_stats.items():
-            print(f"\n{category.replace('_', ' ').title()}:")
+            log.info(f"\n{category.replace('_', ' ').title()}:")
             for metric, value in stats.items():
                 if isinstance(value, float):
-                    print(f"  {metric}: {value:.3f}")
+                    log.info(f"  {metric}: {value:.3f}")
                 else:
-                    print(f"  {metric}: {value}")
+                    log.info(f"  {metric}: {value}")
         
         # Generate visualizations if requested
         if args.charts:
-            print("\nGenerating visualizations...")
+            log.info("\nGenerating visualizations...")
             try:
-                # Matplotlib summary
-                create_matplotlib_summary(results)
-                summary_file = os.path.join(args.output, f"{args.scenario}_summary.png")
-                os.rename('reserveflow_summary.png', summary_file)
-                print(f"✓ Summary chart saved to {summary_file}")
-                
-                # Interactive charts
+                # Visualization dependencies are only imported when charts are requested;
+                # the CLI never displays figures, so use the non-interactive backend
+                import matplotlib
+                matplotlib.use('Agg')
                 from .visualization.charts import (
+                    create_matplotlib_summary,
+                    save_charts_to_html,
                     create_exchange_rate_chart, 
                     create_precious_metals_chart,
                     create_risk_dashboard
                 )
                 
+                # Matplotlib summary
+                summary_file = os.path.join(args.output, f"{args.scenario}_summary.png")
+                create_matplotlib_summary(results, output_path=summary_file)
+                log.info(f"✓ Summary chart saved to {summary_file}")
+                
+                # Interactive charts
                 charts = {
                     'exchange_rates': create_exchange_rate_chart(results),
                     'precious_metals': create_precious_metals_chart(results),
@@ -109,86 +148,123 @@ def run_simulation_command(args):
                 }
                 
                 save_charts_to_html(charts, args.output)
-                print(f"✓ Interactive charts saved to {args.output}/")
+                log.info(f"✓ Interactive charts saved to {args.output}/")
                 
             except Exception as e:
-                print(f"Warning: Could not generate all visualizations: {e}")
+                log.warning(f"Could not generate all visualizations: {e}")
         
-        print(f"\nSimulation completed successfully!")
-        print(f"All outputs saved to: {args.output}")
+        log.info(f"\nSimulation completed successfully!")
+        log.info(f"All outputs saved to: {args.output}")
         
         return 0
         
     except Exception as e:
-        print(f"Error running simulation: {e}")
+        log.error(f"Error running simulation: {e}")
         return 1
 
 
 def run_comparison_command(args):
     """Run scenario comparison command"""
-    print("Running ReserveFlow scenario comparison")
-    print(f"Scenarios: {', '.join(args.scenarios)}")
-    print(f"Duration: {args.duration} months")
+    log.info("Running ReserveFlow scenario comparison")
+    log.info(f"Scenarios: {', '.join(args.scenarios)}")
+    log.info(f"Duration: {args.duration} months")
     
     # Setup output directory
     os.makedirs(args.output, exist_ok=True)
     
-    # Run scenarios
+    # Run scenarios in parallel; each one is an independent simulation
     scenario_results = {}
-    sim = ReserveFlowSimulation()
+    tasks = [(scenario, args.duration) for scenario in args.scenarios]
     
-    for scenario in args.scenarios:
-        print(f"\nRunning {scenario} scenario...")
-        try:
-            results = sim.run_scenario(scenario, duration_months=args.duration)
-            scenario_results[scenario] = results
-            print(f"✓ {scenario} completed ({len(results)} data points)")
-        except Exception as e:
-            print(f"✗ {scenario} failed: {e}")
+    log.info(f"\nRunning {len(tasks)} scenarios in parallel...")
+    
+    # Workers queue their log records; a single listener here writes them out
+    log_queue = multiprocessing.Queue()
+    listener = logging.handlers.QueueListener(log_queue, *logging.getLogger().handlers,
+                                              respect_handler_level=True)
+    listener.start()
+    try:
+        with multiprocessing.Pool(processes=len(tasks), initializer=_init_worker_logging,
+                                  initargs=(log_queue,)) as pool:
+            outcomes = pool.map(_run_scenario_worker, tasks)
+    finally:
+        listener.stop()
+    
+    for scenario, results, error in outcomes:
+        if error is not None:
+            log.error(f"✗ {scenario} failed: {error}")
             continue
+        scenario_results[scenario] = results
+        log.info(f"✓ {scenario} completed ({len(results)} data points)")
     
     if not scenario_results:
-        print("No scenarios completed successfully!")
+        log.error("No scenarios completed successfully!")
         return 1
     
     # Generate comparison
-    print(f"\nGenerating comparison for {len(scenario_results)} scenarios...")
+    log.info(f"\nGenerating comparison for {len(scenario_results)} scenarios...")
     
     try:
-        from .visualization.charts import create_scenario_comparison
+        from .visualization.charts import create_scenario_comparison, save_charts_to_html
         comparison_fig = create_scenario_comparison(scenario_results)
         
         # Save comparison chart
         save_charts_to_html({'scenario_comparison': comparison_fig}, args.output)
-        print(f"✓ Comparison chart saved to {args.output}/scenario_comparison.html")
+        log.info(f"✓ Comparison chart saved to {args.output}/scenario_comparison.html")
         
-        # Save individual results
-        for scenario_name, results in scenario_results.items():
-            filename = os.path.join(args.output, f"{scenario_name}_results.csv")
-            results.to_csv(filename)
-            print(f"✓ {scenario_name} results saved to {filename}")
+        # Save individual results, writing the files concurrently
+        targets = {os.path.join(args.output, f"{name}_results.csv"): name for name in scenario_results}
+        written = save_results_many({path: scenario_results[name] for path, name in targets.items()})
+        for path, scenario_name in targets.items():
+            log.info(f"✓ {scenario_name} results saved to {written[path]}")
         
-        print(f"\nComparison completed successfully!")
+        log.info(f"\nComparison completed successfully!")
         return 0
         
     except Exception as e:
-        print(f"Error generating comparison: {e}")
+        log.error(f"Error generating comparison: {e}")
         return 1
 
 
 def run_dashboard_command(args):
     """Run dashboard command"""
-    print(f"Starting ReserveFlow Dashboard on port {args.port}")
+    log.info(f"Starting ReserveFlow Dashboard on port {args.port}")
     
     try:
+        from .visualization.dashboard import ReserveFlowDashboard
         dashboard = ReserveFlowDashboard(port=args.port)
         dashboard.run_server(debug=args.debug)
         return 0
     except Exception as e:
-        print(f"Error starting dashboard: {e}")
+        log.error(f"Error starting dashboard: {e}")
         return 1
 
 
+def run_precompile_command(args):
+    """Run precompile command"""
+    log.info("Compiling simulation kernels")
+    
+    # Kernels are compiled with cache=True, so exercising every one of them
+    # once with the engines' real argument types leaves machine code on disk
+    # for later processes to load instead of compiling on first call
+    from .core import GeopoliticalRiskEngine, PreciousMetalsEngine
+    
+    config = DefaultConfig()
+    sim = ReserveFlowSimulation(config)
+    sim.run_simulation(duration_months=1)
+    
+    geo = GeopoliticalRiskEngine(config)
+    geo.initialize()
+    geo.simulate(5)
+    
+    metals = PreciousMetalsEngine(config)
+    metals.initialize()
+    metals.simulate_paths(2, 5)
+    
+    log.info("Kernels compiled and cached")
+    return 0
+
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -199,6 +275,7 @@ Examples:
   reserveflow simulate --scenario crisis --duration 12 --charts
   reserveflow compare --scenarios baseline crisis --duration 18
   reserveflow dashboard --port 8080
+  reserveflow precompile
         """
     )
     
@@ -238,6 +315,9 @@ Examples:
                             help='Port for dashboard server')
     dash_parser.add_argument('--debug', action='store_true', help='Run in debug mode')
     
+    # Precompile command
+    subparsers.add_parser('precompile', help='Compile and cache the numeric kernels ahead of time')
+    
     # Parse arguments
     args = parser.parse_args()
     
@@ -251,6 +331,8 @@ Examples:
         return run_comparison_command(args)
     elif args.command == 'dashboard':
         return run_dashboard_command(args)
+    elif args.command == 'precompile':
+        return run_precompile_command(args)
     else:
         parser.print_help()
         return 1
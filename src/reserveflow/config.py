@@ -2,12 +2,63 @@
 Configuration classes for different simulation scenarios
 """
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+import sys
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from typing import Dict, List, Optional, Any, Mapping, Tuple
 import numpy as np
 
 
-@dataclass
+# Slotted dataclasses (Python 3.10+) have no per-instance __dict__, which
+# makes instances smaller and attribute access faster
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> Tuple[str, ...]:
+    """Names of a config class's fields, looked up once per class"""
+    return tuple(f.name for f in fields(cls))
+
+
+def make_rng(seed: Optional[Any] = None) -> np.random.Generator:
+    """
+    Create a pre-seeded random generator for a simulation
+    
+    SFC64 is the fastest of NumPy's bit generators, with ample period and
+    statistical quality for simulation work.
+    
+    Args:
+        seed: Random seed or SeedSequence (fresh OS entropy if None); an
+            existing Generator is returned as is
+        
+    Returns:
+        SFC64-backed NumPy Generator, suitable for config.rng
+    """
+    if isinstance(seed, np.random.Generator):
+        return seed
+    return np.random.Generator(np.random.SFC64(seed))
+
+
+def spawn_rngs(rng: np.random.Generator, n: int) -> List[np.random.Generator]:
+    """
+    Spawn independent child generators from a generator's seed sequence
+    
+    Equivalent to Generator.spawn, which needs NumPy 1.25 or later; the
+    pinned NumPy only exposes the seed sequence on the bit generator.
+    
+    Args:
+        rng: Parent generator
+        n: Number of children
+        
+    Returns:
+        Child generators backed by the parent's bit generator type
+    """
+    bit_generator = rng.bit_generator
+    seed_seq = getattr(bit_generator, 'seed_seq', None) or bit_generator._seed_seq
+    return [np.random.Generator(type(bit_generator)(child)) for child in seed_seq.spawn(n)]
+
+
+@dataclass(**_DATACLASS_OPTIONS)
 class BaseConfig:
     """Base configuration class for simulation parameters"""
     
@@ -16,6 +67,9 @@ class BaseConfig:
     end_date: str = "2025-12-31"
     frequency: str = "D"  # Daily frequency
     random_seed: int = 42
+    # Pre-seeded generator; when set, engines draw from streams spawned
+    # from it instead of streams derived from random_seed
+    rng: Optional[np.random.Generator] = field(default=None, repr=False, compare=False)
     
     # Currency list
     major_currencies: List[str] = field(default_factory=lambda: ["USD", "EUR", "JPY", "GBP", "CNY"])
@@ -59,12 +113,32 @@ class BaseConfig:
     correlation_decay: float = 0.95
     stress_threshold: float = 2.0  # Standard deviations
     
+    def __post_init__(self):
+        """Normalize parameters that may be given in looser forms"""
+        self.currency_volatility = self._normalize_currency_volatility(self.currency_volatility)
+    
+    def _normalize_currency_volatility(self, volatility: Any) -> Dict[str, float]:
+        """
+        Coerce currency volatilities to a flat currency -> float dict
+        
+        A single number applies to every currency; nested per-currency
+        dicts are flattened to the entry for their own currency.
+        """
+        if not isinstance(volatility, Mapping):
+            currencies = dict.fromkeys(self.major_currencies + self.reserve_currencies)
+            return {currency: float(volatility) for currency in currencies}
+        
+        return {
+            currency: float(vol.get(currency, 0.10) if isinstance(vol, Mapping) else vol)
+            for currency, vol in volatility.items()
+        }
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert config to dictionary"""
-        return self.__dict__
+        return {name: getattr(self, name) for name in _field_names(type(self))}
 
 
-@dataclass 
+@dataclass(**_DATACLASS_OPTIONS)
 class DefaultConfig(BaseConfig):
     """Default baseline scenario configuration"""
     
@@ -78,7 +152,7 @@ class DefaultConfig(BaseConfig):
     reserve_diversification_speed: float = 0.02
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class CrisisConfig(BaseConfig):
     """Crisis scenario configuration with heightened volatility"""
     
@@ -109,7 +183,7 @@ class CrisisConfig(BaseConfig):
     liquidation_impact_factor: float = 0.15
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class DepollarizationConfig(BaseConfig):
     """De-dollarization acceleration scenario"""
     
@@ -136,7 +210,7 @@ class DepollarizationConfig(BaseConfig):
     reserve_diversification_speed: float = 0.05  # Faster diversification
 
 
-@dataclass 
+@dataclass(**_DATACLASS_OPTIONS)
 class InflationSurgeConfig(BaseConfig):
     """Inflation surge and precious metal rally scenario"""
     
@@ -3,30 +3,105 @@ Base engine class for all simulation engines
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from collections.abc import Mapping
+from typing import Dict, Any, Iterator, Optional, Tuple
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
+from ..config import make_rng, spawn_rngs
+
+
+class ArrayView(Mapping):
+    """
+    Read-only key -> float mapping over a NumPy vector
+    
+    Behaves like a dict of floats, but wraps the array instead of boxing
+    every entry into a new dict each step. The index maps each key to its
+    position and must list the keys in position order.
+    """
+    
+    __slots__ = ("_index", "_values")
+    
+    def __init__(self, index: Dict[str, int], values: np.ndarray):
+        self._index = index
+        self._values = values
+    
+    @property
+    def array(self) -> np.ndarray:
+        """The wrapped vector, in key order"""
+        return self._values
+    
+    @property
+    def index(self) -> Dict[str, int]:
+        """The key -> position mapping (shared by views of the same engine state)"""
+        return self._index
+    
+    def __getitem__(self, key: str) -> float:
+        return float(self._values[self._index[key]])
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+    
+    def __len__(self) -> int:
+        return len(self._index)
+    
+    def __repr__(self) -> str:
+        return repr(dict(self))
 
 
 class BaseEngine(ABC):
     """Abstract base class for all simulation engines"""
     
-    def __init__(self, config: Any, random_state: Optional[int] = None):
+    # Fixed number of normal and uniform draws each step makes, for engines
+    # that take their randomness from pre-drawn buffers (see prefill_rng)
+    normals_per_step = 0
+    uniforms_per_step = 0
+    
+    # Storage type of the numeric history columns. Single precision (about
+    # 7 significant digits) is plenty for recorded prices, rates and scores,
+    # and halves the memory scanned by history reductions; live engine state
+    # stays in float64 and is rounded once, when recorded. Engines whose
+    # history feeds back into their dynamics at higher precision override it.
+    history_dtype = np.float32
+    
+    def __init__(self, config: Any, random_state: Optional[Any] = None):
         """
         Initialize base engine
         
         Args:
             config: Configuration object
-            random_state: Random seed for reproducibility
+            random_state: Random seed, SeedSequence or Generator for reproducibility
         """
         self.config = config
-        self.random_state = random_state or config.random_seed
-        self.rng = np.random.RandomState(self.random_state)
-        self.current_time = pd.to_datetime(config.start_date)
-        self.end_time = pd.to_datetime(config.end_date)
-        self.data_history = []
+        self.random_state = random_state if random_state is not None else config.random_seed
+        rng = getattr(config, 'rng', None)
+        if random_state is None and rng is not None:
+            # Independent child stream per engine from the shared generator
+            self.rng = spawn_rngs(rng, 1)[0]
+        else:
+            self.rng = make_rng(self.random_state)
+        # Clock kept as datetime64 so setting and recording it stays cheap;
+        # current_time converts to a Timestamp only when asked
+        self._time = np.datetime64(config.start_date, 'ns')
+        self.end_time = pd.Timestamp(config.end_date)
+        self._reset_history()
+        self._normal_buf = np.empty((0, 0))
+        self._uniform_buf = np.empty((0, 0))
+        self._rng_row = 0
         
+    @property
+    def current_time(self) -> pd.Timestamp:
+        """Current simulation time of this engine"""
+        return pd.Timestamp(self._time)
+    
+    @current_time.setter
+    def current_time(self, value: Any) -> None:
+        self._time = np.datetime64(value, 'ns')
+    
+    def _next_day(self) -> pd.Timestamp:
+        """Day after the engine's current time, where a batch run continues"""
+        return pd.Timestamp(self._time.astype('datetime64[D]') + np.timedelta64(1, 'D'))
+    
     @abstractmethod
     def initialize(self) -> None:
         """Initialize engine state"""
@@ -48,8 +123,8 @@ class BaseEngine(ABC):
     
     def reset(self) -> None:
         """Reset engine to initial state"""
-        self.current_time = pd.to_datetime(self.config.start_date)
-        self.data_history = []
+        self._time = np.datetime64(self.config.start_date, 'ns')
+        self._reset_history()
         self.initialize()
     
     def get_random_normal(self, size: int = 1, loc: float = 0.0, scale: float = 1.0) -> np.ndarray:
@@ -60,39 +135,164 @@ class BaseEngine(ABC):
         """Generate random uniform values"""  
         return self.rng.uniform(low, high, size)
     
+    def get_random_normal_scalar(self) -> float:
+        """Generate a single standard normal value"""
+        return self.rng.standard_normal()
+    
+    def get_random_uniform_scalar(self) -> float:
+        """Generate a single uniform value in [0, 1)"""
+        return self.rng.random()
+    
+    def prefill_rng(self, n_steps: int) -> None:
+        """
+        Draw the random numbers for a run of known length in one batch
+        
+        Args:
+            n_steps: Number of steps that will be simulated
+        """
+        self._normal_buf = self.rng.standard_normal((n_steps, self.normals_per_step))
+        self._uniform_buf = self.rng.random((n_steps, self.uniforms_per_step))
+        self._rng_row = 0
+    
+    def next_random_draws(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get this step's normal and uniform draws
+        
+        Returns:
+            Tuple of (normals, uniforms), taken from the prefilled buffers or
+            drawn directly once they are exhausted
+        """
+        row = self._rng_row
+        if row >= len(self._normal_buf):
+            return (self.rng.standard_normal(self.normals_per_step),
+                    self.rng.random(self.uniforms_per_step))
+        self._rng_row = row + 1
+        return self._normal_buf[row], self._uniform_buf[row]
+    
+    def _reset_history(self, capacity: int = 0) -> None:
+        """Clear the history buffers"""
+        self._hist_cols = {}
+        self._hist_labels = {}
+        self._hist_timestamps = np.empty(capacity, dtype='datetime64[ns]')
+        self._hist_len = 0
+    
+    def preallocate_history(self, n_steps: int) -> None:
+        """
+        Reserve history space for a run of known length
+        
+        Args:
+            n_steps: Number of steps that will be recorded
+        """
+        self._reset_history(n_steps)
+    
+    def _grow_history(self) -> None:
+        """Double the capacity of every history column"""
+        capacity = max(2 * len(self._hist_timestamps), 64)
+        self._hist_timestamps = np.resize(self._hist_timestamps, capacity)
+        for name, column in self._hist_cols.items():
+            grown = self._new_history_column(column.dtype, (capacity,) + column.shape[1:])
+            grown[:self._hist_len] = column[:self._hist_len]
+            self._hist_cols[name] = grown
+    
+    @staticmethod
+    def _new_history_column(dtype: np.dtype, shape: Any) -> np.ndarray:
+        """Allocate an empty history column (NaN or None until written)"""
+        if dtype == object:
+            return np.full(shape, None, dtype=object)
+        return np.full(shape, np.nan, dtype=dtype)
+    
     def add_to_history(self, data: Dict[str, Any]) -> None:
-        """Add data point to history"""
-        data['timestamp'] = self.current_time
-        self.data_history.append(data.copy())
+        """
+        Add data point to history
+        
+        Numeric fields go into history_dtype columns and ArrayView fields into
+        history_dtype blocks with one column per key; anything else (nested
+        dicts, event lists) is kept by reference in an object column.
+        """
+        i = self._hist_len
+        if i == len(self._hist_timestamps):
+            self._grow_history()
+        
+        capacity = len(self._hist_timestamps)
+        self._hist_timestamps[i] = self._time
+        for name, value in data.items():
+            column = self._hist_cols.get(name)
+            if column is None:
+                column = self._new_column_for(name, value, capacity)
+            if column.ndim == 2:
+                column[i] = value.array
+            else:
+                column[i] = value
+        self._hist_len = i + 1
+    
+    def _new_column_for(self, name: str, value: Any, capacity: int) -> np.ndarray:
+        """Allocate and register the history column for a field's first value"""
+        if isinstance(value, ArrayView):
+            column = self._new_history_column(np.dtype(self.history_dtype), (capacity, len(value)))
+            self._hist_labels[name] = list(value)
+        else:
+            numeric = isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+            column = self._new_history_column(np.dtype(self.history_dtype if numeric else object), capacity)
+        self._hist_cols[name] = column
+        return column
+    
+    @property
+    def history_length(self) -> int:
+        """Number of recorded steps"""
+        return self._hist_len
+    
+    def history_column(self, name: str) -> np.ndarray:
+        """Recorded values of one history field (a view, oldest first; one row per step for ArrayView fields)"""
+        return self._hist_cols[name][:self._hist_len]
     
     def get_history_df(self) -> pd.DataFrame:
         """Get history as pandas DataFrame"""
-        if not self.data_history:
+        if not self._hist_len:
             return pd.DataFrame()
-        return pd.DataFrame(self.data_history).set_index('timestamp')
+        n = self._hist_len
+        columns = {}
+        for name, column in self._hist_cols.items():
+            if column.ndim == 2:
+                # One "field.key" column per entry of an ArrayView field
+                for j, label in enumerate(self._hist_labels[name]):
+                    columns[f"{name}.{label}"] = column[:n, j]
+            else:
+                columns[name] = column[:n]
+        index = pd.DatetimeIndex(self._hist_timestamps[:n], name='timestamp')
+        return pd.DataFrame(columns, index=index, copy=False)
     
     def generate_correlated_shocks(self, correlation_matrix: np.ndarray, 
-                                 volatilities: np.ndarray) -> np.ndarray:
+                                 volatilities: np.ndarray,
+                                 cholesky: Optional[np.ndarray] = None,
+                                 out: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Generate correlated random shocks
         
         Args:
             correlation_matrix: Correlation matrix
             volatilities: Volatility vector
+            cholesky: Precomputed Cholesky factor of the correlation matrix (optional)
+            out: Preallocated buffer to write the shocks into (optional)
             
         Returns:
             Correlated random shocks
         """
-        # Cholesky decomposition for correlation
-        try:
-            cholesky = np.linalg.cholesky(correlation_matrix)
-        except np.linalg.LinAlgError:
-            # If correlation matrix is not positive definite, use identity
-            cholesky = np.eye(len(correlation_matrix))
+        if cholesky is None:
+            cholesky = self.cholesky_factor(correlation_matrix)
             
         # Generate independent shocks
         independent_shocks = self.get_random_normal(size=len(volatilities))
         
         # Apply correlation and scale by volatilities
-        correlated_shocks = cholesky @ independent_shocks
-        return correlated_shocks * volatilities 
\ No newline at end of file
+        correlated_shocks = np.dot(cholesky, independent_shocks, out=out)
+        correlated_shocks *= volatilities
+        return correlated_shocks
+    
+    @staticmethod
+    def cholesky_factor(correlation_matrix: np.ndarray) -> np.ndarray:
+        """Cholesky factor of a correlation matrix (identity if not positive definite)"""
+        try:
+            return np.linalg.cholesky(correlation_matrix)
+        except np.linalg.LinAlgError:
+            # If correlation matrix is not positive definite, use identity
+            return np.eye(len(correlation_matrix))
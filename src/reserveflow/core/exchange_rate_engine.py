@@ -4,9 +4,16 @@ Exchange Rate Engine - Multi-Currency Exchange Rate System with Stochastic Volat
 
 import numpy as np
 import pandas as pd
+from collections.abc import Mapping
 from typing import Dict, List, Any, Tuple
 from datetime import datetime
-from .base_engine import BaseEngine
+from .base_engine import ArrayView, BaseEngine
+from .kernels import fx_step_kernel
+
+
+def _to_vector(values) -> np.ndarray:
+    """Stack per-currency values (floats or size-1 arrays) into a flat vector"""
+    return np.array([np.ravel(value)[0] for value in values], dtype=np.float64)
 
 
 class ExchangeRateEngine(BaseEngine):
@@ -20,10 +27,35 @@ class ExchangeRateEngine(BaseEngine):
         self.currencies = config.major_currencies
         self.base_currency = "USD"  # Base currency for all rates
         
-        # Exchange rate levels (all vs USD)
-        self.exchange_rates = {}
-        self.volatilities = {}
+        # Positions of all currencies, and of the non-base currencies, in the
+        # state vectors
+        self._currency_index = {c: i for i, c in enumerate(self.currencies)}
+        self._non_base_currencies = tuple(c for c in self.currencies if c != self.base_currency)
+        self._non_base_idx = np.array([i for i, c in enumerate(self.currencies)
+                                       if c != self.base_currency], dtype=np.intp)
+        self._non_base_index = {c: j for j, c in enumerate(self._non_base_currencies)}
+        
+        # Exchange rate levels (all vs USD) and volatilities, one entry per currency
+        self._rates = np.ones(len(self.currencies))
+        self._vols = np.zeros(len(self.currencies))
+        self._base_vol = np.zeros(len(self._non_base_currencies))
+        self._target_vols = None
+        
+        # Cross-rate pair names and their (from, to) positions, in from-major order
+        pairs = [(i, j) for i in range(len(self.currencies))
+                 for j in range(len(self.currencies)) if i != j]
+        self._pair_names = [f"{self.currencies[i]}/{self.currencies[j]}" for i, j in pairs]
+        self._pair_from_idx = np.array([i for i, _ in pairs], dtype=np.intp)
+        self._pair_to_idx = np.array([j for _, j in pairs], dtype=np.intp)
         self.correlation_matrix = None
+        self._corr_factor = None
+        self._shock_buf = np.empty(len(self._non_base_currencies))
+        self._drift_buf = np.empty(len(self._non_base_currencies))
+        
+        # Each step draws one uniform (regime) and two normals per non-base
+        # currency (volatility shock, rate shock)
+        self.normals_per_step = 2 * len(self._non_base_currencies)
+        self.uniforms_per_step = 1
         
         # Stochastic volatility parameters
         self.vol_mean_reversion = 0.1
@@ -34,47 +66,66 @@ class ExchangeRateEngine(BaseEngine):
         self.regime_probabilities = np.array([0.8, 0.2])  # [calm, crisis]
         self.current_regime = 0  # Start in calm regime
         self.regime_volatility_multipliers = np.array([1.0, 2.5])
+        self.crisis_exit_probability = 0.1  # Daily chance to return to calm
         
     def initialize(self) -> None:
         """Initialize exchange rate system"""
-        # Initialize exchange rates from config
-        for currency in self.currencies:
-            if currency == self.base_currency:
-                self.exchange_rates[currency] = 1.0
-            else:
-                pair = f"{currency}/USD" if currency in ["EUR", "GBP", "AUD"] else f"USD/{currency}"
-                if pair in self.config.initial_exchange_rates:
-                    if currency in ["EUR", "GBP", "AUD"]:
-                        self.exchange_rates[currency] = self.config.initial_exchange_rates[pair]
-                    else:
-                        self.exchange_rates[currency] = 1.0 / self.config.initial_exchange_rates[pair]
-                else:
-                    # Default rates if not specified
-                    default_rates = {
-                        "EUR": 1.12, "GBP": 1.31, "JPY": 0.009, 
-                        "CNY": 0.155, "CHF": 1.09, "CAD": 0.80, "AUD": 0.75
-                    }
-                    self.exchange_rates[currency] = default_rates.get(currency, 1.0)
+        # Default rates if not specified in the config
+        default_rates = {
+            "EUR": 1.12, "GBP": 1.31, "JPY": 0.009, 
+            "CNY": 0.155, "CHF": 1.09, "CAD": 0.80, "AUD": 0.75
+        }
         
-        # Initialize volatilities
-        for currency in self.currencies:
+        # Initialize exchange rates from config; EUR, GBP and AUD are quoted
+        # directly (XXX/USD), the rest indirectly (USD/XXX)
+        initial_rates = self.config.initial_exchange_rates
+        direct_quotes = ("EUR", "GBP", "AUD")
+        for i, currency in enumerate(self.currencies):
             if currency == self.base_currency:
-                self.volatilities[currency] = 0.0
+                self._rates[i] = 1.0
+                continue
+            
+            direct = currency in direct_quotes
+            quote = initial_rates.get(f"{currency}/USD" if direct else f"USD/{currency}")
+            if quote is None:
+                self._rates[i] = default_rates.get(currency, 1.0)
             else:
-                # Ensure we get a float, not a dict
-                vol_config = self.config.currency_volatility
-                if isinstance(vol_config, dict):
-                    self.volatilities[currency] = vol_config.get(currency, 0.10)
-                else:
-                    self.volatilities[currency] = float(vol_config)
+                self._rates[i] = quote if direct else 1.0 / quote
+        
+        # Initialize volatilities once from the (static) config; the base
+        # currency has none
+        vol_config = self.config.currency_volatility
+        self._base_vol[:] = [vol_config.get(c, 0.10) for c in self._non_base_currencies]
+        self._vols[:] = 0.0
+        self._vols[self._non_base_idx] = self._base_vol
+        
+        # Long-run volatility targets for each regime (row = regime)
+        self._target_vols = np.outer(self.regime_volatility_multipliers, self._base_vol)
+        
+        # Drift components: currency-specific annual trends (Yuan appreciation,
+        # Euro stability, Yen intervention bias) and sensitivity to risk
+        # sentiment (safe havens gain, risk currencies lose)
+        trends = {"CNY": 0.02, "EUR": 0.001, "JPY": -0.005}
+        self._base_drift = np.array([trends.get(c, 0.0) for c in self._non_base_currencies])
+        self._risk_sentiment_coef = np.where(
+            np.isin(self._non_base_currencies, ["CHF", "JPY"]), 0.1, -0.05
+        )
         
         # Initialize correlation matrix
         self._initialize_correlation_matrix()
+    
+    @property
+    def exchange_rates(self) -> Mapping:
+        """Live view of the exchange rates vs USD by currency"""
+        return ArrayView(self._currency_index, self._rates)
+    
+    @property
+    def volatilities(self) -> Mapping:
+        """Live view of the current volatilities by currency"""
+        return ArrayView(self._currency_index, self._vols)
         
     def _initialize_correlation_matrix(self) -> None:
         """Initialize realistic correlation matrix for currencies"""
-        n_currencies = len(self.currencies) - 1  # Exclude base currency
-        
         # Create realistic correlation structure
         base_correlations = {
             # EUR correlations
@@ -100,12 +151,11 @@ class ExchangeRateEngine(BaseEngine):
         }
         
         # Build correlation matrix
-        non_base_currencies = [c for c in self.currencies if c != self.base_currency]
-        n = len(non_base_currencies)
+        n = len(self._non_base_currencies)
         correlation_matrix = np.eye(n)
         
-        for i, curr1 in enumerate(non_base_currencies):
-            for j, curr2 in enumerate(non_base_currencies):
+        for i, curr1 in enumerate(self._non_base_currencies):
+            for j, curr2 in enumerate(self._non_base_currencies):
                 if i != j:
                     key = tuple(sorted([curr1, curr2]))
                     correlation = base_correlations.get(key, 0.1)  # Default low correlation
@@ -114,34 +164,34 @@ class ExchangeRateEngine(BaseEngine):
         # Ensure positive definite
         eigenvals, eigenvecs = np.linalg.eigh(correlation_matrix)
         eigenvals = np.maximum(eigenvals, 0.01)  # Minimum eigenvalue
-        correlation_matrix = eigenvecs @ np.diag(eigenvals) @ eigenvecs.T
         
-        # Normalize diagonal
-        d = np.sqrt(np.diag(correlation_matrix))
-        correlation_matrix = correlation_matrix / np.outer(d, d)
+        # V * sqrt(lambda) already factors the repaired matrix; normalizing
+        # its rows gives unit diagonal, so no Cholesky decomposition is needed
+        corr_factor = eigenvecs * np.sqrt(eigenvals)
+        corr_factor /= np.linalg.norm(corr_factor, axis=1, keepdims=True)
         
-        self.correlation_matrix = correlation_matrix
+        # C-contiguous float64 so the compiled kernel gets a single specialization
+        self._corr_factor = np.ascontiguousarray(corr_factor, dtype=np.float64)
+        self.correlation_matrix = self._corr_factor @ self._corr_factor.T
         
     def step(self, current_time: datetime, market_state: Dict[str, Any]) -> Dict[str, Any]:
         """Simulate one step of exchange rate evolution"""
         dt = 1.0 / 365.25  # Daily time step
+        normals, uniforms = self.next_random_draws()
+        n = len(self._non_base_currencies)
         
         # Update regime
-        self._update_regime(market_state)
+        self._update_regime(market_state, uniforms[0])
         
-        # Update stochastic volatilities
-        self._update_volatilities(dt)
+        # Update stochastic volatilities, generate correlated currency shocks
+        # and update exchange rates
+        shocks = self._update_exchange_rates(dt, normals[:n], normals[n:], market_state)
         
-        # Generate correlated currency shocks
-        shocks = self._generate_currency_shocks(dt)
-        
-        # Update exchange rates
-        self._update_exchange_rates(shocks, dt, market_state)
-        
-        # Prepare output
+        # Prepare output; the views wrap snapshots since the state vectors
+        # are updated in place
         output = {
-            "exchange_rates": self.exchange_rates.copy(),
-            "volatilities": self.volatilities.copy(),
+            "exchange_rates": ArrayView(self._currency_index, self._rates.copy()),
+            "volatilities": ArrayView(self._currency_index, self._vols.copy()),
             "regime": self.current_regime,
             "currency_shocks": shocks
         }
@@ -151,121 +201,58 @@ class ExchangeRateEngine(BaseEngine):
         
         return output
     
-    def _update_regime(self, market_state: Dict[str, Any]) -> None:
-        """Update market regime (calm vs crisis)"""
+    def _update_regime(self, market_state: Dict[str, Any], uniform: float) -> None:
+        """Update market regime (calm vs crisis) given one uniform draw"""
         # Get geopolitical risk factor
         geopolitical_risk = market_state.get("geopolitical_risk", 0.3)
         
         # Get market stress indicators
-        market_stress = 0.0
-        if "market_stress" in market_state:
-            market_stress = market_state["market_stress"]
+        market_stress = market_state.get("market_stress", 0.0)
         
-        # Calculate regime transition probabilities
+        # Two-state Markov chain: the probability of leaving the current
+        # regime is the only thing that depends on the state
         stress_factor = geopolitical_risk + market_stress
         crisis_probability = min(0.4, 0.05 + stress_factor * 0.3)
+        switch_probability = (crisis_probability, self.crisis_exit_probability)[self.current_regime]
         
-        if self.current_regime == 0:  # Currently calm
-            if self.get_random_uniform() < crisis_probability:
-                self.current_regime = 1
-        else:  # Currently crisis
-            if self.get_random_uniform() < 0.1:  # 10% chance to return to calm
-                self.current_regime = 0
+        self.current_regime ^= int(uniform < switch_probability)
                 
-    def _update_volatilities(self, dt: float) -> None:
-        """Update stochastic volatilities using mean-reverting process"""
-        regime_multiplier = self.regime_volatility_multipliers[self.current_regime]
+    def _update_exchange_rates(self, dt: float, vol_normals: np.ndarray,
+                               rate_normals: np.ndarray,
+                               market_state: Dict[str, Any]) -> Mapping:
+        """
+        Update volatilities (mean-reverting) and exchange rates (geometric
+        Brownian motion with correlated shocks) in one compiled kernel
         
-        for currency in self.currencies:
-            if currency == self.base_currency:
-                continue
-                
-            base_vol = self.config.currency_volatility.get(currency, 0.10)
-            target_vol = base_vol * regime_multiplier
-            current_vol = self.volatilities[currency]
-            
-            # Mean-reverting stochastic volatility
-            vol_shock = self.get_random_normal() * self.vol_of_vol * np.sqrt(dt)
-            new_vol = current_vol + self.vol_mean_reversion * (target_vol - current_vol) * dt + vol_shock
-            
-            # Ensure positive volatility
-            self.volatilities[currency] = max(new_vol, 0.01)
-    
-    def _generate_currency_shocks(self, dt: float) -> Dict[str, float]:
-        """Generate correlated currency shocks"""
-        non_base_currencies = [c for c in self.currencies if c != self.base_currency]
+        Returns:
+            Correlated rate shock per non-base currency
+        """
+        # Get central bank interventions
+        interventions = market_state.get("cb_interventions", {})
+        intervention_effect = _to_vector(interventions.get(currency, 0.0)
+                                         for currency in self._non_base_currencies)
         
-        # Ensure volatilities are scalar floats
-        vol_values = []
-        for c in non_base_currencies:
-            vol = self.volatilities.get(c, 0.1)
-            if isinstance(vol, dict): # Safeguard against nested dicts
-                vol = vol.get(c, 0.1)
-            vol_values.append(float(vol))
-
-        volatilities = np.array(vol_values)
+        # Add drift (interest rate differential, trend, etc.)
+        drift = self._calculate_drift(market_state)
         
-        # Generate correlated shocks
-        shocks_array = self.generate_correlated_shocks(
-            self.correlation_matrix, 
-            volatilities * np.sqrt(dt)
+        fx_step_kernel(
+            self._rates, self._vols, self._non_base_idx,
+            self._target_vols[self.current_regime], self._corr_factor,
+            drift, intervention_effect,
+            self.vol_mean_reversion, self.vol_of_vol, dt,
+            vol_normals, rate_normals, self._shock_buf
         )
         
-        # Convert to dictionary
-        shocks = {currency: shock for currency, shock in zip(non_base_currencies, shocks_array)}
-        
-        return shocks
-    
-    def _update_exchange_rates(self, shocks: Dict[str, float], dt: float, 
-                             market_state: Dict[str, Any]) -> None:
-        """Update exchange rates with geometric Brownian motion"""
-        
-        # Get central bank interventions
-        interventions = market_state.get("cb_interventions", {})
-        
-        for currency in self.currencies:
-            if currency == self.base_currency:
-                continue
-                
-            current_rate = self.exchange_rates[currency]
-            shock = shocks[currency]
-            
-            # Add drift (interest rate differential, trend, etc.)
-            drift = self._calculate_drift(currency, market_state)
-            
-            # Add intervention effect
-            intervention_effect = interventions.get(currency, 0.0)
-            
-            # Geometric Brownian motion with interventions
-            rate_change = (drift + intervention_effect) * dt + shock
-            new_rate = current_rate * np.exp(rate_change)
-            
-            self.exchange_rates[currency] = new_rate
+        # Snapshot the shock buffer, which the next step overwrites
+        return ArrayView(self._non_base_index, self._shock_buf.copy())
     
-    def _calculate_drift(self, currency: str, market_state: Dict[str, Any]) -> float:
-        """Calculate drift term for exchange rate"""
-        # Base drift from fundamentals
-        base_drift = 0.0
-        
-        # Add currency-specific trends
-        if currency == "CNY":
-            # Yuan appreciation trend
-            base_drift += 0.02  # 2% annual appreciation
-        elif currency == "EUR":
-            # Euro stability
-            base_drift += 0.001
-        elif currency == "JPY":
-            # Yen intervention bias
-            base_drift -= 0.005
-            
-        # Add market-wide factors
+    def _calculate_drift(self, market_state: Dict[str, Any]) -> np.ndarray:
+        """Calculate drift terms for all non-base exchange rates"""
+        # Fixed currency trends plus the market-wide risk sentiment factor
         risk_sentiment = market_state.get("risk_sentiment", 0.0)
-        if currency in ["CHF", "JPY"]:  # Safe haven currencies
-            base_drift += risk_sentiment * 0.1
-        else:  # Risk currencies
-            base_drift -= risk_sentiment * 0.05
-            
-        return base_drift
+        drift = np.multiply(self._risk_sentiment_coef, risk_sentiment, out=self._drift_buf)
+        drift += self._base_drift
+        return drift
     
     def get_cross_rate(self, from_currency: str, to_currency: str) -> float:
         """Calculate cross exchange rate"""
@@ -278,10 +265,8 @@ class ExchangeRateEngine(BaseEngine):
     
     def get_all_cross_rates(self) -> Dict[str, float]:
         """Get all currency cross rates"""
-        cross_rates = {}
-        for from_curr in self.currencies:
-            for to_curr in self.currencies:
-                if from_curr != to_curr:
-                    pair = f"{from_curr}/{to_curr}"
-                    cross_rates[pair] = self.get_cross_rate(from_curr, to_curr)
-        return cross_rates 
\ No newline at end of file
+        # Rates are quoted vs USD with USD itself at 1.0, so every cross rate
+        # is a ratio of two entries
+        cross_matrix = self._rates[:, None] / self._rates[None, :]
+        values = cross_matrix[self._pair_from_idx, self._pair_to_idx]
+        return dict(zip(self._pair_names, values.tolist())) 
\ No newline at end of file
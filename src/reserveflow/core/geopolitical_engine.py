@@ -4,9 +4,47 @@ Geopolitical Risk Engine - Models geopolitical tensions affecting reserve manage
 
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List, Tuple
+from dataclasses import dataclass
+from typing import Dict, Any, FrozenSet, List, Optional
 from datetime import datetime, timedelta
-from .base_engine import BaseEngine
+from ..config import _DATACLASS_OPTIONS
+from .base_engine import ArrayView, BaseEngine
+from .kernels import geo_simulate_kernel, geo_step_kernel
+
+
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
+class GeopoliticalEventType:
+    """Parameters shared by every event of one type"""
+    name: str
+    type_id: int                          # Index into the engine's event-type tables
+    impact: float
+    duration: timedelta
+    affected_currencies: FrozenSet[str]
+
+
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
+class GeopoliticalEvent:
+    """A geopolitical event and the period over which it is active"""
+    event_type: GeopoliticalEventType
+    start_date: datetime
+    end_date: datetime
+    end_day: int                          # Last active day, in days since the engine's epoch
+    
+    @property
+    def type(self) -> str:
+        return self.event_type.name
+    
+    @property
+    def type_id(self) -> int:
+        return self.event_type.type_id
+    
+    @property
+    def impact(self) -> float:
+        return self.event_type.impact
+    
+    @property
+    def affected_currencies(self) -> FrozenSet[str]:
+        return self.event_type.affected_currencies
 
 
 class GeopoliticalRiskEngine(BaseEngine):
@@ -33,22 +71,98 @@ class GeopoliticalRiskEngine(BaseEngine):
         self.risk_persistence = 0.95
         self.risk_volatility = 0.1
         
-        # Regional risk factors
-        self.regional_risks = self._initialize_regional_risks()
+        # Regional risk factors and their trends, as vectors in region order
+        initial_regional_risks = self._initialize_regional_risks()
+        self._regions = list(initial_regional_risks)
+        self._region_index = {r: i for i, r in enumerate(self._regions)}
+        self._regional_risk_vec = np.array(list(initial_regional_risks.values()), dtype=np.float64)
+        self._regional_trends = np.array([self._get_regional_trend(r) for r in self._regions])
         
         # Major event scenarios
         self.event_probabilities = self._initialize_event_probabilities()
-        self.active_events = []
         
+        # Active events as parallel arrays (type index, impact, last active
+        # day) alongside their event dicts, oldest first. Days are int64
+        # counts from a fixed epoch so expiry is a plain integer comparison
+        self._epoch = np.datetime64("2000-01-01", "D")
+        self._ev_type_id = np.empty(0, dtype=np.intp)
+        self._ev_impact = np.empty(0, dtype=np.float64)
+        self._ev_end_day = np.empty(0, dtype=np.int64)
+        self._ev_records = []
+        
+        # Event parameters as parallel arrays, so one vector of uniforms
+        # decides every event type's occurrence each step
+        self._event_types = list(self.event_probabilities)
+        events = [self.event_probabilities[t] for t in self._event_types]
+        self._event_daily_probs = np.array([e["probability"] / 30 for e in events])  # Monthly to daily
+        self._event_impacts = np.array([e["impact"] for e in events])
+        self._event_durations = [timedelta(days=e["duration"] * 30) for e in events]
+        self._event_duration_days = np.array([d.days for d in self._event_durations], dtype=np.int64)
+        self._event_currencies = [frozenset(e["affected_currencies"]) for e in events]
+        self._event_type_index = {t: i for i, t in enumerate(self._event_types)}
+        
+        # One shared, immutable template per type that every event of the
+        # type refers to
+        self._event_templates = [
+            GeopoliticalEventType(t, i, float(self._event_impacts[i]),
+                                  self._event_durations[i], self._event_currencies[i])
+            for i, t in enumerate(self._event_types)
+        ]
+        self._spillover_coef = self._initialize_spillover_coefficients()
+        self._dedollar_coef = np.array([self._dedollarization_weight(t) for t in self._event_types])
+        self._dedollar_regions = np.array([self._region_index["asia_pacific"], self._region_index["global"]])
+        self._dedollar_thresholds = np.array([0.5, 0.4])
+        self._dedollar_bumps = np.array([0.1, 0.05])
+        self._initialize_affected_currencies()
+        self._initialize_flight_to_safety()
+        
+        # Crisis scenario handlers by name
+        self._crisis_scenarios = {
+            "major_conflict": self._apply_major_conflict,
+            "financial_warfare": self._apply_financial_warfare,
+            "trade_war": self._apply_trade_war
+        }
+        
+        # Each step draws one uniform per event type, one normal for the
+        # overall risk shock and one normal per region
+        self.uniforms_per_step = len(self._event_types)
+        self.normals_per_step = 1 + len(self._regions)
+        
+    @property
+    def regional_risks(self) -> ArrayView:
+        """Live view of the regional risk levels by region"""
+        return ArrayView(self._region_index, self._regional_risk_vec)
+    
+    @regional_risks.setter
+    def regional_risks(self, risks: Dict[str, float]) -> None:
+        """Set the levels of the given regions; regions not listed keep theirs"""
+        for region, risk in risks.items():
+            self._regional_risk_vec[self._region_index[region]] = risk
+    
+    def _regional_risk(self, region: str) -> float:
+        """Current risk level of one region"""
+        return self._regional_risk_vec[self._region_index[region]]
+    
+    @property
+    def active_events(self) -> List[GeopoliticalEvent]:
+        """Currently active events, oldest first"""
+        return self._ev_records
+    
     def initialize(self) -> None:
         """Initialize geopolitical risk state"""
         # Initialize current risk levels
         self.current_risk = self.baseline_risk
         
-        # Set up event tracking
-        self.event_history = []
+        # Set up momentum tracking; events are tracked only while active
         self.risk_momentum = 0.0
         
+        # Per-step constants of the daily risk dynamics
+        dt = 1.0 / 365.25  # Daily time step
+        self._dt = dt
+        self._reversion_rate = (1 - self.risk_persistence) * dt
+        self._risk_sigma = self.risk_volatility * np.sqrt(dt)
+        self._region_sigma = 0.05 * np.sqrt(dt)
+        
     def _initialize_regional_risks(self) -> Dict[str, float]:
         """Initialize regional risk factors"""
         return {
@@ -96,20 +210,16 @@ class GeopoliticalRiskEngine(BaseEngine):
         }
     
     def step(self, current_time: datetime, market_state: Dict[str, Any]) -> Dict[str, Any]:
-        """Simulate one step of geopolitical risk evolution"""
-        dt = 1.0 / 365.25  # Daily time step
+        """
+        Simulate one step of geopolitical risk evolution
         
-        # Check for new geopolitical events
-        new_events = self._check_for_events(current_time)
-        
-        # Update active events
-        self._update_active_events(current_time)
-        
-        # Calculate overall risk level
-        self._update_risk_level(market_state, dt)
-        
-        # Update regional risks
-        self._update_regional_risks(dt)
+        The output is shared, not copied: the active-event list is the
+        engine's own (replaced, never mutated, when events change) and must
+        be treated as read-only. The regional risks are an ArrayView over a
+        snapshot, because the risk kernel updates the live vector in place
+        and callers keep each step's output.
+        """
+        new_events = self._advance(current_time, market_state)
         
         # Calculate de-dollarization pressure
         dedollarization_pressure = self._calculate_dedollarization_pressure()
@@ -120,8 +230,9 @@ class GeopoliticalRiskEngine(BaseEngine):
         # Prepare output
         output = {
             "geopolitical_risk": self.current_risk,
-            "regional_risks": self.regional_risks.copy(),
-            "active_events": self.active_events.copy(),
+            "regional_risks": ArrayView(self._region_index, self._regional_risk_vec.copy()),
+            # The event list is replaced, never mutated, when events change
+            "active_events": self.active_events,
             "new_events": new_events,
             "dedollarization_pressure": dedollarization_pressure,
             "flight_to_safety": flight_to_safety,
@@ -137,74 +248,273 @@ class GeopoliticalRiskEngine(BaseEngine):
         
         return output
     
-    def _check_for_events(self, current_time: datetime) -> List[Dict[str, Any]]:
-        """Check for new geopolitical events"""
-        new_events = []
-        
-        for event_type, event_config in self.event_probabilities.items():
-            # Adjust probability based on current risk level
-            base_prob = event_config["probability"] / 30  # Convert monthly to daily
-            adjusted_prob = base_prob * (1 + self.current_risk)
-            
-            if self.get_random_uniform() < adjusted_prob:
-                # Event occurs
-                event = {
-                    "type": event_type,
-                    "start_date": current_time,
-                    "end_date": current_time + timedelta(days=event_config["duration"] * 30),
-                    "impact": event_config["impact"],
-                    "affected_currencies": event_config["affected_currencies"]
-                }
-                new_events.append(event)
-                self.active_events.append(event)
-                
-        return new_events
-    
-    def _update_active_events(self, current_time: datetime) -> None:
-        """Update and remove expired events"""
-        self.active_events = [
-            event for event in self.active_events 
-            if current_time <= event["end_date"]
-        ]
-    
-    def _update_risk_level(self, market_state: Dict[str, Any], dt: float) -> None:
-        """Update overall geopolitical risk level"""
-        # Base risk from active events
-        event_risk = sum(event["impact"] for event in self.active_events)
+    def _advance(self, current_time: datetime, market_state: Dict[str, Any]) -> List[GeopoliticalEvent]:
+        """
+        Advance events and risk levels by one day
         
-        # Risk from market stress feedback
-        market_stress = market_state.get("market_stress", 0.0)
-        stress_feedback = market_stress * 0.2
+        Returns:
+            Events that started this step
+        """
+        normals, uniforms = self.next_random_draws()
+        day = self._epoch_day(current_time)
         
-        # Mean reversion to baseline
-        target_risk = self.baseline_risk + event_risk + stress_feedback
+        # Check for new geopolitical events
+        new_events = self._check_for_events(current_time, day, uniforms)
         
-        # Add random shocks
-        risk_shock = self.get_random_normal() * self.risk_volatility * np.sqrt(dt)
+        # Update active events
+        self._update_active_events(day)
         
-        # Update with persistence
-        risk_change = (target_risk - self.current_risk) * (1 - self.risk_persistence) * dt + risk_shock
-        self.current_risk = max(0.0, min(1.0, self.current_risk + risk_change))
+        # Update overall and regional risk levels
+        self._update_risk_levels(market_state, normals)
         
-        # Update risk momentum
-        self.risk_momentum = 0.9 * self.risk_momentum + 0.1 * risk_change
+        return new_events
+    
+    def simulate(self, n_days: int, start_time: Optional[datetime] = None,
+                 market_state: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """
+        Run the engine on its own for a number of days under a fixed market state
+        
+        All random draws for the horizon are made up front and the whole
+        run happens in one compiled kernel, which records only the risk
+        levels, so this is much cheaper than calling step() once per day.
+        The engine's state, including its active events, ends up exactly
+        as if step() had been called for each day.
+        
+        Args:
+            n_days: Number of daily steps to simulate
+            start_time: Date of the first step (defaults to the day after the
+                engine's current time); the engine's clock ends on the last day
+            market_state: Market conditions held fixed over the run (optional)
+            
+        Returns:
+            DataFrame indexed by date with the overall risk, each region's
+            risk and the number of active events
+        """
+        market_state = market_state if market_state is not None else {}
+        start_time = start_time if start_time is not None else self._next_day()
+        times = pd.date_range(start_time, periods=n_days, freq="D", name="timestamp")
+        
+        risk_hist = np.empty(n_days)
+        regions_hist = np.empty((n_days, len(self._regions)))
+        active_hist = np.empty(n_days, dtype=np.int64)
+        hits = np.zeros((n_days, len(self._event_types)), dtype=np.bool_)
+        
+        if n_days:
+            self._simulate_block(times, market_state, risk_hist, regions_hist, active_hist, hits)
+            self.current_time = times[-1]
+        
+        results = pd.DataFrame(regions_hist, index=times, columns=self._regions)
+        results.insert(0, "geopolitical_risk", risk_hist)
+        results["active_events"] = active_hist
+        return results
+    
+    def _simulate_block(self, times: pd.DatetimeIndex, market_state: Dict[str, Any],
+                        risk_hist: np.ndarray, regions_hist: np.ndarray,
+                        active_hist: np.ndarray, hits: np.ndarray) -> None:
+        """Run simulate()'s days through the compiled kernel and sync the engine state"""
+        n_days = len(times)
+        self.prefill_rng(n_days)
+        self._rng_row = n_days
+        start_day = self._epoch_day(times[0])
+        stress_feedback = market_state.get("market_stress", 0.0) * 0.2
+        
+        (self.current_risk, self.risk_momentum,
+         self._ev_type_id, self._ev_impact, self._ev_end_day) = geo_simulate_kernel(
+            float(self.current_risk), float(self.risk_momentum),
+            self._regional_risk_vec, self._regional_trends,
+            self._ev_type_id, self._ev_impact, self._ev_end_day,
+            start_day, self._event_daily_probs, self._event_impacts,
+            self._event_duration_days, self._spillover_coef,
+            float(self.baseline_risk), float(stress_feedback),
+            self._reversion_rate, self._risk_sigma, self._region_sigma, self._dt,
+            self._normal_buf, self._uniform_buf,
+            risk_hist, regions_hist, active_hist, hits
+        )
+        
+        # Rebuild the records of the events still active on the last day,
+        # in the same order as the kernel's arrays
+        last_day = start_day + n_days - 1
+        records = [event for event in self._ev_records if event.end_day >= last_day]
+        for t, i in zip(*np.nonzero(hits)):
+            end_day = start_day + int(t) + int(self._event_duration_days[i])
+            if end_day >= last_day:
+                template = self._event_templates[i]
+                records.append(GeopoliticalEvent(template, times[t], times[t] + template.duration, end_day))
+        self._ev_records = records
     
-    def _update_regional_risks(self, dt: float) -> None:
-        """Update regional risk factors"""
-        for region in self.regional_risks:
-            # Base regional trends
-            base_trend = self._get_regional_trend(region)
+    def simulate_paths(self, n_paths: int, n_days: int, start_time: Optional[datetime] = None,
+                       market_state: Optional[Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
+        """
+        Run many independent Monte Carlo paths of the risk dynamics at once
+        
+        Every path starts from the engine's current risk levels and active
+        events and evolves under a fixed market state. All paths advance
+        together, one vectorized update per day, with the path as the
+        leading axis of the state. The engine's own state is not changed.
+        
+        Args:
+            n_paths: Number of independent paths
+            n_days: Number of daily steps to simulate
+            start_time: Date of the first step (defaults to the day after the
+                engine's current time)
+            market_state: Market conditions held fixed over the run (optional)
+            
+        Returns:
+            Dictionary with "geopolitical_risk" (n_days, n_paths),
+            "regional_risks" (n_days, n_paths, n_regions) in the order of
+            "regions", and "active_events" (n_days, n_paths) event counts
+        """
+        market_state = market_state if market_state is not None else {}
+        start_day = self._epoch_day(start_time if start_time is not None else self._next_day())
+        n_types = len(self._event_types)
+        
+        # Every event of a type has the same impact and duration, so each
+        # path's events reduce to active counts per type plus a ring buffer
+        # of counts due to expire on each upcoming day. New events expire
+        # at most (longest duration + 1) days after they start, which bounds
+        # the ring
+        impacts = self._event_impacts
+        durations = self._event_duration_days
+        ring_size = int(durations.max()) + 2
+        active = np.zeros((n_paths, n_types), dtype=np.int64)
+        expiring = np.zeros((ring_size, n_paths, n_types), dtype=np.int64)
+        
+        # Events already active on the engine are active on every path; an
+        # event expires on the first day after its end date. Their expiries
+        # are not bounded by the ring, so they are kept per day, shared by
+        # all paths
+        expire_days = self._ev_end_day - start_day + 1
+        carried = expire_days > 0
+        np.add.at(active, (slice(None), self._ev_type_id[carried]), 1)
+        carried &= expire_days < n_days
+        carried_expiring = np.zeros((n_days, n_types), dtype=np.int64)
+        np.add.at(carried_expiring, (expire_days[carried], self._ev_type_id[carried]), 1)
+        
+        risk = np.full(n_paths, float(self.current_risk))
+        regional = np.tile(self._regional_risk_vec, (n_paths, 1))
+        stress_feedback = market_state.get("market_stress", 0.0) * 0.2
+        
+        risk_hist = np.empty((n_days, n_paths))
+        regions_hist = np.empty((n_days, n_paths, len(self._regions)))
+        active_hist = np.empty((n_days, n_paths), dtype=np.int64)
+        
+        for t in range(n_days):
+            # Event births, with probabilities scaled by each path's risk
+            hits = self.rng.random((n_paths, n_types)) < self._event_daily_probs * (1 + risk[:, None])
+            active += hits
+            for type_id in np.flatnonzero(hits.any(axis=0)):
+                expire_day = t + durations[type_id] + 1
+                if expire_day < n_days:
+                    expiring[expire_day % ring_size, :, type_id] += hits[:, type_id]
             
-            # Event spillover effects
-            spillover = self._calculate_regional_spillover(region)
+            # Expiries due today
+            slot = expiring[t % ring_size]
+            active -= slot
+            active -= carried_expiring[t]
+            slot[:] = 0
             
-            # Random regional shocks
-            regional_shock = self.get_random_normal() * 0.05 * np.sqrt(dt)
+            # Overall and regional risk updates for every path
+            normals = self.rng.standard_normal((n_paths, 1 + len(self._regions)))
+            event_impacts = active * impacts
+            target_risk = self.baseline_risk + event_impacts.sum(axis=1) + stress_feedback
+            risk_change = (target_risk - risk) * self._reversion_rate + normals[:, 0] * self._risk_sigma
+            np.clip(risk + risk_change, 0.0, 1.0, out=risk)
             
-            # Update regional risk
-            risk_change = base_trend + spillover + regional_shock
-            new_risk = self.regional_risks[region] + risk_change * dt
-            self.regional_risks[region] = max(0.0, min(1.0, new_risk))
+            spillover = event_impacts @ self._spillover_coef
+            regional_change = self._regional_trends + spillover + normals[:, 1:] * self._region_sigma
+            np.clip(regional + regional_change * self._dt, 0.0, 1.0, out=regional)
+            
+            risk_hist[t] = risk
+            regions_hist[t] = regional
+            active_hist[t] = active.sum(axis=1)
+        
+        return {
+            "geopolitical_risk": risk_hist,
+            "regional_risks": regions_hist,
+            "active_events": active_hist,
+            "regions": list(self._regions)
+        }
+    
+    def _epoch_day(self, time: Any) -> int:
+        """Convert a date or timestamp to whole days since the engine's epoch"""
+        return int((np.datetime64(time, "D") - self._epoch).astype(np.int64))
+    
+    def _check_for_events(self, current_time: datetime, day: int,
+                          uniforms: np.ndarray) -> List[GeopoliticalEvent]:
+        """
+        Check for new geopolitical events given one uniform draw per event type
+        
+        Args:
+            current_time: Current simulation time, recorded on new events
+            day: current_time as days since the engine's epoch
+            uniforms: One uniform draw per event type
+        """
+        # Event probabilities scale with the current risk level
+        type_ids = np.flatnonzero(uniforms < self._event_daily_probs * (1 + self.current_risk))
+        if not len(type_ids):
+            return []
+        
+        end_days = day + self._event_duration_days[type_ids]
+        templates = [self._event_templates[i] for i in type_ids]
+        new_events = [
+            GeopoliticalEvent(template, current_time, current_time + template.duration, int(end_day))
+            for template, end_day in zip(templates, end_days)
+        ]
+        self._add_active_events(new_events, type_ids, end_days)
+                
+        return new_events
+    
+    def _add_active_events(self, events: List[GeopoliticalEvent], type_ids: np.ndarray,
+                           end_days: np.ndarray) -> None:
+        """
+        Start tracking a step's new events, growing each event array once
+        
+        Active events need no explicit cap: at most one event per type
+        starts each day and each lasts a fixed duration, so there are never
+        more than (number of types) x (longest duration in days) of them.
+        """
+        self._ev_type_id = np.concatenate((self._ev_type_id, type_ids))
+        self._ev_impact = np.concatenate((self._ev_impact, self._event_impacts[type_ids]))
+        self._ev_end_day = np.concatenate((self._ev_end_day, end_days))
+        self._ev_records = self._ev_records + events
+    
+    def _update_active_events(self, day: int) -> None:
+        """Remove events whose last active day is before day (days since the epoch)"""
+        if not len(self._ev_end_day):
+            return
+        
+        keep = self._ev_end_day >= day
+        if keep.all():
+            return
+        self._ev_type_id = self._ev_type_id[keep]
+        self._ev_impact = self._ev_impact[keep]
+        self._ev_end_day = self._ev_end_day[keep]
+        self._ev_records = [event for event, kept in zip(self._ev_records, keep) if kept]
+    
+    def _update_risk_levels(self, market_state: Dict[str, Any], normals: np.ndarray) -> None:
+        """
+        Update the overall and regional risk levels in one compiled kernel
+        
+        Args:
+            market_state: Current market state
+            normals: One standard normal draw for the overall risk, then one per region
+        """
+        type_ids, impacts = self._ev_type_id, self._ev_impact
+        
+        # Overall risk reverts to the baseline plus active event impacts
+        # plus market stress feedback
+        market_stress = market_state.get("market_stress", 0.0)
+        target_risk = self.baseline_risk + impacts.sum() + market_stress * 0.2
+        
+        # Event spillover to every region
+        spillover = impacts @ self._spillover_coef[type_ids]
+        
+        self.current_risk, self.risk_momentum = geo_step_kernel(
+            self.current_risk, self.risk_momentum,
+            self._regional_risk_vec, self._regional_trends, spillover, float(target_risk),
+            self._reversion_rate, self._risk_sigma, self._region_sigma, self._dt,
+            normals[0], normals[1:]
+        )
     
     def _get_regional_trend(self, region: str) -> float:
         """Get baseline trend for regional risk"""
@@ -218,87 +528,80 @@ class GeopoliticalRiskEngine(BaseEngine):
         }
         return trends.get(region, 0.0)
     
-    def _calculate_regional_spillover(self, region: str) -> float:
-        """Calculate spillover effects from active events to regions"""
-        spillover = 0.0
-        
-        for event in self.active_events:
-            event_spillover = 0.0
-            
-            if event["type"] == "trade_war_escalation":
-                if region in ["asia_pacific", "global"]:
-                    event_spillover = event["impact"] * 0.5
-                else:
-                    event_spillover = event["impact"] * 0.2
-                    
-            elif event["type"] == "military_conflict":
-                # Military conflicts affect all regions
-                event_spillover = event["impact"] * 0.3
-                
-            elif event["type"] == "sanctions_expansion":
-                if region in ["europe", "global"]:
-                    event_spillover = event["impact"] * 0.4
-                else:
-                    event_spillover = event["impact"] * 0.1
-                    
-            spillover += event_spillover
-            
-        return spillover
+    def _initialize_spillover_coefficients(self) -> np.ndarray:
+        """Spillover from an event of each type to each region, per unit of impact"""
+        coef = np.zeros((len(self._event_types), len(self._regions)))
+        for i, event_type in enumerate(self._event_types):
+            for j, region in enumerate(self._regions):
+                if event_type == "trade_war_escalation":
+                    coef[i, j] = 0.5 if region in ["asia_pacific", "global"] else 0.2
+                elif event_type == "military_conflict":
+                    # Military conflicts affect all regions
+                    coef[i, j] = 0.3
+                elif event_type == "sanctions_expansion":
+                    coef[i, j] = 0.4 if region in ["europe", "global"] else 0.1
+        return coef
+    
+    @staticmethod
+    def _dedollarization_weight(event_type: str) -> float:
+        """De-dollarization pressure per unit of impact from an event type"""
+        if event_type in ["sanctions_expansion", "economic_warfare"]:
+            return 0.5
+        elif event_type == "trade_war_escalation":
+            return 0.3
+        elif event_type == "cyberattack_major":
+            return 0.2
+        return 0.0
     
     def _calculate_dedollarization_pressure(self) -> float:
         """Calculate pressure for de-dollarization from geopolitical events"""
-        dedollar_pressure = 0.0
-        
         # Base pressure from overall risk
-        dedollar_pressure += self.current_risk * 0.3
+        base_pressure = self.current_risk * 0.3
         
         # Specific event impacts
-        for event in self.active_events:
-            if event["type"] in ["sanctions_expansion", "economic_warfare"]:
-                dedollar_pressure += event["impact"] * 0.5
-            elif event["type"] == "trade_war_escalation":
-                dedollar_pressure += event["impact"] * 0.3
-            elif event["type"] == "cyberattack_major":
-                dedollar_pressure += event["impact"] * 0.2
-        
-        # Regional factors
-        if self.regional_risks["asia_pacific"] > 0.5:
-            dedollar_pressure += 0.1
-        if self.regional_risks["global"] > 0.4:
-            dedollar_pressure += 0.05
+        event_pressure = self._ev_impact @ self._dedollar_coef[self._ev_type_id]
+        
+        # Regional factors: a fixed bump per region above its threshold
+        elevated = self._regional_risk_vec[self._dedollar_regions] > self._dedollar_thresholds
+        regional_pressure = self._dedollar_bumps @ elevated
             
-        return min(1.0, dedollar_pressure)
+        return float(min(1.0, base_pressure + event_pressure + regional_pressure))
     
-    def _calculate_flight_to_safety_effects(self) -> Dict[str, float]:
-        """Calculate flight-to-safety effects on different assets"""
-        # Base flight-to-safety intensity
-        fts_intensity = self.current_risk
-        
-        # Asset-specific effects
-        effects = {
-            "gold": fts_intensity * 0.8,      # Strong safe haven
-            "usd": fts_intensity * 0.6,       # Traditional safe haven
-            "chf": fts_intensity * 0.7,       # Swiss franc safe haven
-            "jpy": fts_intensity * 0.5,       # Yen safe haven
-            "government_bonds": fts_intensity * 0.9  # Government bonds
+    def _initialize_flight_to_safety(self) -> None:
+        """Tabulate flight-to-safety sensitivities and per-event multipliers"""
+        # Asset-specific sensitivity to the flight-to-safety intensity
+        sensitivities = {
+            "gold": 0.8,              # Strong safe haven
+            "usd": 0.6,               # Traditional safe haven
+            "chf": 0.7,               # Swiss franc safe haven
+            "jpy": 0.5,               # Yen safe haven
+            "government_bonds": 0.9   # Government bonds
         }
+        self._fts_index = {asset: i for i, asset in enumerate(sensitivities)}
+        self._fts_base = np.array(list(sensitivities.values()))
+        
+        # Multipliers each active event of a type applies
+        self._fts_event_mult = np.ones((len(self._event_types), len(sensitivities)))
+        sanctions = self._event_type_index["sanctions_expansion"]
+        self._fts_event_mult[sanctions, self._fts_index["usd"]] = 0.8  # USD less attractive if sanctions involve US
+        self._fts_event_mult[sanctions, self._fts_index["gold"]] = 1.2  # Gold more attractive
+        cyberattack = self._event_type_index["cyberattack_major"]
+        self._fts_event_mult[cyberattack, self._fts_index["gold"]] = 1.3  # Physical assets preferred
+    
+    def _calculate_flight_to_safety_effects(self) -> ArrayView:
+        """Calculate flight-to-safety effects on different assets"""
+        # Base flight-to-safety intensity scaled by each asset's sensitivity
+        effects = self._fts_base * self.current_risk
         
         # Adjust for specific events
-        for event in self.active_events:
-            if event["type"] == "sanctions_expansion":
-                effects["usd"] *= 0.8  # USD less attractive if sanctions involve US
-                effects["gold"] *= 1.2  # Gold more attractive
-            elif event["type"] == "cyberattack_major":
-                effects["gold"] *= 1.3  # Physical assets preferred
+        if len(self._ev_type_id):
+            effects *= np.prod(self._fts_event_mult[self._ev_type_id], axis=0)
                 
-        return effects
+        return ArrayView(self._fts_index, effects)
     
-    def get_currency_risk_premium(self, currency: str) -> float:
-        """Get geopolitical risk premium for a specific currency"""
-        base_premium = self.current_risk * 0.1
-        
-        # Currency-specific adjustments
-        currency_risks = {
+    def _initialize_currency_risk_adjustments(self) -> Dict[str, float]:
+        """Initialize currency-specific risk premium adjustments"""
+        return {
             "USD": -0.02,  # Safe haven discount
             "EUR": 0.01,   # Moderate risk
             "JPY": -0.01,  # Safe haven discount
@@ -308,15 +611,47 @@ class GeopoliticalRiskEngine(BaseEngine):
             "CAD": 0.005,  # Stable but commodity-linked
             "AUD": 0.01    # Regional tensions
         }
+    
+    def _initialize_affected_currencies(self) -> None:
+        """Tabulate which currencies each event type affects"""
+        adjustments = self._initialize_currency_risk_adjustments()
+        # Listed currencies in template order, so the premium order is stable
+        named = [c for t in self._event_types
+                 for c in self.event_probabilities[t]["affected_currencies"]
+                 if c not in ("all", "regional")]
+        self._premium_currencies = list(dict.fromkeys(list(adjustments) + named))
+        self._premium_index = {c: i for i, c in enumerate(self._premium_currencies)}
+        self._currency_risk_adj = np.array([adjustments.get(c, 0.0) for c in self._premium_currencies])
+        
+        # Events marked "all" affect every currency, including ones not listed
+        self._affects_all = np.array(["all" in currencies for currencies in self._event_currencies])
+        self._affects = np.array([
+            [affects_all or c in currencies for c in self._premium_currencies]
+            for currencies, affects_all in zip(self._event_currencies, self._affects_all)
+        ])
+    
+    def get_currency_risk_premium(self, currency: str) -> float:
+        """Get geopolitical risk premium for a specific currency"""
+        base_premium = self.current_risk * 0.1
         
-        currency_adjustment = currency_risks.get(currency, 0.0)
-        
-        # Event-specific adjustments
-        for event in self.active_events:
-            if currency in event.get("affected_currencies", []) or "all" in event.get("affected_currencies", []):
-                currency_adjustment += event["impact"] * 0.1
+        # Currency-specific adjustment, plus a share of the impact of each
+        # active event affecting the currency
+        i = self._premium_index.get(currency)
+        if i is None:
+            currency_adjustment = 0.0
+            affected = self._affects_all
+        else:
+            currency_adjustment = self._currency_risk_adj[i]
+            affected = self._affects[:, i]
+        currency_adjustment += self._ev_impact @ affected[self._ev_type_id] * 0.1
                 
-        return base_premium + currency_adjustment
+        return float(base_premium + currency_adjustment)
+    
+    def get_currency_risk_premiums(self) -> ArrayView:
+        """Get geopolitical risk premia for all known currencies at once"""
+        event_adjustment = self._ev_impact @ self._affects[self._ev_type_id] * 0.1
+        premiums = self.current_risk * 0.1 + self._currency_risk_adj + event_adjustment
+        return ArrayView(self._premium_index, premiums)
     
     def get_reserve_reallocation_pressure(self) -> Dict[str, float]:
         """Get pressure for reserve reallocation due to geopolitical factors"""
@@ -331,32 +666,35 @@ class GeopoliticalRiskEngine(BaseEngine):
         pressures["toward_diversification"] = base_pressure
         
         # Regional currency preferences
-        if self.regional_risks["asia_pacific"] > 0.5:
+        if self._regional_risk("asia_pacific") > 0.5:
             pressures["away_from_regional_currencies"] = 0.2
             
-        if self.regional_risks["europe"] > 0.4:
+        if self._regional_risk("europe") > 0.4:
             pressures["away_from_eur"] = 0.1
             
         return pressures
     
+    def _apply_major_conflict(self, intensity: float) -> None:
+        """Simulate major military conflict"""
+        self.current_risk = min(1.0, 0.8 * intensity)
+        self.military_conflicts = 0.6 * intensity
+        self.regional_risks = {"global": 0.7 * intensity}
+    
+    def _apply_financial_warfare(self, intensity: float) -> None:
+        """Simulate financial/economic warfare"""
+        self.economic_warfare = 0.5 * intensity
+        self.sanctions_risk = 0.7 * intensity
+        self.current_risk = min(1.0, 0.6 * intensity)
+    
+    def _apply_trade_war(self, intensity: float) -> None:
+        """Simulate trade war escalation"""
+        self.trade_tensions = 0.8 * intensity
+        self.regional_risks = {"asia_pacific": 0.6 * intensity, "global": 0.5 * intensity}
+    
     def simulate_crisis_scenario(self, crisis_type: str, intensity: float = 1.0) -> Dict[str, Any]:
         """Simulate a specific crisis scenario"""
-        if crisis_type == "major_conflict":
-            # Simulate major military conflict
-            self.current_risk = min(1.0, 0.8 * intensity)
-            self.military_conflicts = 0.6 * intensity
-            self.regional_risks["global"] = 0.7 * intensity
-            
-        elif crisis_type == "financial_warfare":
-            # Simulate financial/economic warfare
-            self.economic_warfare = 0.5 * intensity
-            self.sanctions_risk = 0.7 * intensity
-            self.current_risk = min(1.0, 0.6 * intensity)
-            
-        elif crisis_type == "trade_war":
-            # Simulate trade war escalation
-            self.trade_tensions = 0.8 * intensity
-            self.regional_risks["asia_pacific"] = 0.6 * intensity
-            self.regional_risks["global"] = 0.5 * intensity
+        apply_crisis = self._crisis_scenarios.get(crisis_type)
+        if apply_crisis is not None:
+            apply_crisis(intensity)
             
         return self.step(datetime.now(), {}) 
\ No newline at end of file
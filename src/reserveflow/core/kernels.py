@@ -0,0 +1,417 @@
+"""
+Numba-compiled numeric kernels for the simulation engines
+"""
+
+from typing import Tuple
+
+import numpy as np
+from numba import njit, prange
+
+
+@njit(cache=True, fastmath=True)
+def fx_step_kernel(rates: np.ndarray, vols: np.ndarray, idx: np.ndarray,
+                   target_vol: np.ndarray, corr_factor: np.ndarray,
+                   drift: np.ndarray, intervention: np.ndarray,
+                   vol_mean_reversion: float,
+                   vol_of_vol: float, dt: float,
+                   vol_normals: np.ndarray, rate_normals: np.ndarray,
+                   shocks: np.ndarray) -> None:
+    """
+    Advance exchange rates and their stochastic volatilities by one step
+
+    Updates rates and vols in place at the positions in idx (the non-base
+    currencies) and writes the correlated rate shocks into shocks.
+
+    Args:
+        rates: Exchange rates vs the base currency, one per currency
+        vols: Current volatilities, one per currency
+        idx: Positions of the non-base currencies in rates/vols
+        target_vol: Long-run volatility per non-base currency in the current regime
+        corr_factor: Square factor F of the correlation matrix (F @ F.T)
+        drift: Annual drift per non-base currency
+        intervention: Central bank intervention effect per non-base currency
+        vol_mean_reversion: Mean reversion speed of volatility
+        vol_of_vol: Volatility of volatility
+        dt: Time step in years
+        vol_normals: Standard normal draws for the volatility shocks
+        rate_normals: Independent standard normal draws for the rate shocks
+        shocks: Output buffer for the correlated rate shocks
+    """
+    n = idx.shape[0]
+    sqrt_dt = np.sqrt(dt)
+
+    # Each currency's volatility, shock and rate depend only on its own
+    # entries (plus the shared normals), so one pass does all three
+    for j in range(n):
+        # Mean-reverting stochastic volatility, floored to stay positive
+        current_vol = vols[idx[j]]
+        new_vol = (current_vol + vol_mean_reversion * (target_vol[j] - current_vol) * dt
+                   + vol_normals[j] * vol_of_vol * sqrt_dt)
+        vol = max(new_vol, 0.01)
+        vols[idx[j]] = vol
+
+        # Correlated shock, scaled by the new volatility
+        correlated = 0.0
+        for k in range(n):
+            correlated += corr_factor[j, k] * rate_normals[k]
+        shocks[j] = correlated * (vol * sqrt_dt)
+
+        # Geometric Brownian motion with drift and interventions
+        rates[idx[j]] *= np.exp((drift[j] + intervention[j]) * dt + shocks[j])
+
+
+@njit(cache=True, fastmath=True)
+def geo_step_kernel(current_risk: float, risk_momentum: float,
+                    regional_risks: np.ndarray, regional_trends: np.ndarray,
+                    spillover: np.ndarray, target_risk: float,
+                    reversion_rate: float, risk_sigma: float, region_sigma: float,
+                    dt: float, risk_normal: float,
+                    regional_normals: np.ndarray) -> Tuple[float, float]:
+    """
+    Advance the overall and regional geopolitical risk levels by one step
+
+    Updates regional_risks in place; all levels are bounded to [0, 1].
+
+    Args:
+        current_risk: Current overall risk level
+        risk_momentum: Exponentially smoothed recent risk change
+        regional_risks: Risk level per region
+        regional_trends: Baseline annual trend per region
+        spillover: Spillover from active events per region
+        target_risk: Level the overall risk reverts towards
+        reversion_rate: Per-step reversion of the overall risk, (1 - persistence) * dt
+        risk_sigma: Per-step shock scale of the overall risk, volatility * sqrt(dt)
+        region_sigma: Per-step shock scale of the regional risk changes
+        dt: Time step in years
+        risk_normal: Standard normal draw for the overall risk shock
+        regional_normals: Standard normal draws for the regional shocks
+
+    Returns:
+        Tuple of (new overall risk, new risk momentum)
+    """
+    # Mean reversion with persistence plus a random shock
+    risk_change = (target_risk - current_risk) * reversion_rate + risk_normal * risk_sigma
+    new_risk = min(1.0, max(0.0, current_risk + risk_change))
+    new_momentum = 0.9 * risk_momentum + 0.1 * risk_change
+
+    # Regional trend plus event spillover plus random regional shock
+    for j in range(regional_risks.shape[0]):
+        regional_change = regional_trends[j] + spillover[j] + regional_normals[j] * region_sigma
+        regional_risks[j] = min(1.0, max(0.0, regional_risks[j] + regional_change * dt))
+
+    return new_risk, new_momentum
+
+
+@njit(cache=True, fastmath=True, nogil=True)
+def geo_simulate_kernel(current_risk: float, risk_momentum: float,
+                        regional_risks: np.ndarray, regional_trends: np.ndarray,
+                        ev_type_id: np.ndarray, ev_impact: np.ndarray, ev_end_day: np.ndarray,
+                        start_day: int, daily_probs: np.ndarray, type_impacts: np.ndarray,
+                        type_duration_days: np.ndarray, spillover_coef: np.ndarray,
+                        baseline_risk: float, stress_feedback: float,
+                        reversion_rate: float, risk_sigma: float, region_sigma: float,
+                        dt: float, normals: np.ndarray, uniforms: np.ndarray,
+                        risk_hist: np.ndarray, regions_hist: np.ndarray,
+                        active_hist: np.ndarray, hits: np.ndarray):
+    """
+    Run the geopolitical event and risk dynamics for a block of days
+
+    Each day new events fire, expired events are dropped and the risk
+    levels take one geo_step_kernel step, exactly as in the engine's step.
+    Runs without the GIL, so independent engines can be simulated in
+    parallel threads.
+
+    Args:
+        current_risk: Overall risk level before the first day
+        risk_momentum: Risk momentum before the first day
+        regional_risks: Risk level per region, updated in place
+        regional_trends: Baseline annual trend per region
+        ev_type_id: Type index of each active event, oldest first
+        ev_impact: Impact of each active event
+        ev_end_day: Last active day of each active event
+        start_day: First simulated day, in the same day count as ev_end_day
+        daily_probs: Daily occurrence probability per event type at zero risk
+        type_impacts: Impact per event type
+        type_duration_days: Duration in days per event type
+        spillover_coef: Spillover per unit of impact, event types x regions
+        baseline_risk: Level the overall risk reverts towards without events
+        stress_feedback: Market stress contribution to the target risk
+        reversion_rate: Per-step reversion of the overall risk
+        risk_sigma: Per-step shock scale of the overall risk
+        region_sigma: Per-step shock scale of the regional risk changes
+        dt: Time step in years
+        normals: Standard normal draws, days x (1 + regions)
+        uniforms: Uniform draws, days x event types
+        risk_hist: Output overall risk per day
+        regions_hist: Output regional risks per day, days x regions
+        active_hist: Output number of active events per day
+        hits: Output event occurrences, days x event types
+
+    Returns:
+        Tuple of (final risk, final momentum, and the type indices, impacts
+        and last active days of the events still active, oldest first)
+    """
+    n_days, n_types = uniforms.shape
+    n_regions = regional_risks.shape[0]
+
+    # Room for the initial events plus every possible new one
+    n_active = ev_type_id.shape[0]
+    capacity = n_active + n_days * n_types
+    type_ids = np.empty(capacity, dtype=np.intp)
+    impacts = np.empty(capacity)
+    end_days = np.empty(capacity, dtype=np.int64)
+    type_ids[:n_active] = ev_type_id
+    impacts[:n_active] = ev_impact
+    end_days[:n_active] = ev_end_day
+    spillover = np.empty(n_regions)
+
+    for t in range(n_days):
+        day = start_day + t
+
+        # New events, with probabilities scaled by the current risk level
+        for i in range(n_types):
+            hit = uniforms[t, i] < daily_probs[i] * (1 + current_risk)
+            hits[t, i] = hit
+            if hit:
+                type_ids[n_active] = i
+                impacts[n_active] = type_impacts[i]
+                end_days[n_active] = day + type_duration_days[i]
+                n_active += 1
+
+        # Drop expired events, keeping the rest in order
+        kept = 0
+        for e in range(n_active):
+            if end_days[e] >= day:
+                type_ids[kept] = type_ids[e]
+                impacts[kept] = impacts[e]
+                end_days[kept] = end_days[e]
+                kept += 1
+        n_active = kept
+
+        # Total event impact and spillover to every region
+        total_impact = 0.0
+        spillover[:] = 0.0
+        for e in range(n_active):
+            total_impact += impacts[e]
+            for j in range(n_regions):
+                spillover[j] += impacts[e] * spillover_coef[type_ids[e], j]
+
+        target_risk = baseline_risk + total_impact + stress_feedback
+        current_risk, risk_momentum = geo_step_kernel(
+            current_risk, risk_momentum, regional_risks, regional_trends, spillover,
+            target_risk, reversion_rate, risk_sigma, region_sigma, dt,
+            normals[t, 0], normals[t, 1:]
+        )
+
+        risk_hist[t] = current_risk
+        regions_hist[t] = regional_risks
+        active_hist[t] = n_active
+
+    return (current_risk, risk_momentum,
+            type_ids[:n_active].copy(), impacts[:n_active].copy(), end_days[:n_active].copy())
+
+
+@njit(cache=True, fastmath=True, parallel=True)
+def metals_paths_kernel(gold: np.ndarray, silver: np.ndarray,
+                        recent_gold: np.ndarray, recent_silver: np.ndarray, n_recorded: int,
+                        inv_initial_gold_price: float, inv_initial_silver_price: float,
+                        jewelry_growth: np.ndarray, fixed_gold_demand: np.ndarray,
+                        gold_mine_supply: np.ndarray, silver_demand: np.ndarray,
+                        silver_mine_supply: np.ndarray,
+                        momentum_factor: float, mean_reversion_speed: float,
+                        long_term_gold_price: float, long_term_silver_price: float,
+                        gold_factors: np.ndarray, silver_factors: np.ndarray,
+                        gold_shock_scale: float, silver_shock_scale: float, dt: float,
+                        gold_seasonal: np.ndarray, silver_seasonal: np.ndarray,
+                        normals: np.ndarray, gold_hist: np.ndarray, silver_hist: np.ndarray,
+                        gold_return_hist: np.ndarray, silver_return_hist: np.ndarray) -> None:
+    """
+    Advance independent gold and silver price paths over a block of days
+
+    Days run in order and the paths within a day in parallel, over
+    contiguous rows of the inputs and outputs. Each path follows the
+    precious metals engine's daily supply-demand, momentum, mean reversion
+    and gold-silver ratio dynamics. Market-driven inputs are given per day,
+    so they may vary over time.
+
+    Args:
+        gold: Gold price per path, updated in place
+        silver: Silver price per path, updated in place
+        recent_gold: Last five gold returns (5 x paths), updated in place
+        recent_silver: Last five silver returns (5 x paths), updated in place
+        n_recorded: Number of returns recorded before the first day
+        inv_initial_gold_price: Reciprocal of the reference gold price for demand and recycling
+        inv_initial_silver_price: Reciprocal of the reference silver price for recycling
+        jewelry_growth: Growth multiplier of jewelry demand per day, 1 + 3 * GDP growth
+        fixed_gold_demand: Gold demand that does not depend on the price, per day
+        gold_mine_supply: Gold supply that does not depend on the price, per day
+        silver_demand: Total silver demand per day
+        silver_mine_supply: Silver mine production per day
+        momentum_factor: Weight of the mean of the last five returns
+        mean_reversion_speed: Speed of log-price mean reversion
+        long_term_gold_price: Gold price the mean reversion pulls towards
+        long_term_silver_price: Silver price the mean reversion pulls towards
+        gold_factors: Market factor influence on gold per day
+        silver_factors: Market factor influence on silver per day
+        gold_shock_scale: Per-step shock scale of gold, volatility * sqrt(dt)
+        silver_shock_scale: Per-step shock scale of silver
+        dt: Time step in years
+        gold_seasonal: Gold seasonal pressure per day
+        silver_seasonal: Silver seasonal pressure per day
+        normals: Standard normal draws, days x 2 (gold, silver) x paths
+        gold_hist: Output gold price, days x paths
+        silver_hist: Output silver price, days x paths
+        gold_return_hist: Output gold return, days x paths
+        silver_return_hist: Output silver return, days x paths
+    """
+    n_days = normals.shape[0]
+    n_paths = gold.shape[0]
+
+    for t in range(n_days):
+        momentum_on = n_recorded + t > 5
+        slot = (n_recorded + t) % 5
+        for p in prange(n_paths):
+            g = gold[p]
+            s = silver[p]
+
+            # Price-dependent fundamentals
+            gold_change = g * inv_initial_gold_price - 1.0
+            silver_change = s * inv_initial_silver_price - 1.0
+            jewelry = 2100.0 * min(1.4, max(0.6, jewelry_growth[t] * (1.0 - 0.5 * gold_change)))
+            gold_demand = jewelry + fixed_gold_demand[t]
+            gold_supply = gold_mine_supply[t] + 1200.0 * (1.0 + 0.3 * gold_change)
+            silver_supply = silver_mine_supply[t] + 180.0 * (1.0 + 0.4 * silver_change)
+            gold_pressure = -(gold_supply - gold_demand) / gold_demand + gold_seasonal[t]
+            silver_pressure = -(silver_supply - silver_demand[t]) / silver_demand[t] + silver_seasonal[t]
+
+            # Momentum from the last five returns, once there are more than five
+            gold_momentum = 0.0
+            silver_momentum = 0.0
+            if momentum_on:
+                for k in range(5):
+                    gold_momentum += recent_gold[k, p]
+                    silver_momentum += recent_silver[k, p]
+                gold_momentum *= momentum_factor / 5.0
+                silver_momentum *= momentum_factor / 5.0
+
+            gold_return = ((gold_pressure * 0.1
+                            - mean_reversion_speed * np.log(g / long_term_gold_price) * dt
+                            + gold_momentum + gold_factors[t]) * dt + normals[t, 0, p] * gold_shock_scale)
+            silver_return = ((silver_pressure * 0.1
+                              - mean_reversion_speed * np.log(s / long_term_silver_price) * dt
+                              + silver_momentum + silver_factors[t]) * dt + normals[t, 1, p] * silver_shock_scale)
+            g *= np.exp(gold_return)
+            s *= np.exp(silver_return)
+
+            # Gold-silver ratio mean reversion through the silver price, applied
+            # only beyond the threshold (masked rather than branched); a high
+            # ratio raises silver
+            ratio_adjustment = 0.01 * (80.0 - g / s)
+            s *= 1.0 - (ratio_adjustment / 80.0) * (abs(ratio_adjustment) > 0.1)
+
+            gold[p] = g
+            silver[p] = s
+            recent_gold[slot, p] = gold_return
+            recent_silver[slot, p] = silver_return
+            gold_hist[t, p] = g
+            silver_hist[t, p] = s
+            gold_return_hist[t, p] = gold_return
+            silver_return_hist[t, p] = silver_return
+
+
+@njit(cache=True, fastmath=True)
+def sdr_value_kernel(weights: np.ndarray, rates: np.ndarray, quote: np.ndarray) -> float:
+    """
+    Value of the SDR basket in USD
+
+    Args:
+        weights: Weight per basket currency
+        rates: USD exchange rate per basket currency
+        quote: Exponent applied to each rate; 0 counts the currency at par,
+            1 for XXX/USD quotes and -1 for USD/XXX quotes
+
+    Returns:
+        Basket value in USD
+    """
+    value = 0.0
+    for j in range(weights.shape[0]):
+        value += weights[j] * rates[j] ** quote[j]
+    return value
+
+
+@njit(cache=True, fastmath=True)
+def sdr_rate_kernel(previous_rate: float, weights: np.ndarray, basket_rates: np.ndarray,
+                    alpha: float) -> float:
+    """
+    Smoothed SDR interest rate from the basket's money market rates
+
+    Args:
+        previous_rate: SDR interest rate before this step
+        weights: Weight per basket currency
+        basket_rates: Money market rate per basket currency
+        alpha: Weight of the new weighted-average rate
+
+    Returns:
+        New SDR interest rate
+    """
+    weighted_rate = 0.0
+    for j in range(weights.shape[0]):
+        weighted_rate += weights[j] * basket_rates[j]
+    return (1.0 - alpha) * previous_rate + alpha * weighted_rate
+
+
+@njit(cache=True, fastmath=True)
+def basket_performance_kernel(weights: np.ndarray, vols: np.ndarray,
+                              returns: np.ndarray) -> Tuple[float, float]:
+    """
+    Return and volatility of the SDR basket in one pass
+
+    Args:
+        weights: Weight per basket currency
+        vols: Volatility per basket currency
+        returns: Return per basket currency
+
+    Returns:
+        Tuple of (basket return, basket volatility)
+    """
+    basket_return = 0.0
+    basket_variance = 0.0
+    for j in range(weights.shape[0]):
+        basket_return += weights[j] * returns[j]
+        weighted_vol = weights[j] * vols[j]
+        basket_variance += weighted_vol * weighted_vol
+    return basket_return, np.sqrt(basket_variance)
+
+
+@njit(cache=True)  # No fastmath: it would let the NaN checks be optimized away
+def market_indicators_kernel(vols: np.ndarray, geopolitical_risk: float,
+                             index_rates: np.ndarray, index_quote: np.ndarray) -> Tuple[float, float]:
+    """
+    Global market stress and USD index from currency volatilities and rates
+
+    Args:
+        vols: Currency volatilities (volatility 0.1 is assumed if empty)
+        geopolitical_risk: Overall geopolitical risk level
+        index_rates: USD exchange rate per index currency, NaN if unavailable
+        index_quote: Exponent applied to each rate so it measures USD strength
+
+    Returns:
+        Tuple of (market stress in [0, 1], USD index)
+    """
+    n_vols = vols.shape[0]
+    if n_vols > 0:
+        currency_vol = 0.0
+        for j in range(n_vols):
+            currency_vol += vols[j]
+        currency_vol /= n_vols
+    else:
+        currency_vol = 0.1
+    market_stress = min(1.0, currency_vol * 5 + geopolitical_risk * 0.5)
+
+    # Equal-weighted index of the available currencies
+    usd_strength = 0.0
+    for j in range(index_rates.shape[0]):
+        if not np.isnan(index_rates[j]):
+            usd_strength += index_rates[j] ** index_quote[j] * 0.25
+
+    return market_stress, 100.0 * usd_strength
@@ -2,11 +2,57 @@
 Precious Metals Engine - Gold and Silver Market Dynamics with Supply-Demand Fundamentals
 """
 
+import math
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, Tuple
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from typing import Dict, Any, Optional, Tuple
 from datetime import datetime
-from .base_engine import BaseEngine
+from ..config import _DATACLASS_OPTIONS
+from .base_engine import ArrayView, BaseEngine
+from .kernels import metals_paths_kernel
+
+
+# Seasonal demand pressure by month (January first)
+_GOLD_SEASONAL = np.zeros(12)
+_GOLD_SEASONAL[[9, 10, 11]] = 0.05  # Q4 jewelry demand surge (wedding season, holidays)
+_GOLD_SEASONAL[[0, 1]] = 0.03       # Chinese New Year
+_SILVER_SEASONAL = np.zeros(12)
+_SILVER_SEASONAL[[2, 3, 4, 8, 9]] = 0.02  # Peak industrial quarters
+
+# Positions of the supply and demand components in their vectors, in the
+# order of the _initialize_* dicts; the total is always last
+_GOLD_SUPPLY_MINE, _GOLD_SUPPLY_RECYCLING = 0, 1
+_GOLD_DEMAND_JEWELRY, _GOLD_DEMAND_INVESTMENT, _GOLD_DEMAND_CB = 0, 1, 2
+_SILVER_SUPPLY_MINE, _SILVER_SUPPLY_RECYCLING = 0, 1
+_SILVER_DEMAND_INDUSTRIAL, _SILVER_DEMAND_INVESTMENT = 0, 2
+_TOTAL = -1
+
+
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
+class MetalsMarketInputs:
+    """
+    Market inputs the precious metals engine reads, with their defaults
+    
+    Holds floats for a single step, or one array per field (a value per
+    step) in the batch path methods.
+    """
+    geopolitical_risk: float = 0.3
+    inflation_expectation: float = 0.02
+    real_interest_rates: float = 0.01
+    usd_index: float = 100.0
+    global_gdp_growth: float = 0.03
+    technology_sector_growth: float = 0.05
+    risk_sentiment: float = 0.0
+    mining_sector_growth: float = 0.01
+    mining_supply_constraints: float = 0.0
+    base_metals_production: float = 1.0
+
+
+# Market state keys the engine reads and their defaults
+_MARKET_INPUTS = {field.name: field.default for field in fields(MetalsMarketInputs)}
 
 
 class PreciousMetalsEngine(BaseEngine):
@@ -15,6 +61,9 @@ class PreciousMetalsEngine(BaseEngine):
     central bank buying patterns, mining production, and investor demand cycles
     """
     
+    # One price shock per metal each step (gold, silver)
+    normals_per_step = 2
+    
     def __init__(self, config: Any, random_state: int = None):
         super().__init__(config, random_state)
         
@@ -22,6 +71,10 @@ class PreciousMetalsEngine(BaseEngine):
         self.gold_price = float(config.initial_gold_price)
         self.silver_price = float(config.initial_silver_price)
         
+        # Reciprocals of the reference prices, for per-step price changes
+        self._inv_initial_gold = 1.0 / float(config.initial_gold_price)
+        self._inv_initial_silver = 1.0 / float(config.initial_silver_price)
+        
         # Volatilities
         self.gold_volatility = config.gold_volatility
         self.silver_volatility = config.silver_volatility
@@ -30,11 +83,23 @@ class PreciousMetalsEngine(BaseEngine):
         self.cb_gold_holdings = 36000.0  # Global CB holdings in tonnes
         self.annual_cb_purchases = config.gold_central_bank_purchases
         
-        # Supply-demand fundamentals
-        self.gold_supply = self._initialize_gold_supply()
-        self.silver_supply = self._initialize_silver_supply()
-        self.gold_demand = self._initialize_gold_demand()
-        self.silver_demand = self._initialize_silver_demand()
+        # Supply-demand fundamentals, each a vector of components ending
+        # with their total, so a step's snapshot is one small array copy
+        self._gold_supply_index, self._gold_supply = self._component_vector(self._initialize_gold_supply())
+        self._silver_supply_index, self._silver_supply = self._component_vector(self._initialize_silver_supply())
+        self._gold_demand_index, self._gold_demand = self._component_vector(self._initialize_gold_demand())
+        self._silver_demand_index, self._silver_demand = self._component_vector(self._initialize_silver_demand())
+        
+        # Sums of the components no step updates, so each total is rebuilt
+        # from the few components that change rather than a pass over all
+        self._gold_supply_fixed = self._fixed_total(
+            self._gold_supply, (_GOLD_SUPPLY_MINE, _GOLD_SUPPLY_RECYCLING))
+        self._silver_supply_fixed = self._fixed_total(
+            self._silver_supply, (_SILVER_SUPPLY_MINE, _SILVER_SUPPLY_RECYCLING))
+        self._gold_demand_fixed = self._fixed_total(
+            self._gold_demand, (_GOLD_DEMAND_JEWELRY, _GOLD_DEMAND_INVESTMENT, _GOLD_DEMAND_CB))
+        self._silver_demand_fixed = self._fixed_total(
+            self._silver_demand, (_SILVER_DEMAND_INDUSTRIAL, _SILVER_DEMAND_INVESTMENT))
         
         # Market structure parameters
         self.gold_silver_ratio = 80.0  # Historical average
@@ -50,6 +115,37 @@ class PreciousMetalsEngine(BaseEngine):
         self.long_term_gold_price = 2200.0
         self.long_term_silver_price = 28.0
         
+    @staticmethod
+    def _component_vector(components: Dict[str, float]) -> Tuple[Dict[str, int], np.ndarray]:
+        """Split supply or demand components into a key index and a value vector"""
+        index = {name: i for i, name in enumerate(components)}
+        return index, np.array(list(components.values()), dtype=np.float64)
+    
+    @staticmethod
+    def _fixed_total(vector: np.ndarray, updated: Tuple[int, ...]) -> float:
+        """Sum the components of a vector that are not in the updated positions"""
+        return float(np.delete(vector[:_TOTAL], updated).sum())
+    
+    @property
+    def gold_supply(self) -> Mapping:
+        """Live view of the gold supply components (tonnes per year)"""
+        return ArrayView(self._gold_supply_index, self._gold_supply)
+    
+    @property
+    def silver_supply(self) -> Mapping:
+        """Live view of the silver supply components (million ounces per year)"""
+        return ArrayView(self._silver_supply_index, self._silver_supply)
+    
+    @property
+    def gold_demand(self) -> Mapping:
+        """Live view of the gold demand components (tonnes per year)"""
+        return ArrayView(self._gold_demand_index, self._gold_demand)
+    
+    @property
+    def silver_demand(self) -> Mapping:
+        """Live view of the silver demand components (million ounces per year)"""
+        return ArrayView(self._silver_demand_index, self._silver_demand)
+    
     def initialize(self) -> None:
         """Initialize precious metals market state"""
         # Set initial supply-demand balance
@@ -59,6 +155,32 @@ class PreciousMetalsEngine(BaseEngine):
         self.gold_storage_cost = 0.001  # 0.1% annual
         self.silver_storage_cost = 0.002  # 0.2% annual
         self.convenience_yield = 0.005  # 0.5% annual
+        
+        # Per-step constants of the daily price dynamics
+        self._dt = 1.0 / 365.25  # Daily time step
+        self._sqrt_dt = math.sqrt(self._dt)
+        
+        # Last five returns per metal and their running sums, for momentum
+        self._return_count = 0
+        self._recent_returns = {"gold": deque(maxlen=5), "silver": deque(maxlen=5)}
+        self._recent_return_sums = {"gold": 0.0, "silver": 0.0}
+    
+    def _coerce_market_state(self, market_state: Dict[str, Any]) -> MetalsMarketInputs:
+        """
+        Extract the market inputs the engine uses as plain floats, once per step
+        
+        Plain numbers take a fast path; anything else (arrays, Series) goes
+        through _get_scalar_value, so the rest of the step reads typed
+        float fields instead of looking up keys with defaults.
+        """
+        inputs = []
+        for name, default in _MARKET_INPUTS.items():
+            value = market_state.get(name, default)
+            if isinstance(value, (float, int)):
+                inputs.append(float(value))
+            else:
+                inputs.append(self._get_scalar_value(value, default))
+        return MetalsMarketInputs(*inputs)
     
     def _get_scalar_value(self, value: Any, default: float = 0.0) -> float:
         """Safely extract scalar value from potentially array-like input"""
@@ -127,26 +249,36 @@ class PreciousMetalsEngine(BaseEngine):
     
     def step(self, current_time: datetime, market_state: Dict[str, Any]) -> Dict[str, Any]:
         """Simulate one step of precious metals market evolution"""
-        dt = 1.0 / 365.25  # Daily time step
+        dt = self._dt
+        inputs = self._coerce_market_state(market_state)
         
-        # Update supply-demand fundamentals
-        self._update_supply_demand(market_state, dt)
-        
-        # Calculate price pressure from fundamentals
-        gold_pressure = self._calculate_price_pressure("gold", market_state, current_time)
-        silver_pressure = self._calculate_price_pressure("silver", market_state, current_time)
+        # Update supply-demand fundamentals and their price pressure
+        month = current_time.month
+        gold_pressure = self._gold_fundamentals(inputs, month)
+        silver_pressure = self._silver_fundamentals(inputs, month)
         
         # Generate price movements
-        gold_return = self._generate_price_return("gold", gold_pressure, market_state, dt)
-        silver_return = self._generate_price_return("silver", silver_pressure, market_state, dt)
-        
-        # Update prices - ensure scalar operations
-        self.gold_price = float(self.gold_price * np.exp(gold_return))
-        self.silver_price = float(self.silver_price * np.exp(silver_return))
+        normals, _ = self.next_random_draws()
+        market_factors = self._get_market_factor_influence(inputs)
+        gold_return = self._generate_price_return(
+            self.gold_price, self.gold_volatility, self.long_term_gold_price,
+            self._recent_return_sums["gold"], gold_pressure, market_factors, dt, normals[0])
+        silver_return = self._generate_price_return(
+            self.silver_price, self.silver_volatility, self.long_term_silver_price,
+            self._recent_return_sums["silver"], silver_pressure, market_factors, dt, normals[1])
+        
+        # Update prices - scalar math, so they stay plain floats
+        self.gold_price = self.gold_price * math.exp(gold_return)
+        self.silver_price = self.silver_price * math.exp(silver_return)
         
         # Update gold-silver ratio dynamics
         self._update_gold_silver_ratio()
         
+        # Roll the momentum windows
+        self._record_return("gold", gold_return)
+        self._record_return("silver", silver_return)
+        self._return_count += 1
+        
         # Prepare output
         output = {
             "gold_price": self.gold_price,
@@ -157,10 +289,11 @@ class PreciousMetalsEngine(BaseEngine):
             "gold_supply_demand": self.gold_supply_demand_imbalance,
             "silver_supply_demand": self.silver_supply_demand_imbalance,
             "cb_gold_demand": self._get_cb_gold_demand(market_state),
-            "gold_supply": self.gold_supply.copy(),
-            "gold_demand": self.gold_demand.copy(),
-            "silver_supply": self.silver_supply.copy(),
-            "silver_demand": self.silver_demand.copy()
+            # Snapshots, since the component vectors are updated in place
+            "gold_supply": ArrayView(self._gold_supply_index, self._gold_supply.copy()),
+            "gold_demand": ArrayView(self._gold_demand_index, self._gold_demand.copy()),
+            "silver_supply": ArrayView(self._silver_supply_index, self._silver_supply.copy()),
+            "silver_demand": ArrayView(self._silver_demand_index, self._silver_demand.copy())
         }
         
         # Add to history
@@ -168,202 +301,336 @@ class PreciousMetalsEngine(BaseEngine):
         
         return output
     
-    def _update_supply_demand(self, market_state: Dict[str, Any], dt: float) -> None:
-        """Update supply and demand components"""
-        # Update gold demand components
-        self._update_gold_demand(market_state, dt)
-        self._update_gold_supply(market_state, dt)
-        
-        # Update silver demand components
-        self._update_silver_demand(market_state, dt)
-        self._update_silver_supply(market_state, dt)
-        
-        # Recalculate imbalances
-        self.gold_supply_demand_imbalance = self.gold_supply["total"] - self.gold_demand["total"]
-        self.silver_supply_demand_imbalance = self.silver_supply["total"] - self.silver_demand["total"]
+    def simulate_paths(self, n_paths: int, n_days: int, start_time: Optional[datetime] = None,
+                       market_state: Optional[Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
+        """
+        Run many independent Monte Carlo paths of gold and silver prices at once
+        
+        Every path starts from the engine's current prices and recent
+        returns and evolves under a fixed market state, with the same
+        supply-demand, momentum and gold-silver ratio dynamics as step().
+        All draws are made up front and the paths run in parallel in one
+        compiled kernel. The engine's own state is not changed.
+        
+        Args:
+            n_paths: Number of independent paths
+            n_days: Number of daily steps to simulate
+            start_time: Date of the first step (defaults to the day after the
+                engine's current time)
+            market_state: Market conditions held fixed over the run (optional)
+        
+        Returns:
+            Dictionary with "gold_price", "silver_price", "gold_return" and
+            "silver_return", each of shape (n_days, n_paths)
+        """
+        market_state = market_state if market_state is not None else {}
+        start_time = start_time if start_time is not None else self._next_day()
+        months = pd.date_range(start_time, periods=n_days, freq="D").month.to_numpy()
+        
+        # Market inputs are fixed, so each one is a constant daily series
+        fixed = self._coerce_market_state(market_state)
+        inputs = MetalsMarketInputs(*(np.full(n_days, getattr(fixed, name)) for name in _MARKET_INPUTS))
+        return self._run_paths(n_paths, months, inputs)
     
-    def _update_gold_demand(self, market_state: Dict[str, Any], dt: float) -> None:
-        """Update gold demand components"""
-        # Central bank demand (responsive to geopolitical risk)
-        geopolitical_risk = self._get_scalar_value(market_state.get("geopolitical_risk", 0.3), 0.3)
-        inflation_expectation = self._get_scalar_value(market_state.get("inflation_expectation", 0.02), 0.02)
+    def simulate_path(self, times: Any,
+                      market_state_arrays: Optional[Mapping[str, Any]] = None) -> pd.DataFrame:
+        """
+        Simulate one path of gold and silver prices under a time-varying market state
+        
+        Each market input is given as one value per step (or a scalar held
+        fixed); everything that depends only on the market is evaluated
+        for the whole horizon at once, and only the price-dependent daily
+        recursion runs in the compiled kernel. The engine's own state is
+        not changed.
+        
+        Args:
+            times: Dates of the steps
+            market_state_arrays: Market inputs, each a scalar or a series with
+                one value per step; missing inputs take their defaults (optional)
+        
+        Returns:
+            DataFrame indexed by time with gold and silver prices and returns
+        """
+        times = pd.DatetimeIndex(times)
+        n_days = len(times)
+        market_state_arrays = market_state_arrays if market_state_arrays is not None else {}
+        
+        inputs = MetalsMarketInputs(*(
+            np.broadcast_to(np.asarray(market_state_arrays.get(name, default), dtype=np.float64), (n_days,))
+            for name, default in _MARKET_INPUTS.items()
+        ))
+        
+        paths = self._run_paths(1, times.month.to_numpy(), inputs)
+        return pd.DataFrame({name: values[:, 0] for name, values in paths.items()}, index=times)
+    
+    def _run_paths(self, n_paths: int, months: np.ndarray,
+                   inputs: MetalsMarketInputs) -> Dict[str, np.ndarray]:
+        """
+        Run price paths from the engine's current state through the paths kernel
+        
+        Args:
+            n_paths: Number of independent paths
+            months: Calendar month of each step
+            inputs: Market inputs, one value per step
+        
+        Returns:
+            Dictionary of price and return arrays, each of shape (steps, n_paths)
+        """
+        n_days = len(months)
+        dt = self._dt
+        
+        # Everything that depends only on the market inputs is computed for
+        # all steps at once
+        geopolitical_risk = inputs.geopolitical_risk
+        inflation_expectation = inputs.inflation_expectation
+        real_rates = inputs.real_interest_rates
+        usd_strength = inputs.usd_index / 100.0
+        gdp_growth = inputs.global_gdp_growth
+        tech_growth = inputs.technology_sector_growth
+        
+        cb_demand = self.annual_cb_purchases * (1.0 + geopolitical_risk * 2.0 + inflation_expectation * 5.0)
+        investment_factor = np.clip(1.0 - real_rates * 20.0 - (usd_strength - 1.0) * 2.0, 0.5, 2.0)
+        gold_investment = 800.0 * investment_factor
+        industrial_factor = np.clip(1.0 + gdp_growth * 2.0 + tech_growth * 1.5, 0.8, 1.5)
+        silver_investment = 200.0 * (1.0 + (investment_factor - 1.0) * 1.5)
+        silver_demand = (550.0 * industrial_factor + self.silver_demand["jewelry"]
+                         + silver_investment + self.silver_demand["silverware"])
+        
+        mine_production_factor = ((1.0 + inputs.mining_sector_growth)
+                                  * (1.0 - inputs.mining_supply_constraints))
+        gold_mine_production = 3200.0 * mine_production_factor
+        silver_mine_production = 800.0 * inputs.base_metals_production
+        
+        market_factors = self._market_factor_series(inputs)
+        gold_seasonal = _GOLD_SEASONAL[months - 1]
+        silver_seasonal = _SILVER_SEASONAL[months - 1]
+        gold_shock_scale = self.gold_volatility * self._sqrt_dt
+        silver_shock_scale = self.silver_volatility * self._sqrt_dt
+        
+        gold = np.full(n_paths, float(self.gold_price))
+        silver = np.full(n_paths, float(self.silver_price))
+        
+        # The last five returns of every path, seeded from the engine's
+        # momentum windows in ring order
+        n_recorded = self._return_count
+        recent_gold = np.zeros((5, n_paths))
+        recent_silver = np.zeros((5, n_paths))
+        first = n_recorded - len(self._recent_returns["gold"])
+        for k, (gold_return, silver_return) in enumerate(zip(self._recent_returns["gold"],
+                                                             self._recent_returns["silver"])):
+            recent_gold[(first + k) % 5] = gold_return
+            recent_silver[(first + k) % 5] = silver_return
+        
+        gold_hist = np.empty((n_days, n_paths))
+        silver_hist = np.empty((n_days, n_paths))
+        gold_return_hist = np.empty((n_days, n_paths))
+        silver_return_hist = np.empty((n_days, n_paths))
+        
+        # All draws up front, in the same order as one (gold, silver) draw
+        # per path each day
+        normals = self.rng.standard_normal((n_days, 2, n_paths))
+        metals_paths_kernel(
+            gold, silver, recent_gold, recent_silver, n_recorded,
+            self._inv_initial_gold, self._inv_initial_silver,
+            1.0 + gdp_growth * 3.0, gold_investment + cb_demand + self.gold_demand["technology"],
+            gold_mine_production + self.gold_supply["central_bank_sales"],
+            silver_demand, silver_mine_production,
+            self.momentum_factor, self.mean_reversion_speed,
+            self.long_term_gold_price, self.long_term_silver_price,
+            market_factors, market_factors, gold_shock_scale, silver_shock_scale, dt,
+            gold_seasonal, silver_seasonal, normals,
+            gold_hist, silver_hist, gold_return_hist, silver_return_hist
+        )
         
-        # CB demand increases with risk and inflation
-        cb_demand_multiplier = 1.0 + geopolitical_risk * 2.0 + inflation_expectation * 5.0
-        self.gold_demand["central_banks"] = self.annual_cb_purchases * cb_demand_multiplier
+        return {
+            "gold_price": gold_hist,
+            "silver_price": silver_hist,
+            "gold_return": gold_return_hist,
+            "silver_return": silver_return_hist
+        }
+    
+    def _record_return(self, metal: str, value: float) -> None:
+        """Push a return into a metal's momentum window, updating its running sum"""
+        window = self._recent_returns[metal]
+        oldest = window[0] if len(window) == window.maxlen else 0.0
+        window.append(value)
+        self._recent_return_sums[metal] += value - oldest
+    
+    def _gold_fundamentals(self, inputs: MetalsMarketInputs, month: int) -> float:
+        """
+        Update the gold supply and demand components and return the price pressure
         
-        # Investment demand (responsive to real rates and currency weakness)
-        real_rates = self._get_scalar_value(market_state.get("real_interest_rates", 0.01), 0.01)
-        usd_strength = self._get_scalar_value(market_state.get("usd_index", 100.0), 100.0) / 100.0
+        Args:
+            inputs: Market inputs for this step
+            month: Calendar month of this step
         
-        investment_demand_factor = 1.0 - real_rates * 20.0 - (usd_strength - 1.0) * 2.0
-        investment_demand_factor = max(0.5, min(2.0, investment_demand_factor))
-        self.gold_demand["investment"] = 800.0 * investment_demand_factor
+        Returns:
+            Fundamental price pressure on gold, including seasonality
+        """
+        price_change = (self.gold_price * self._inv_initial_gold - 1.0)
         
-        # Jewelry demand (responsive to price and economic growth)
-        gdp_growth = self._get_scalar_value(market_state.get("global_gdp_growth", 0.03), 0.03)
-        price_elasticity = -0.5  # Negative elasticity
-        price_change = (self.gold_price / self.config.initial_gold_price - 1.0)
+        # Central bank demand increases with geopolitical risk and inflation
+        cb_demand_multiplier = 1.0 + inputs.geopolitical_risk * 2.0 + inputs.inflation_expectation * 5.0
+        cb_demand = self.annual_cb_purchases * cb_demand_multiplier
+        
+        # Investment demand (responsive to real rates and currency weakness)
+        usd_strength = inputs.usd_index / 100.0
+        investment_demand_factor = 1.0 - inputs.real_interest_rates * 20.0 - (usd_strength - 1.0) * 2.0
+        investment_demand_factor = max(0.5, min(2.0, investment_demand_factor))
+        investment_demand = 800.0 * investment_demand_factor
         
-        jewelry_factor = (1.0 + gdp_growth * 3.0) * (1.0 + price_elasticity * price_change)
+        # Jewelry demand (responsive to economic growth, negative price elasticity)
+        jewelry_factor = (1.0 + inputs.global_gdp_growth * 3.0) * (1.0 - 0.5 * price_change)
         jewelry_factor = max(0.6, min(1.4, jewelry_factor))
-        self.gold_demand["jewelry"] = 2100.0 * jewelry_factor
+        jewelry_demand = 2100.0 * jewelry_factor
         
-        # Update total demand
-        self.gold_demand["total"] = sum(v for k, v in self.gold_demand.items() if k != "total")
-    
-    def _update_gold_supply(self, market_state: Dict[str, Any], dt: float) -> None:
-        """Update gold supply components"""
         # Mine production (relatively inelastic in short term)
-        production_growth = market_state.get("mining_sector_growth", 0.01)
-        supply_constraints = market_state.get("mining_supply_constraints", 0.0)
+        mine_production_factor = ((1.0 + inputs.mining_sector_growth)
+                                  * (1.0 - inputs.mining_supply_constraints))
+        mine_production = 3200.0 * mine_production_factor
+        
+        # Recycling (positive price elasticity)
+        recycling = 1200.0 * (1.0 + 0.3 * price_change)
+        
+        demand = self._gold_demand
+        demand[_GOLD_DEMAND_JEWELRY] = jewelry_demand
+        demand[_GOLD_DEMAND_INVESTMENT] = investment_demand
+        demand[_GOLD_DEMAND_CB] = cb_demand
+        total_demand = jewelry_demand + investment_demand + cb_demand + self._gold_demand_fixed
+        demand[_TOTAL] = total_demand
+        
+        supply = self._gold_supply
+        supply[_GOLD_SUPPLY_MINE] = mine_production
+        supply[_GOLD_SUPPLY_RECYCLING] = recycling
+        total_supply = mine_production + recycling + self._gold_supply_fixed
+        supply[_TOTAL] = total_supply
+        
+        # Negative imbalance (demand > supply) is upward pressure, plus seasonality
+        self.gold_supply_demand_imbalance = total_supply - total_demand
+        return -self.gold_supply_demand_imbalance / total_demand + _GOLD_SEASONAL[month - 1]
+    
+    def _silver_fundamentals(self, inputs: MetalsMarketInputs, month: int) -> float:
+        """
+        Update the silver supply and demand components and return the price pressure
         
-        mine_production_factor = (1.0 + production_growth) * (1.0 - supply_constraints)
-        self.gold_supply["mine_production"] = 3200.0 * mine_production_factor
+        Reads this step's gold investment demand, so runs after _gold_fundamentals.
         
-        # Recycling (responsive to price)
-        price_change = (self.gold_price / self.config.initial_gold_price - 1.0)
-        recycling_elasticity = 0.3  # Positive elasticity
-        recycling_factor = 1.0 + recycling_elasticity * price_change
-        self.gold_supply["recycling"] = 1200.0 * recycling_factor
+        Args:
+            inputs: Market inputs for this step
+            month: Calendar month of this step
         
-        # Update total supply
-        self.gold_supply["total"] = sum(v for k, v in self.gold_supply.items() if k != "total")
-    
-    def _update_silver_demand(self, market_state: Dict[str, Any], dt: float) -> None:
-        """Update silver demand components"""
+        Returns:
+            Fundamental price pressure on silver, including seasonality
+        """
         # Industrial demand (responsive to economic growth and tech adoption)
-        gdp_growth = self._get_scalar_value(market_state.get("global_gdp_growth", 0.03), 0.03)
-        tech_growth = self._get_scalar_value(market_state.get("technology_sector_growth", 0.05), 0.05)
-        
-        industrial_factor = 1.0 + gdp_growth * 2.0 + tech_growth * 1.5
+        industrial_factor = 1.0 + inputs.global_gdp_growth * 2.0 + inputs.technology_sector_growth * 1.5
         industrial_factor = max(0.8, min(1.5, industrial_factor))
-        self.silver_demand["industrial"] = 550.0 * industrial_factor
+        industrial_demand = 550.0 * industrial_factor
         
         # Investment demand (follows gold but more volatile)
-        gold_investment_factor = self.gold_demand["investment"] / 800.0
+        gold_investment_factor = self._gold_demand[_GOLD_DEMAND_INVESTMENT] / 800.0
         silver_investment_factor = 1.0 + (gold_investment_factor - 1.0) * 1.5
-        self.silver_demand["investment"] = 200.0 * silver_investment_factor
+        investment_demand = 200.0 * silver_investment_factor
         
-        # Update total demand
-        self.silver_demand["total"] = sum(v for k, v in self.silver_demand.items() if k != "total")
-    
-    def _update_silver_supply(self, market_state: Dict[str, Any], dt: float) -> None:
-        """Update silver supply components"""
         # Mine production (often byproduct of other metals)
-        base_metals_production = market_state.get("base_metals_production", 1.0)
-        self.silver_supply["mine_production"] = 800.0 * base_metals_production
-        
-        # Recycling
-        price_change = (self.silver_price / self.config.initial_silver_price - 1.0)
-        recycling_factor = 1.0 + 0.4 * price_change  # Higher elasticity than gold
-        self.silver_supply["recycling"] = 180.0 * recycling_factor
-        
-        # Update total supply
-        self.silver_supply["total"] = sum(v for k, v in self.silver_supply.items() if k != "total")
-    
-    def _calculate_price_pressure(self, metal: str, market_state: Dict[str, Any], current_time: datetime) -> float:
-        """Calculate fundamental price pressure"""
-        if metal == "gold":
-            imbalance = self.gold_supply_demand_imbalance
-            total_demand = self.gold_demand["total"]
-        else:
-            imbalance = self.silver_supply_demand_imbalance
-            total_demand = self.silver_demand["total"]
-        
-        # Convert imbalance to price pressure (negative imbalance = demand > supply = upward pressure)
-        pressure = -imbalance / total_demand
-        
-        # Add seasonal factors
-        month = current_time.month
-        seasonal_factor = self._get_seasonal_factor(metal, month)
-        pressure += seasonal_factor
-        
-        return pressure
-    
-    def _get_seasonal_factor(self, metal: str, month: int) -> float:
-        """Get seasonal demand factors"""
-        if metal == "gold":
-            # Q4 jewelry demand surge (wedding season, holidays)
-            if month in [10, 11, 12]:
-                return 0.05
-            # Chinese New Year
-            elif month in [1, 2]:
-                return 0.03
-            else:
-                return 0.0
-        else:  # silver
-            # Industrial demand follows economic cycles
-            if month in [3, 4, 5, 9, 10]:  # Peak industrial quarters
-                return 0.02
-            else:
-                return 0.0
+        mine_production = 800.0 * inputs.base_metals_production
+        
+        # Recycling (higher price elasticity than gold)
+        price_change = (self.silver_price * self._inv_initial_silver - 1.0)
+        recycling = 180.0 * (1.0 + 0.4 * price_change)
+        
+        demand = self._silver_demand
+        demand[_SILVER_DEMAND_INDUSTRIAL] = industrial_demand
+        demand[_SILVER_DEMAND_INVESTMENT] = investment_demand
+        total_demand = industrial_demand + investment_demand + self._silver_demand_fixed
+        demand[_TOTAL] = total_demand
+        
+        supply = self._silver_supply
+        supply[_SILVER_SUPPLY_MINE] = mine_production
+        supply[_SILVER_SUPPLY_RECYCLING] = recycling
+        total_supply = mine_production + recycling + self._silver_supply_fixed
+        supply[_TOTAL] = total_supply
+        
+        self.silver_supply_demand_imbalance = total_supply - total_demand
+        return -self.silver_supply_demand_imbalance / total_demand + _SILVER_SEASONAL[month - 1]
     
-    def _generate_price_return(self, metal: str, pressure: float, 
-                             market_state: Dict[str, Any], dt: float) -> float:
-        """Generate price return with fundamentals, momentum, and noise"""
-        
-        # Get current price and parameters
-        if metal == "gold":
-            current_price = self.gold_price
-            volatility = self.gold_volatility
-            long_term_price = self.long_term_gold_price
-        else:
-            current_price = self.silver_price
-            volatility = self.silver_volatility
-            long_term_price = self.long_term_silver_price
-        
+    def _generate_price_return(self, price: float, volatility: float, long_term_price: float,
+                               momentum_sum: float, pressure: float, market_factors: float,
+                               dt: float, normal: float) -> float:
+        """
+        Generate price return with fundamentals, momentum, and noise
+        
+        Takes the metal's own parameters directly, so the same code serves
+        both metals without choosing between them on every call.
+        
+        Args:
+            price: Current price of the metal
+            volatility: Annual volatility of the metal
+            long_term_price: Price the mean reversion pulls towards
+            momentum_sum: Sum of the metal's last five returns
+            pressure: Fundamental price pressure
+            market_factors: Market factor influence
+            dt: Time step in years
+            normal: Standard normal draw for the price shock
+        
+        Returns:
+            Log return for this step
+        """
         # Fundamental pressure component
         fundamental_return = pressure * 0.1  # Convert pressure to return
         
         # Mean reversion component
-        price_deviation = np.log(current_price / long_term_price)
-        mean_reversion = -self.mean_reversion_speed * self._get_scalar_value(price_deviation) * dt
-        
-        # Momentum component (trend following)
-        if hasattr(self, 'data_history') and len(self.data_history) > 5:
-            # Ensure returns are scalar before calculating mean
-            recent_returns = [self._get_scalar_value(d.get(f"{metal}_return", 0.0)) for d in self.data_history[-5:]]
-            momentum = self.momentum_factor * np.mean(recent_returns)
+        price_deviation = math.log(price / long_term_price)
+        mean_reversion = -self.mean_reversion_speed * price_deviation * dt
+        
+        # Momentum component (trend following), from the last five returns
+        if self._return_count > 5:
+            momentum = self.momentum_factor * (momentum_sum / 5)
         else:
             momentum = 0.0
         
-        # Market factor influences
-        market_factors = self._get_market_factor_influence(metal, market_state)
-        
         # Random component
-        random_shock = self.get_random_normal() * volatility * np.sqrt(dt)
+        random_shock = normal * volatility * self._sqrt_dt
         
         # Combine components
         total_return = (fundamental_return + mean_reversion + momentum + 
                        market_factors) * dt + random_shock
         
-        return self._get_scalar_value(total_return)
+        return float(total_return)
     
-    def _get_market_factor_influence(self, metal: str, market_state: Dict[str, Any]) -> float:
-        """Calculate influence of market factors on precious metal prices"""
+    def _get_market_factor_influence(self, inputs: MetalsMarketInputs) -> float:
+        """Calculate influence of market factors on precious metal prices (shared by both metals)"""
         influence = 0.0
         
         # USD strength effect (negative correlation)
-        usd_index = self._get_scalar_value(market_state.get("usd_index", 100.0), 100.0)
+        usd_index = inputs.usd_index
         usd_change = (usd_index / 100.0 - 1.0)
         influence += self.correlation_with_currencies["USD"] * usd_change
         
         # Real interest rates effect
-        real_rates = self._get_scalar_value(market_state.get("real_interest_rates", 0.01), 0.01)
+        real_rates = inputs.real_interest_rates
         influence += self.correlation_with_currencies["real_rates"] * real_rates
         
         # Inflation expectation effect
-        inflation_expectation = self._get_scalar_value(market_state.get("inflation_expectation", 0.02), 0.02)
+        inflation_expectation = inputs.inflation_expectation
         influence += self.correlation_with_currencies["inflation"] * inflation_expectation
         
         # Risk sentiment effect (safe haven demand)
-        risk_sentiment = self._get_scalar_value(market_state.get("risk_sentiment", 0.0), 0.0)
+        risk_sentiment = inputs.risk_sentiment
         if risk_sentiment > 0:  # Risk-off sentiment
             influence += 0.1 * risk_sentiment
         
         return float(influence)
     
+    def _market_factor_series(self, inputs: MetalsMarketInputs) -> np.ndarray:
+        """Market factor influence for a series of market inputs, as in _get_market_factor_influence"""
+        influence = self.correlation_with_currencies["USD"] * (inputs.usd_index / 100.0 - 1.0)
+        influence = influence + self.correlation_with_currencies["real_rates"] * inputs.real_interest_rates
+        influence = influence + self.correlation_with_currencies["inflation"] * inputs.inflation_expectation
+        
+        # Safe haven demand only under risk-off sentiment
+        return influence + 0.1 * np.maximum(inputs.risk_sentiment, 0.0)
+    
     def _update_gold_silver_ratio(self) -> None:
         """Update gold-silver ratio with mean reversion"""
         current_ratio = self.gold_price / self.silver_price
@@ -373,23 +640,25 @@ class PreciousMetalsEngine(BaseEngine):
         reversion_speed = 0.01
         ratio_adjustment = reversion_speed * (target_ratio - current_ratio)
         
-        # Apply adjustment through silver price (gold leads)
-        if abs(ratio_adjustment) > 0.1:
-            silver_adjustment = ratio_adjustment / target_ratio
-            self.silver_price *= (1 + silver_adjustment)
+        # Apply adjustment through silver price (gold leads), only beyond the
+        # threshold; the mask zeroes it without a data-dependent branch.
+        # A ratio above target raises silver, which pulls the ratio back; the
+        # factor never drops below 0.99, so silver stays positive
+        silver_adjustment = -(ratio_adjustment / target_ratio) * (abs(ratio_adjustment) > 0.1)
+        self.silver_price *= (1.0 + silver_adjustment)
         
         self.gold_silver_ratio = self.gold_price / self.silver_price
     
     def _get_cb_gold_demand(self, market_state: Dict[str, Any]) -> float:
         """Get current central bank gold demand"""
-        return self.gold_demand["central_banks"]
+        return self._gold_demand[_GOLD_DEMAND_CB]
     
     def get_real_return(self, metal: str, inflation_rate: float) -> float:
         """Calculate real return adjusted for inflation"""
         if metal == "gold":
-            nominal_return = (self.gold_price / self.config.initial_gold_price - 1.0)
+            nominal_return = (self.gold_price * self._inv_initial_gold - 1.0)
         else:
-            nominal_return = (self.silver_price / self.config.initial_silver_price - 1.0)
+            nominal_return = (self.silver_price * self._inv_initial_silver - 1.0)
         
         real_return = (1 + nominal_return) / (1 + inflation_rate) - 1
         return real_return 
\ No newline at end of file
@@ -3,10 +3,10 @@ Reserve Management Engine - Models central bank decision-making for optimal port
 """
 
 import numpy as np
-import pandas as pd
+from collections.abc import Mapping
 from typing import Dict, Any, List, Tuple, Optional
 from datetime import datetime
-from .base_engine import BaseEngine
+from .base_engine import ArrayView, BaseEngine
 
 
 class ReserveManagementEngine(BaseEngine):
@@ -19,7 +19,7 @@ class ReserveManagementEngine(BaseEngine):
         super().__init__(config, random_state)
         
         # Reserve composition targets (global average approximation)
-        self.target_allocation = {
+        initial_targets = {
             "USD": 0.59,  # 59% USD dominance
             "EUR": 0.20,  # 20% EUR
             "JPY": 0.06,  # 6% JPY
@@ -29,8 +29,23 @@ class ReserveManagementEngine(BaseEngine):
             "SDR": 0.02   # 2% SDR
         }
         
-        # Current allocation
-        self.current_allocation = self.target_allocation.copy()
+        # Target and current allocations as vectors in a fixed asset order
+        self.assets = tuple(initial_targets)
+        self._asset_index = {asset: i for i, asset in enumerate(self.assets)}
+        self._usd = self._asset_index["USD"]
+        self._gold = self._asset_index["gold"]
+        self._target = np.array(list(initial_targets.values()), dtype=np.float64)
+        self._current = self._target.copy()
+        
+        # Currencies eligible for FX intervention, with their position in
+        # the allocation vector (currencies not held get no support)
+        self._intervention_currencies = tuple(c for c in config.major_currencies if c != "USD")
+        self._intervention_held = np.array([c in self._asset_index for c in self._intervention_currencies])
+        self._intervention_idx = np.array([self._asset_index.get(c, 0) for c in self._intervention_currencies],
+                                          dtype=np.intp)
+        
+        # Each step draws a trigger and a direction uniform per currency
+        self.uniforms_per_step = 2 * len(self._intervention_currencies)
         
         # Rebalancing parameters
         self.rebalancing_threshold = 0.02  # 2% deviation triggers rebalancing
@@ -43,8 +58,18 @@ class ReserveManagementEngine(BaseEngine):
     def initialize(self) -> None:
         """Initialize reserve management state"""
         # Set initial allocation
-        self.current_allocation = self.target_allocation.copy()
+        self._current = self._target.copy()
         self.last_rebalancing_date = self.current_time
+    
+    @property
+    def target_allocation(self) -> Mapping:
+        """Live view of the target allocation by asset"""
+        return ArrayView(self._asset_index, self._target)
+    
+    @property
+    def current_allocation(self) -> Mapping:
+        """Live view of the current allocation by asset"""
+        return ArrayView(self._asset_index, self._current)
         
     def step(self, current_time: datetime, market_state: Dict[str, Any]) -> Dict[str, Any]:
         """Simulate one step of reserve management decisions"""
@@ -64,8 +89,9 @@ class ReserveManagementEngine(BaseEngine):
         
         # Prepare output
         output = {
-            "current_allocation": self.current_allocation.copy(),
-            "target_allocation": self.target_allocation.copy(),
+            # Snapshots, since the allocation vectors are updated in place
+            "current_allocation": ArrayView(self._asset_index, self._current.copy()),
+            "target_allocation": ArrayView(self._asset_index, self._target.copy()),
             "rebalancing_executed": rebalancing_needed,
             "cb_interventions": interventions,
             "allocation_deviation": self._calculate_allocation_deviation()
@@ -83,22 +109,18 @@ class ReserveManagementEngine(BaseEngine):
         
         # Adjust USD allocation
         usd_adjustment = -dedollarization_pressure * 0.1
-        self.target_allocation["USD"] = max(0.4, min(0.7, 
-            self.target_allocation["USD"] + usd_adjustment))
+        self._target[self._usd] = max(0.4, min(0.7, self._target[self._usd] + usd_adjustment))
         
         # Adjust gold allocation
         gold_adjustment = geopolitical_risk * 0.05 + gold_attractiveness * 0.03
-        self.target_allocation["gold"] = max(0.02, min(0.15,
-            self.target_allocation["gold"] + gold_adjustment))
+        self._target[self._gold] = max(0.02, min(0.15, self._target[self._gold] + gold_adjustment))
         
         # Normalize to ensure sum = 1
         self._normalize_allocations()
     
     def _normalize_allocations(self) -> None:
         """Normalize allocations to sum to 1.0"""
-        total = sum(self.target_allocation.values())
-        for asset in self.target_allocation:
-            self.target_allocation[asset] /= total
+        self._target /= self._target.sum()
     
     def _check_rebalancing_trigger(self, current_time: datetime, 
                                  market_state: Dict[str, Any]) -> bool:
@@ -108,8 +130,7 @@ class ReserveManagementEngine(BaseEngine):
         time_trigger = days_since_rebalancing >= self.config.reserve_rebalancing_frequency
         
         # Deviation-based rebalancing
-        max_deviation = max(abs(self.current_allocation[asset] - self.target_allocation[asset])
-                           for asset in self.target_allocation)
+        max_deviation = np.abs(self._current - self._target).max()
         deviation_trigger = max_deviation > self.rebalancing_threshold
         
         # Market stress emergency rebalancing
@@ -120,49 +141,36 @@ class ReserveManagementEngine(BaseEngine):
     
     def _execute_rebalancing(self, market_state: Dict[str, Any]) -> None:
         """Execute portfolio rebalancing"""
-        for asset in self.current_allocation:
-            current = self.current_allocation[asset]
-            target = self.target_allocation[asset]
-            
-            # Gradual adjustment
-            adjustment = (target - current) * self.rebalancing_speed
-            self.current_allocation[asset] = current + adjustment
+        # Gradual adjustment
+        self._current += (self._target - self._current) * self.rebalancing_speed
         
         # Normalize after adjustments
-        total = sum(self.current_allocation.values())
-        for asset in self.current_allocation:
-            self.current_allocation[asset] /= total
+        self._current /= self._current.sum()
             
         self.last_rebalancing_date = self.current_time
     
     def _calculate_interventions(self, market_state: Dict[str, Any]) -> Dict[str, float]:
         """Calculate foreign exchange intervention decisions"""
-        interventions = {}
+        currencies = self._intervention_currencies
+        n = len(currencies)
+        _, uniforms = self.next_random_draws()
+        
+        # Random intervention decisions
+        triggered = uniforms[:n] < self.config.intervention_probability
+        if not triggered.any():
+            return {}
         
-        # Get exchange rate data
-        exchange_rates = market_state.get("exchange_rates", {})
+        # Higher allocation, more volatile currencies get more intervention support
         volatilities = market_state.get("volatilities", {})
+        vols = np.array([volatilities.get(c, 0.1) for c in currencies])
+        allocations = np.where(self._intervention_held, self._current[self._intervention_idx], 0.0)
+        strengths = allocations * vols * self.config.intervention_strength
         
-        for currency in self.config.major_currencies:
-            if currency == "USD":
-                continue
-                
-            # Calculate intervention probability based on volatility and allocation
-            vol = volatilities.get(currency, 0.1)
-            allocation = self.current_allocation.get(currency, 0.0)
-            
-            # Higher allocation currencies get more intervention support
-            intervention_strength = allocation * vol * self.config.intervention_strength
-            
-            # Random intervention decision
-            if self.get_random_uniform() < self.config.intervention_probability:
-                # Intervention direction based on recent movements (simplified)
-                direction = self.get_random_uniform() > 0.5
-                interventions[currency] = intervention_strength * (1 if direction else -1)
+        # Intervention direction based on recent movements (simplified)
+        strengths = np.where(uniforms[n:] > 0.5, strengths, -strengths)
         
-        return interventions
+        return {currencies[i]: float(strengths[i]) for i in np.flatnonzero(triggered)}
     
     def _calculate_allocation_deviation(self) -> float:
         """Calculate total deviation from target allocation"""
-        return sum(abs(self.current_allocation[asset] - self.target_allocation[asset])
-                  for asset in self.target_allocation) 
\ No newline at end of file
+        return float(np.abs(self._current - self._target).sum()) 
\ No newline at end of file
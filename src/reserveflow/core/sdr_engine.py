@@ -2,11 +2,81 @@
 SDR Engine - Special Drawing Rights System modeling IMF SDR as international reserve asset
 """
 
+import math
+from bisect import bisect_right
+from collections.abc import Mapping
 import numpy as np
 import pandas as pd
-from typing import Dict, Any, List
+from dataclasses import dataclass, fields
+from types import MappingProxyType
+from typing import Dict, Any, List, Tuple
 from datetime import datetime
-from .base_engine import BaseEngine
+from ..config import _DATACLASS_OPTIONS
+from .base_engine import ArrayView, BaseEngine
+from .kernels import basket_performance_kernel, sdr_rate_kernel, sdr_value_kernel
+
+
+# Default 3-month money market rates of the basket currencies; currencies
+# outside this table default to 2%
+_MONEY_MARKET_RATES = {
+    "USD": 0.05,
+    "EUR": 0.03,
+    "CNY": 0.03,
+    "JPY": 0.001,
+    "GBP": 0.04
+}
+
+# Number of most recent transactions behind the usage rate, and behind the
+# average transaction size
+_TXN_WINDOW = 90
+_TXN_RECENT = 30
+
+# SDR transaction types and the cumulative probabilities that select them
+_TRANSACTION_TYPES = ("voluntary_exchange", "designation", "repurchase")
+_TRANSACTION_TYPE_CDF = (0.4, 0.8)
+
+
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
+class SDRMarketInputs:
+    """Market state values the SDR engine reads each step, with their defaults"""
+    market_stress: float = 0.0
+    geopolitical_risk: float = 0.3
+    global_crisis: bool = False
+    global_liquidity_shortage: float = 0.0
+    global_reserves_usd: float = 12000.0  # $12 trillion
+    dedollarization_pressure: float = 0.0
+    currency_volatility_index: float = 0.1
+
+
+# Market state keys the engine reads each step and their defaults
+_MARKET_INPUTS = {f.name: f.default for f in fields(SDRMarketInputs)}
+
+
+@dataclass(frozen=True, **_DATACLASS_OPTIONS)
+class SDRStepOutput:
+    """
+    Outputs of one SDR engine step
+    
+    Scalar fields only, besides the step's transactions; the basket and the
+    per-currency performance breakdown stay on the engine (sdr_basket,
+    get_basket_performance).
+    """
+    sdr_value_usd: float
+    sdr_interest_rate: float
+    total_outstanding: float
+    emergency_allocation: float
+    sdr_share_of_reserves: float
+    sdr_volatility: float
+    sdr_attractiveness: float
+    usage_rate: float
+    average_transaction_size: float
+    basket_return: float
+    basket_volatility: float
+    sdr_transactions: Tuple[Dict[str, Any], ...] = ()
+
+
+# Names of the step outputs, in the order they are reported
+SDR_OUTPUT_FIELDS = tuple(f.name for f in fields(SDRStepOutput))
 
 
 class SDREngine(BaseEngine):
@@ -15,17 +85,22 @@ class SDREngine(BaseEngine):
     a basket of five currencies (USD, EUR, CNY, JPY, GBP)
     """
     
+    # Each step draws one normal (transaction size) and four uniforms
+    # (transaction occurrence and type, emergency occurrence and size)
+    normals_per_step = 1
+    uniforms_per_step = 4
+    
     def __init__(self, config: Any, random_state: int = None):
         super().__init__(config, random_state)
         
         # SDR basket composition (as of 2022 review)
-        self.sdr_basket = {
+        self._set_basket({
             "USD": 0.43,    # 43.38%
             "EUR": 0.29,    # 29.31% 
             "CNY": 0.13,    # 12.28%
             "JPY": 0.08,    # 7.59%
             "GBP": 0.07     # 7.44%
-        }
+        })
         
         # Total SDR outstanding (in SDR billions)
         self.total_sdr_outstanding = 660.0  # After 2021 allocation
@@ -37,9 +112,20 @@ class SDREngine(BaseEngine):
         self.sdr_interest_rate = 0.02  # 2% annual
         
         # Allocation and usage tracking
-        self.country_allocations = self._initialize_country_allocations()
+        # Country allocations as one vector, "others" last
+        allocations = self._initialize_country_allocations()
+        self._country_index = {country: i for i, country in enumerate(allocations)}
+        self._country_alloc = np.array(list(allocations.values()), dtype=np.float64)
         self.sdr_transactions = []
         
+        # Amounts (SDR millions) of the last _TXN_WINDOW transactions, in a
+        # ring buffer, and running sums over the whole window and over the
+        # last _TXN_RECENT of them, so the usage metrics need no pass at all
+        self._txn_amount_sdr = np.zeros(_TXN_WINDOW)
+        self._txn_count = 0
+        self._txn_sum_window = 0.0
+        self._txn_sum_recent = 0.0
+        
     def initialize(self) -> None:
         """Initialize SDR system state"""
         # Calculate initial SDR value
@@ -49,6 +135,47 @@ class SDREngine(BaseEngine):
         self.quarterly_sdr_usage = 0.0
         self.emergency_allocations = 0.0
         
+    def _set_basket(self, weights: Dict[str, float]) -> None:
+        """
+        Set the basket composition and the fixed-order vectors derived from it
+        
+        The step path reads only the vectors; the weights dict is kept for
+        reporting through the read-only sdr_basket view.
+        
+        Args:
+            weights: Weight per basket currency
+        """
+        self._sdr_basket = dict(weights)
+        self._basket_currencies = tuple(weights)
+        self._basket_weights = np.array(list(weights.values()), dtype=np.float64)
+        
+        # Exponent applied to each currency's USD exchange rate: USD counts at
+        # par, EUR and GBP are quoted as XXX/USD and the rest as USD/XXX
+        self._basket_quote = np.array([0.0 if currency == "USD" else 1.0 if currency in ("EUR", "GBP") else -1.0
+                                       for currency in weights])
+        
+        # Market state keys and defaults of the money market rates
+        self._basket_rate_keys = tuple(f"{currency.lower()}_3m_rate" for currency in weights)
+        self._basket_rate_defaults = tuple(_MONEY_MARKET_RATES.get(currency, 0.02) for currency in weights)
+        self._basket_performance_keys = tuple((f"{currency.lower()}_volatility", f"{currency.lower()}_return")
+                                              for currency in weights)
+        
+        # Per-step inputs of the SDR kernels, filled in place
+        self._basket_fx = np.empty(len(weights))
+        self._basket_mm = np.empty(len(weights))
+        self._basket_ret = np.empty(len(weights))
+        self._basket_vol = np.empty(len(weights))
+        
+    @property
+    def sdr_basket(self) -> Mapping:
+        """Read-only view of the basket weights (change them with simulate_basket_rebalancing)"""
+        return MappingProxyType(self._sdr_basket)
+    
+    @property
+    def country_allocations(self) -> Mapping:
+        """Live view of the SDR allocations by country (SDR billions)"""
+        return ArrayView(self._country_index, self._country_alloc)
+    
     def _initialize_country_allocations(self) -> Dict[str, float]:
         """Initialize SDR allocations by country (SDR billions)"""
         # Major economies' SDR allocations (approximate)
@@ -66,8 +193,10 @@ class SDREngine(BaseEngine):
             "others": 403.0  # Rest of the world
         }
     
-    def step(self, current_time: datetime, market_state: Dict[str, Any]) -> Dict[str, Any]:
+    def step(self, current_time: datetime, market_state: Dict[str, Any]) -> SDRStepOutput:
         """Simulate one step of SDR system evolution"""
+        # Read the scalar market inputs once for all the helpers below
+        inputs = SDRMarketInputs(*[market_state.get(name, default) for name, default in _MARKET_INPUTS.items()])
         
         # Update SDR value based on basket currencies
         self._update_sdr_value(market_state)
@@ -76,117 +205,118 @@ class SDREngine(BaseEngine):
         self._update_sdr_interest_rate(market_state)
         
         # Process SDR transactions
-        transactions = self._simulate_sdr_transactions(market_state)
+        normals, uniforms = self.next_random_draws()
+        transactions = self._simulate_sdr_transactions(inputs, uniforms[0], normals[0], uniforms[1])
         
         # Check for emergency allocations
-        emergency_allocation = self._check_emergency_allocation(market_state)
+        emergency_allocation = self._check_emergency_allocation(inputs, uniforms[2], uniforms[3])
         
-        # Calculate SDR demand and usage metrics
-        sdr_metrics = self._calculate_sdr_metrics(market_state)
+        # Calculate SDR demand, usage and basket metrics
+        sdr_metrics = self._calculate_sdr_metrics(inputs, market_state)
         
         # Prepare output
-        output = {
-            "sdr_value_usd": self.sdr_value_usd,
-            "sdr_interest_rate": self.sdr_interest_rate,
-            "sdr_basket": self.sdr_basket.copy(),
-            "total_outstanding": self.total_sdr_outstanding,
-            "sdr_transactions": transactions,
-            "emergency_allocation": emergency_allocation,
-            "sdr_metrics": sdr_metrics,
-            "basket_performance": self._get_basket_performance(market_state)
-        }
+        output = SDRStepOutput(
+            sdr_value_usd=self.sdr_value_usd,
+            sdr_interest_rate=self.sdr_interest_rate,
+            total_outstanding=self.total_sdr_outstanding,
+            emergency_allocation=emergency_allocation,
+            sdr_transactions=transactions,
+            **sdr_metrics
+        )
         
         # Add to history
-        self.add_to_history(output)
+        self.add_to_history({name: getattr(output, name) for name in SDR_OUTPUT_FIELDS})
         
         return output
     
     def _update_sdr_value(self, market_state: Dict[str, Any]) -> None:
         """Update SDR value based on basket currency movements"""
-        sdr_value = 0.0
-        
         # Get exchange rates (assume USD base)
         exchange_rates = market_state.get("exchange_rates", {})
+        self._basket_fx[:] = [exchange_rates.get(currency, 1.0) for currency in self._basket_currencies]
         
-        for currency, weight in self.sdr_basket.items():
-            if currency == "USD":
-                currency_value = weight  # USD component
-            else:
-                # Convert to USD using exchange rates
-                rate = exchange_rates.get(currency, 1.0)
-                if currency in ["EUR", "GBP"]:
-                    currency_value = weight * rate  # These are quoted as XXX/USD
-                else:
-                    currency_value = weight / rate  # These are quoted as USD/XXX
-                    
-            sdr_value += currency_value
-            
-        self.sdr_value_usd = sdr_value
+        self.sdr_value_usd = sdr_value_kernel(self._basket_weights, self._basket_fx, self._basket_quote)
     
     def _update_sdr_interest_rate(self, market_state: Dict[str, Any]) -> None:
         """Update SDR interest rate based on basket currency rates"""
         # SDR rate is weighted average of money market rates of basket currencies
-        basket_rates = {
-            "USD": market_state.get("usd_3m_rate", 0.05),
-            "EUR": market_state.get("eur_3m_rate", 0.03),
-            "CNY": market_state.get("cny_3m_rate", 0.03),
-            "JPY": market_state.get("jpy_3m_rate", 0.001),
-            "GBP": market_state.get("gbp_3m_rate", 0.04)
-        }
-        
-        weighted_rate = sum(
-            self.sdr_basket[currency] * basket_rates.get(currency, 0.02)
-            for currency in self.sdr_basket
-        )
+        self._basket_mm[:] = [market_state.get(key, default) for key, default
+                              in zip(self._basket_rate_keys, self._basket_rate_defaults)]
         
-        # Apply smoothing
-        self.sdr_interest_rate = 0.9 * self.sdr_interest_rate + 0.1 * weighted_rate
+        # Weighted average with smoothing
+        self.sdr_interest_rate = sdr_rate_kernel(self.sdr_interest_rate, self._basket_weights,
+                                                 self._basket_mm, 0.1)
     
-    def _simulate_sdr_transactions(self, market_state: Dict[str, Any]) -> List[Dict[str, Any]]:
-        """Simulate SDR transactions between countries"""
-        transactions = []
-        
+    def _simulate_sdr_transactions(self, inputs: SDRMarketInputs, draw: float,
+                                   size_normal: float, type_uniform: float) -> Tuple[Dict[str, Any], ...]:
+        """
+        Simulate SDR transactions between countries
+        
+        Args:
+            inputs: Market inputs for this step
+            draw: Uniform draw deciding whether a transaction happens
+            size_normal: Standard normal draw for the transaction size
+            type_uniform: Uniform draw for the transaction type
+        
+        Returns:
+            Transactions made this step (the shared empty tuple on the
+            usual step without one)
+        """
         # Probability of transactions increases with market stress
-        market_stress = market_state.get("market_stress", 0.0)
-        geopolitical_risk = market_state.get("geopolitical_risk", 0.3)
+        market_stress = inputs.market_stress
+        geopolitical_risk = inputs.geopolitical_risk
         
         transaction_probability = 0.02 + market_stress * 0.1 + geopolitical_risk * 0.05
         
-        if self.get_random_uniform() < transaction_probability:
+        if draw < transaction_probability:
             # Generate a transaction
-            transaction = self._generate_sdr_transaction(market_state)
-            transactions.append(transaction)
+            transaction = self._generate_sdr_transaction(inputs, size_normal, type_uniform)
             self.sdr_transactions.append(transaction)
+            self._record_transaction_amount(transaction["amount_sdr"])
+            return (transaction,)
             
-        return transactions
+        return ()
     
-    def _generate_sdr_transaction(self, market_state: Dict[str, Any]) -> Dict[str, Any]:
+    def _record_transaction_amount(self, amount: float) -> None:
+        """Push a transaction amount into the ring buffer and update the running sums"""
+        count = self._txn_count
+        slot = count % _TXN_WINDOW
+        # Slots not yet written hold zero, so the window sum subtracts nothing
+        # until the buffer has wrapped
+        self._txn_sum_window += amount - self._txn_amount_sdr[slot]
+        self._txn_sum_recent += amount
+        if count >= _TXN_RECENT:
+            self._txn_sum_recent -= self._txn_amount_sdr[(count - _TXN_RECENT) % _TXN_WINDOW]
+        self._txn_amount_sdr[slot] = amount
+        self._txn_count = count + 1
+    
+    def _generate_sdr_transaction(self, inputs: SDRMarketInputs, size_normal: float,
+                                  type_uniform: float) -> Dict[str, Any]:
         """Generate a realistic SDR transaction"""
         # Countries more likely to use SDRs during stress
         high_stress_countries = ["emerging", "small_economies"]
         reserve_rich_countries = ["USA", "CHN", "JPN", "GER"]
         
         # Transaction size (SDR millions)
-        transaction_size = self.rng.lognormal(np.log(100), 0.5)  # Log-normal distribution
+        transaction_size = math.exp(math.log(100) + 0.5 * size_normal)  # Log-normal distribution
         transaction_size = min(transaction_size, 5000)  # Cap at 5 billion SDR
         
-        # Transaction type
-        transaction_types = ["voluntary_exchange", "designation", "repurchase"]
-        transaction_type = self.rng.choice(transaction_types, p=[0.4, 0.4, 0.2])
+        # Transaction type (probabilities 0.4, 0.4, 0.2)
+        transaction_type = _TRANSACTION_TYPES[bisect_right(_TRANSACTION_TYPE_CDF, type_uniform)]
         
         transaction = {
             "type": transaction_type,
             "amount_sdr": transaction_size,
             "amount_usd": transaction_size * self.sdr_value_usd,
-            "purpose": self._get_transaction_purpose(market_state),
-            "stress_related": market_state.get("market_stress", 0.0) > 0.5
+            "purpose": self._get_transaction_purpose(inputs),
+            "stress_related": inputs.market_stress > 0.5
         }
         
         return transaction
     
-    def _get_transaction_purpose(self, market_state: Dict[str, Any]) -> str:
+    def _get_transaction_purpose(self, inputs: SDRMarketInputs) -> str:
         """Determine purpose of SDR transaction"""
-        market_stress = market_state.get("market_stress", 0.0)
+        market_stress = inputs.market_stress
         
         if market_stress > 0.7:
             return "crisis_liquidity"
@@ -195,11 +325,22 @@ class SDREngine(BaseEngine):
         else:
             return "portfolio_optimization"
     
-    def _check_emergency_allocation(self, market_state: Dict[str, Any]) -> float:
-        """Check if emergency SDR allocation is needed"""
+    def _check_emergency_allocation(self, inputs: SDRMarketInputs, draw: float,
+                                    size_uniform: float) -> float:
+        """
+        Check if emergency SDR allocation is needed
+        
+        Args:
+            inputs: Market inputs for this step
+            draw: Uniform draw deciding whether an allocation happens
+            size_uniform: Uniform draw for the allocation size
+        
+        Returns:
+            Emergency allocation made this step (SDR billions)
+        """
         # Emergency allocation criteria
-        global_crisis = market_state.get("global_crisis", False)
-        liquidity_shortage = market_state.get("global_liquidity_shortage", 0.0)
+        global_crisis = inputs.global_crisis
+        liquidity_shortage = inputs.global_liquidity_shortage
         
         emergency_allocation = 0.0
         
@@ -207,59 +348,62 @@ class SDREngine(BaseEngine):
             # Probability of emergency allocation
             allocation_probability = 0.01 * liquidity_shortage  # 1% chance per 100% shortage
             
-            if self.get_random_uniform() < allocation_probability:
+            if draw < allocation_probability:
                 # Emergency allocation (SDR billions)
-                emergency_allocation = self.rng.uniform(50, 200)  # 50-200 billion SDR
+                emergency_allocation = 50.0 + 150.0 * size_uniform  # 50-200 billion SDR
                 self.total_sdr_outstanding += emergency_allocation
                 self.emergency_allocations += emergency_allocation
                 
-                # Distribute to countries
-                for country in self.country_allocations:
-                    if country != "others":
-                        quota_share = self.country_allocations[country] / 257.0  # Excluding others
-                        self.country_allocations[country] += emergency_allocation * quota_share
-                    else:
-                        # Others get remaining
-                        others_share = emergency_allocation * 0.5
-                        self.country_allocations[country] += others_share
+                # Distribute to countries by quota share (excluding others);
+                # others get the remaining half
+                named = self._country_alloc[:-1]
+                named += emergency_allocation * (named / 257.0)
+                self._country_alloc[-1] += emergency_allocation * 0.5
                         
         return emergency_allocation
     
-    def _calculate_sdr_metrics(self, market_state: Dict[str, Any]) -> Dict[str, float]:
-        """Calculate various SDR system metrics"""
+    def _calculate_sdr_metrics(self, inputs: SDRMarketInputs, market_state: Dict[str, Any]) -> Dict[str, float]:
+        """Calculate various SDR system metrics, including the basket's return and volatility"""
         # SDR as percentage of global reserves
-        global_reserves = market_state.get("global_reserves_usd", 12000)  # $12 trillion
+        global_reserves = inputs.global_reserves_usd
         sdr_share = (self.total_sdr_outstanding * self.sdr_value_usd) / global_reserves * 100
         
         # SDR volatility vs USD
         sdr_volatility = self._calculate_sdr_volatility()
         
         # SDR attractiveness index
-        attractiveness = self._calculate_sdr_attractiveness(market_state)
+        attractiveness = self._calculate_sdr_attractiveness(inputs)
+        
+        # Usage rate (percentage of SDRs actively used), from the running sum
+        # over the last 90 transactions
+        usage_rate = self._txn_sum_window / self.total_sdr_outstanding * 100
         
-        # Usage rate (percentage of SDRs actively used)
-        quarterly_usage = sum(t["amount_sdr"] for t in self.sdr_transactions[-90:])  # Last 90 days
-        usage_rate = quarterly_usage / self.total_sdr_outstanding * 100
+        n_recent = min(self._txn_count, _TXN_RECENT)
+        average_transaction_size = self._txn_sum_recent / n_recent if n_recent else 0.0
+        
+        # Basket performance in one pass over the basket vectors
+        self._read_basket_performance(market_state)
+        basket_return, basket_volatility = basket_performance_kernel(
+            self._basket_weights, self._basket_vol, self._basket_ret)
         
         return {
             "sdr_share_of_reserves": sdr_share,
             "sdr_volatility": sdr_volatility,
             "sdr_attractiveness": attractiveness,
             "usage_rate": usage_rate,
-            "average_transaction_size": np.mean([t["amount_sdr"] for t in self.sdr_transactions[-30:]]) if self.sdr_transactions else 0
+            "average_transaction_size": average_transaction_size,
+            "basket_return": basket_return,
+            "basket_volatility": basket_volatility
         }
     
     def _calculate_sdr_volatility(self) -> float:
         """Calculate SDR volatility based on basket"""
-        if len(self.data_history) < 30:
+        if self.history_length < 30:
             return 0.05  # Default volatility
             
-        # Get recent SDR values, ensuring they are floats
-        recent_values = []
-        for d in self.data_history[-30:]:
-            val = d.get("sdr_value_usd")
-            if isinstance(val, (int, float)):
-                recent_values.append(val)
+        # Get recent SDR values
+        recent_values = self.history_column("sdr_value_usd")[-30:]
+        recent_values = recent_values[~np.isnan(recent_values)]
         
         if len(recent_values) < 2:
             return 0.05 # Not enough data to calculate
@@ -268,14 +412,14 @@ class SDREngine(BaseEngine):
         
         return np.std(returns) * np.sqrt(252)  # Annualized volatility
     
-    def _calculate_sdr_attractiveness(self, market_state: Dict[str, Any]) -> float:
+    def _calculate_sdr_attractiveness(self, inputs: SDRMarketInputs) -> float:
         """Calculate SDR attractiveness relative to individual currencies"""
         attractiveness = 0.5  # Base attractiveness
         
         # Factors that increase SDR attractiveness
-        geopolitical_risk = market_state.get("geopolitical_risk", 0.3)
-        usd_dominance_concern = market_state.get("dedollarization_pressure", 0.0)
-        currency_volatility = market_state.get("currency_volatility_index", 0.1)
+        geopolitical_risk = inputs.geopolitical_risk
+        usd_dominance_concern = inputs.dedollarization_pressure
+        currency_volatility = inputs.currency_volatility_index
         
         # SDR benefits from diversification during uncertainty
         attractiveness += geopolitical_risk * 0.3
@@ -290,36 +434,33 @@ class SDREngine(BaseEngine):
         
         return max(0.0, min(1.0, attractiveness))
     
-    def _get_basket_performance(self, market_state: Dict[str, Any]) -> Dict[str, Any]:
-        """Get performance metrics of SDR basket currencies"""
-        performance = {}
+    def _read_basket_performance(self, market_state: Dict[str, Any]) -> None:
+        """Read each basket currency's return and volatility into _basket_ret and _basket_vol"""
+        keys = self._basket_performance_keys
+        n = len(keys)
+        self._basket_ret[:] = np.fromiter((market_state.get(return_key, 0.0) for _, return_key in keys),
+                                          dtype=np.float64, count=n)
+        self._basket_vol[:] = np.fromiter((market_state.get(volatility_key, 0.1) for volatility_key, _ in keys),
+                                          dtype=np.float64, count=n)
+    
+    def get_basket_performance(self, market_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Get performance metrics of SDR basket currencies, per currency and overall"""
+        self._read_basket_performance(market_state)
         
-        for currency in self.sdr_basket:
-            weight = self.sdr_basket[currency]
-            
-            # Get currency performance metrics
-            currency_volatility = market_state.get(f"{currency.lower()}_volatility", 0.1)
-            currency_return = market_state.get(f"{currency.lower()}_return", 0.0)
-            
+        performance = {}
+        for currency, weight, currency_volatility, currency_return in zip(
+                self._basket_currencies, self._basket_weights, self._basket_vol, self._basket_ret):
             performance[currency] = {
-                "weight": weight,
-                "volatility": currency_volatility,
-                "return": currency_return,
-                "contribution_to_sdr": weight * currency_return
+                "weight": float(weight),
+                "volatility": float(currency_volatility),
+                "return": float(currency_return),
+                "contribution_to_sdr": float(weight * currency_return)
             }
         
         # Overall basket metrics
-        performance["basket_return"] = sum(
-            perf["contribution_to_sdr"] for perf in performance.values() 
-            if isinstance(perf, dict)
-        )
-        
-        performance["basket_volatility"] = np.sqrt(
-            sum(
-                (performance[curr]["weight"] * performance[curr]["volatility"]) ** 2
-                for curr in self.sdr_basket
-            )
-        )
+        weights = self._basket_weights
+        performance["basket_return"] = float(weights @ self._basket_ret)
+        performance["basket_volatility"] = float(np.linalg.norm(weights * self._basket_vol))
         
         return performance
     
@@ -329,7 +470,7 @@ class SDREngine(BaseEngine):
             raise ValueError("New weights must sum to 1.0")
             
         old_basket = self.sdr_basket.copy()
-        self.sdr_basket = new_weights.copy()
+        self._set_basket(new_weights)
         
         # Calculate impact of rebalancing
         rebalancing_impact = {
@@ -2,13 +2,15 @@
 Main ReserveFlow Simulation Class
 """
 
+import dataclasses
+from collections.abc import Mapping
 import numpy as np
 import pandas as pd
 from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
 import logging
 
-from .config import BaseConfig, DefaultConfig
+from .analysis import OnlineStats, as_scalar
+from .config import BaseConfig, DefaultConfig, spawn_rngs
 from .core import (
     ReserveManagementEngine,
     ExchangeRateEngine, 
@@ -16,6 +18,30 @@ from .core import (
     GeopoliticalRiskEngine,
     SDREngine
 )
+from .core.base_engine import ArrayView
+from .core.kernels import market_indicators_kernel
+from .core.sdr_engine import SDR_OUTPUT_FIELDS
+
+
+# Per-step metrics with running statistics, and the level above which an
+# observation counts as a crisis (None if not applicable)
+TRACKED_METRICS = {
+    'gold_price': None,
+    'silver_price': None,
+    'usd_index': None,
+    'geopolitical_risk': 0.7,
+    'market_stress': 0.7,
+}
+
+# Currencies of the simplified USD index, and the exponent that turns each
+# one's USD exchange rate into USD strength (EUR and GBP are quoted XXX/USD)
+_USD_INDEX_CURRENCIES = ("EUR", "GBP", "JPY", "CNY")
+_USD_INDEX_QUOTE = np.array([-1.0, -1.0, 1.0, 1.0])
+
+# Currencies whose volatility enters the market stress index. The stress
+# thresholds used across the engines were calibrated with the base currency
+# alone, whose volatility is zero, so stress tracks geopolitical risk
+_STRESS_VOL_CURRENCIES = ("USD",)
 
 
 class ReserveFlowSimulation:
@@ -31,24 +57,87 @@ class ReserveFlowSimulation:
             config: Configuration object for simulation parameters
         """
         self.config = config or DefaultConfig()
-        self.current_time = pd.to_datetime(self.config.start_date)
-        self.end_time = pd.to_datetime(self.config.end_date)
         
-        # Initialize engines
-        self.exchange_rate_engine = ExchangeRateEngine(self.config)
-        self.precious_metals_engine = PreciousMetalsEngine(self.config)
-        self.geopolitical_engine = GeopoliticalRiskEngine(self.config)
-        self.sdr_engine = SDREngine(self.config)
-        self.reserve_engine = ReserveManagementEngine(self.config)
-        
-        # Market state
-        self.market_state = {}
-        self.simulation_results = []
+        # Initialize engines and market state
+        self.reset()
         
         # Set up logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
+    
+    def reset(self, config: Optional[BaseConfig] = None, seed: Optional[int] = None,
+              rng: Optional[np.random.Generator] = None) -> None:
+        """
+        Reset the simulation so it can be run again
         
+        Args:
+            config: New configuration to switch to (keeps the current one if None)
+            seed: Random seed override, applied to a copy of the configuration
+            rng: Pre-seeded generator override, applied to a copy of the configuration
+        """
+        if config is not None:
+            self.config = config
+        overrides = {}
+        if seed is not None:
+            overrides['random_seed'] = seed
+        if rng is not None:
+            overrides['rng'] = rng
+        if overrides:
+            self.config = dataclasses.replace(self.config, **overrides)
+        
+        # The clock runs on datetime64; see the current_time property
+        self._time = np.datetime64(self.config.start_date, 'ns')
+        self._end_time = np.datetime64(self.config.end_date, 'ns')
+        
+        # Engines take their parameters from the config at construction, and
+        # each draws from its own independent random stream
+        streams = self._engine_streams(5)
+        self.exchange_rate_engine = ExchangeRateEngine(self.config, streams[0])
+        self.precious_metals_engine = PreciousMetalsEngine(self.config, streams[1])
+        self.geopolitical_engine = GeopoliticalRiskEngine(self.config, streams[2])
+        self.sdr_engine = SDREngine(self.config, streams[3])
+        self.reserve_engine = ReserveManagementEngine(self.config, streams[4])
+        self._engines = (self.geopolitical_engine, self.exchange_rate_engine,
+                         self.precious_metals_engine, self.sdr_engine, self.reserve_engine)
+        
+        # Market state
+        self.market_state = {}
+        self._allocate_results(0)
+        self.running_stats = self._new_running_stats()
+        self._usd_index_rates = np.empty(len(_USD_INDEX_CURRENCIES))
+        self._stress_vols = np.empty(len(_STRESS_VOL_CURRENCIES))
+        
+    @property
+    def current_time(self) -> pd.Timestamp:
+        """Current simulation time"""
+        return pd.Timestamp(self._time)
+    
+    @current_time.setter
+    def current_time(self, value: Any) -> None:
+        self._time = np.datetime64(value, 'ns')
+    
+    @property
+    def simulation_results(self) -> List[Dict[str, Any]]:
+        """Per-step results as row dicts, rebuilt from the column buffers"""
+        columns = self._result_columns
+        return [{name: column[i] for name, column in columns.items()}
+                for i in range(self._n_results)]
+    
+    @property
+    def end_time(self) -> pd.Timestamp:
+        """Time at which the current run stops"""
+        return pd.Timestamp(self._end_time)
+    
+    @end_time.setter
+    def end_time(self, value: Any) -> None:
+        self._end_time = np.datetime64(value, 'ns')
+    
+    def _engine_streams(self, n: int) -> List[Any]:
+        """Spawn independent random streams for n engines from the config's seed or generator"""
+        if self.config.rng is not None:
+            return spawn_rngs(self.config.rng, n)
+        return np.random.SeedSequence(self.config.random_seed).spawn(n)
+    
     def initialize_simulation(self) -> None:
         """Initialize all engines and market state"""
         self.logger.info("Initializing ReserveFlow simulation...")
@@ -68,7 +157,6 @@ class ReserveFlowSimulation:
     def _initialize_market_state(self) -> Dict[str, Any]:
         """Initialize the global market state"""
         return {
-            "timestamp": self.current_time,
             "global_gdp_growth": 0.03,
             "global_inflation": 0.025,
             "global_reserves_usd": 12000,  # $12 trillion
@@ -85,24 +173,31 @@ class ReserveFlowSimulation:
     
     def step(self) -> Dict[str, Any]:
         """Execute one simulation step"""
+        # Convert the clock once for the engines, which use calendar fields
+        current_time = self.current_time
+        for engine in self._engines:
+            engine.current_time = self._time
+        
         # Update geopolitical state first (influences other markets)
-        geo_output = self.geopolitical_engine.step(self.current_time, self.market_state)
+        geo_output = self.geopolitical_engine.step(current_time, self.market_state)
         self.market_state.update(geo_output)
         
         # Update exchange rates
-        fx_output = self.exchange_rate_engine.step(self.current_time, self.market_state)
+        fx_output = self.exchange_rate_engine.step(current_time, self.market_state)
         self.market_state.update(fx_output)
         
         # Update precious metals
-        pm_output = self.precious_metals_engine.step(self.current_time, self.market_state)
+        pm_output = self.precious_metals_engine.step(current_time, self.market_state)
         self.market_state.update(pm_output)
         
         # Update SDR system
-        sdr_output = self.sdr_engine.step(self.current_time, self.market_state)
-        self.market_state.update(sdr_output)
+        sdr_output = self.sdr_engine.step(current_time, self.market_state)
+        market_state = self.market_state
+        for name in SDR_OUTPUT_FIELDS:
+            market_state[name] = getattr(sdr_output, name)
         
         # Update reserve management
-        reserve_output = self.reserve_engine.step(self.current_time, self.market_state)
+        reserve_output = self.reserve_engine.step(current_time, self.market_state)
         self.market_state.update(reserve_output)
         
         # Update global market indicators
@@ -110,44 +205,149 @@ class ReserveFlowSimulation:
         
         # Store results
         step_results = {
-            "timestamp": self.current_time,
+            "timestamp": self._time,
             **self.market_state
         }
-        self.simulation_results.append(step_results)
+        self._record_step(step_results)
+        self._update_running_stats(step_results)
         
         return step_results
     
+    def _allocate_results(self, capacity: int) -> None:
+        """
+        Start a new set of result column buffers
+        
+        Columns are created on the first recorded step, typed from its values:
+        scalar outputs get a typed NumPy column, nested ones (dicts, lists,
+        array views) an object column.
+        
+        Args:
+            capacity: Number of steps to reserve room for
+        """
+        self._result_columns: Dict[str, np.ndarray] = {}
+        self._results_capacity = capacity
+        self._n_results = 0
+    
+    def _record_step(self, step_results: Dict[str, Any]) -> None:
+        """Write one step's outputs into the result column buffers"""
+        i = self._n_results
+        columns = self._result_columns
+        if i == self._results_capacity:
+            # Stepping past the preallocated run length; grow geometrically
+            capacity = max(2 * self._results_capacity, 32)
+            for name, column in columns.items():
+                grown = self._empty_result_column(column.dtype, capacity)
+                grown[:i] = column[:i]
+                columns[name] = grown
+            self._results_capacity = capacity
+        
+        for name, value in step_results.items():
+            column = columns.get(name)
+            if column is None:
+                column = columns[name] = self._new_result_column(value)
+            column[i] = value
+        self._n_results = i + 1
+    
+    def _new_result_column(self, value: Any) -> np.ndarray:
+        """Allocate a result column suited to a per-step value"""
+        if isinstance(value, (bool, np.bool_)):
+            # A bool column has no missing value, so one first seen mid-run
+            # falls back to objects
+            dtype = np.bool_ if self._n_results == 0 else object
+        elif isinstance(value, (int, float, np.number)):
+            # Numbers are stored as float64 whatever the first value's type,
+            # so a later float is never truncated into an integer column and
+            # missing steps read as NaN, as pandas would upcast them
+            dtype = np.float64
+        elif isinstance(value, np.datetime64):
+            dtype = value.dtype
+        else:
+            # Nested values are stored as objects like pandas does when
+            # building from row dicts
+            dtype = object
+        return self._empty_result_column(dtype, self._results_capacity)
+    
+    @staticmethod
+    def _empty_result_column(dtype: np.dtype, capacity: int) -> np.ndarray:
+        """Allocate a result column that reads as missing until written"""
+        dtype = np.dtype(dtype)
+        if dtype == np.bool_:
+            return np.zeros(capacity, dtype=dtype)
+        if dtype.kind == 'M':
+            return np.full(capacity, np.datetime64('NaT'), dtype=dtype)
+        return np.full(capacity, np.nan, dtype=dtype)
+    
+    def _results_frame(self) -> pd.DataFrame:
+        """Build the results DataFrame from the column buffers"""
+        n = self._n_results
+        columns = self._result_columns
+        if 'timestamp' not in columns:
+            return pd.DataFrame(index=pd.DatetimeIndex([], name='timestamp'))
+        index = pd.DatetimeIndex(columns['timestamp'][:n], name='timestamp')
+        return pd.DataFrame({name: column[:n] for name, column in columns.items()
+                             if name != 'timestamp'}, index=index)
+    
+    def _new_running_stats(self) -> Dict[str, OnlineStats]:
+        """Create empty accumulators for every tracked metric"""
+        stats = {metric: OnlineStats(threshold) for metric, threshold in TRACKED_METRICS.items()}
+        stats['gold_price_change'] = OnlineStats()
+        for currency in self.config.major_currencies[1:]:  # Exclude USD
+            stats[f'fx.{currency}'] = OnlineStats()
+            stats[f'fx_log_return.{currency}'] = OnlineStats()
+        return stats
+    
+    def _update_running_stats(self, step_results: Dict[str, Any]) -> None:
+        """Fold one step's outputs into the running statistics"""
+        stats = self.running_stats
+        
+        previous_gold = stats['gold_price'].last
+        for metric in TRACKED_METRICS:
+            if metric in step_results:
+                stats[metric].update(as_scalar(step_results[metric]))
+        if stats['gold_price'].count > 1:
+            stats['gold_price_change'].update(stats['gold_price'].last / previous_gold - 1)
+        
+        exchange_rates = step_results.get('exchange_rates', {})
+        for currency in self.config.major_currencies[1:]:
+            if currency in exchange_rates:
+                rate_stats = stats[f'fx.{currency}']
+                previous_rate = rate_stats.last
+                rate_stats.update(as_scalar(exchange_rates[currency]))
+                if rate_stats.count > 1:
+                    stats[f'fx_log_return.{currency}'].update(np.log(rate_stats.last / previous_rate))
+    
     def _update_market_indicators(self) -> None:
         """Update global market stress and other indicators"""
-        # Calculate market stress based on volatilities
+        # Market stress is based on the mean volatility of the stress
+        # currencies (only USD, the base currency, as the model is calibrated)
         vols = self.market_state.get("volatilities", {})
-        if isinstance(vols, dict):
-            vol_values = [v for v in vols.values() if isinstance(v, (int, float))]
-            currency_vol = np.mean(vol_values) if vol_values else 0.1
+        if isinstance(vols, Mapping):
+            vol_values = self._stress_vols
+            n = 0
+            for currency in _STRESS_VOL_CURRENCIES:
+                if currency in vols:
+                    vol_values[n] = vols[currency]
+                    n += 1
+            vol_values = vol_values[:n]
         else:
-            currency_vol = float(vols)
-
+            vol_values = np.array([float(vols)])
+        
         geopolitical_risk = self.market_state.get("geopolitical_risk", 0.3)
         
-        # Market stress index
-        market_stress = min(1.0, currency_vol * 5 + geopolitical_risk * 0.5)
+        # Simplified USD index over the available index currencies
+        exchange_rates = self.market_state.get("exchange_rates", {})
+        rates = self._usd_index_rates
+        for j, currency in enumerate(_USD_INDEX_CURRENCIES):
+            rates[j] = exchange_rates[currency] if currency in exchange_rates else np.nan
+        
+        market_stress, usd_index = market_indicators_kernel(
+            vol_values, float(geopolitical_risk), rates, _USD_INDEX_QUOTE)
         self.market_state["market_stress"] = market_stress
         
         # Risk sentiment (inverse of market stress)
         self.market_state["risk_sentiment"] = market_stress
         
-        # Update USD index based on exchange rates
-        usd_strength = 0.0
-        exchange_rates = self.market_state.get("exchange_rates", {})
-        for currency in ["EUR", "GBP", "JPY", "CNY"]:
-            if currency in exchange_rates:
-                # Simplified USD index calculation
-                if currency in ["EUR", "GBP"]:
-                    usd_strength += (1.0 / exchange_rates[currency]) * 0.25
-                else:
-                    usd_strength += exchange_rates[currency] * 0.25
-        
-        self.market_state["usd_index"] = 100.0 * usd_strength
+        self.market_state["usd_index"] = usd_index
     
     def run_simulation(self, duration_months: int = 24) -> pd.DataFrame:
         """
@@ -165,36 +365,42 @@ class ReserveFlowSimulation:
         self.initialize_simulation()
         
         # Calculate end time
-        self.end_time = self.current_time + timedelta(days=duration_months * 30)
-        
-        step_count = 0
-        while self.current_time < self.end_time:
+        n_days = duration_months * 30
+        self._end_time = self._time + np.timedelta64(n_days, 'D')
+        
+        # Size the result columns and the engines' history and random-draw
+        # buffers for the whole run up front
+        self._allocate_results(n_days)
+        for engine in self._engines:
+            engine.preallocate_history(n_days)
+            engine.prefill_rng(n_days)
+        
+        # Daily steps over a precomputed calendar, indexed by step number
+        dates = self._time + np.arange(n_days) * np.timedelta64(1, 'D')
+        for i in range(n_days):
+            self._time = dates[i]
+            
             # Execute simulation step
             self.step()
             
-            # Advance time (daily steps)
-            self.current_time += timedelta(days=1)
-            step_count += 1
-            
             # Log progress
-            if step_count % 30 == 0:  # Every 30 days
-                self.logger.info(f"Completed {step_count} days of simulation")
+            if (i + 1) % 30 == 0:  # Every 30 days
+                self.logger.info(f"Completed {i + 1} days of simulation")
+        self._time = self._end_time
         
         self.logger.info("Simulation completed successfully")
         
-        # Convert results to DataFrame
-        results_df = pd.DataFrame(self.simulation_results)
-        results_df.set_index('timestamp', inplace=True)
-        
-        return results_df
+        return self._results_frame()
     
-    def run_scenario(self, scenario_name: str, duration_months: int = 24) -> pd.DataFrame:
+    def run_scenario(self, scenario_name: str, duration_months: int = 24,
+                     rng: Optional[np.random.Generator] = None) -> pd.DataFrame:
         """
         Run a specific scenario simulation
         
         Args:
             scenario_name: Name of scenario ('baseline', 'crisis', 'dedollarization', 'inflation_surge')
             duration_months: Duration in months
+            rng: Pre-seeded generator to draw from (defaults to this simulation's config.rng)
             
         Returns:
             DataFrame with simulation results
@@ -212,9 +418,10 @@ class ReserveFlowSimulation:
         if scenario_name not in scenario_configs:
             raise ValueError(f"Unknown scenario: {scenario_name}")
         
-        # Update configuration
+        # Switch to the scenario config, keeping this simulation's seed or generator
         old_config = self.config
-        self.config = scenario_configs[scenario_name]
+        self.reset(scenario_configs[scenario_name], seed=old_config.random_seed,
+                   rng=rng if rng is not None else old_config.rng)
         
         try:
             # Run simulation with scenario config
@@ -222,49 +429,115 @@ class ReserveFlowSimulation:
             return results
         finally:
             # Restore original config
-            self.config = old_config
+            self.reset(old_config)
+    
+    def _running_stats_from_results(self, results: pd.DataFrame) -> Dict[str, OnlineStats]:
+        """Build the running statistics from a results DataFrame in one batch"""
+        stats = self._new_running_stats()
+        
+        for metric in TRACKED_METRICS:
+            if metric in results.columns:
+                column = results[metric].dropna()
+                if column.dtype == object:
+                    values = np.array([as_scalar(v) for v in column], dtype=np.float64)
+                else:
+                    values = column.to_numpy(dtype=np.float64)
+                stats[metric].update_many(values)
+        if 'gold_price' in results.columns:
+            gold = results['gold_price'].dropna().to_numpy(dtype=np.float64)
+            stats['gold_price_change'].update_many(gold[1:] / gold[:-1] - 1)
+        
+        if 'exchange_rates' in results.columns:
+            currencies = self.config.major_currencies[1:]
+            matrix = self._exchange_rate_matrix(results['exchange_rates'], currencies)
+            for j, currency in enumerate(currencies):
+                rates = matrix[:, j]
+                rates = rates[~np.isnan(rates)]
+                stats[f'fx.{currency}'].update_many(rates)
+                stats[f'fx_log_return.{currency}'].update_many(np.diff(np.log(rates)))
+        
+        return stats
     
-    def get_summary_statistics(self, results: pd.DataFrame) -> Dict[str, Any]:
-        """Calculate summary statistics from simulation results"""
+    @staticmethod
+    def _exchange_rate_matrix(column: pd.Series, currencies: List[str]) -> np.ndarray:
+        """
+        Stack a results column of per-step exchange rates into one array
+        
+        Args:
+            column: Per-step exchange rate mappings
+            currencies: Currencies to extract, in output column order
+            
+        Returns:
+            Steps x currencies array, NaN where a step has no rate for a currency
+        """
+        records = [r for r in column if isinstance(r, Mapping)]
+        matrix = np.full((len(records), len(currencies)), np.nan)
+        if not records:
+            return matrix
+        
+        first = records[0]
+        if all(isinstance(r, ArrayView) and r.index is first.index for r in records):
+            # Views over the same engine state: one stack, then pick columns
+            stacked = np.stack([r.array for r in records])
+            for j, currency in enumerate(currencies):
+                if currency in first.index:
+                    matrix[:, j] = stacked[:, first.index[currency]]
+        else:
+            for i, r in enumerate(records):
+                for j, currency in enumerate(currencies):
+                    if currency in r:
+                        matrix[i, j] = as_scalar(r[currency])
+        return matrix
+    
+    def get_summary_statistics(self, results: Optional[pd.DataFrame] = None) -> Dict[str, Any]:
+        """
+        Calculate summary statistics for a simulation run
+        
+        Args:
+            results: Results DataFrame to summarize; if None, use the running
+                statistics gathered during the last run
+            
+        Returns:
+            Dictionary of statistics grouped by category
+        """
+        if results is None:
+            running = self.running_stats
+        else:
+            running = self._running_stats_from_results(results)
         stats = {}
         
         # Exchange rate statistics
-        if 'exchange_rates' in results.columns:
-            stats['fx_stats'] = {}
-            for currency in self.config.major_currencies[1:]:  # Exclude USD
-                # Ensure that 'rates' is a list of floats, not dicts
-                rates = []
-                for r in results['exchange_rates']:
-                    if isinstance(r, dict) and currency in r:
-                        rates.append(float(r[currency]))
-                
-                if rates and len(rates) > 1:
-                    stats['fx_stats'][currency] = {
-                        'final_rate': rates[-1],
-                        'volatility': np.std(np.diff(np.log(rates))) * np.sqrt(252),
-                        'total_return': (rates[-1] / rates[0] - 1) * 100
-                    }
+        fx_stats = {}
+        for currency in self.config.major_currencies[1:]:  # Exclude USD
+            rates = running[f'fx.{currency}']
+            if rates.count > 1:
+                fx_stats[currency] = {
+                    'final_rate': rates.last,
+                    'volatility': running[f'fx_log_return.{currency}'].std(ddof=0) * np.sqrt(252),
+                    'total_return': (rates.last / rates.first - 1) * 100
+                }
+        if fx_stats:
+            stats['fx_stats'] = fx_stats
         
         # Precious metals statistics
-        if 'gold_price' in results.columns:
-            gold_prices = results['gold_price'].dropna().astype(float)
+        gold = running['gold_price']
+        if gold.count:
             stats['gold_stats'] = {
-                'final_price': gold_prices.iloc[-1],
-                'total_return': (gold_prices.iloc[-1] / gold_prices.iloc[0] - 1) * 100,
-                'volatility': gold_prices.pct_change().std() * np.sqrt(252) * 100,
-                'max_price': gold_prices.max(),
-                'min_price': gold_prices.min()
+                'final_price': gold.last,
+                'total_return': (gold.last / gold.first - 1) * 100,
+                'volatility': running['gold_price_change'].std() * np.sqrt(252) * 100,
+                'max_price': gold.max,
+                'min_price': gold.min
             }
         
         # Geopolitical risk statistics
-        if 'geopolitical_risk' in results.columns:
-            # Ensure the column is numeric before calculations
-            geo_risk = pd.to_numeric(results['geopolitical_risk'].apply(lambda x: x[0] if hasattr(x, '__iter__') else x), errors='coerce').dropna()
+        geo_risk = running['geopolitical_risk']
+        if geo_risk.count:
             stats['geopolitical_stats'] = {
-                'average_risk': geo_risk.mean(),
-                'max_risk': geo_risk.max(),
+                'average_risk': geo_risk.mean,
+                'max_risk': geo_risk.max,
                 'risk_volatility': geo_risk.std(),
-                'crisis_periods': (geo_risk > 0.7).sum()
+                'crisis_periods': geo_risk.above
             }
         
-        return stats 
\ No newline at end of file
+        return stats
@@ -2,6 +2,7 @@
 Chart creation functions for ReserveFlow simulation results
 """
 
+import matplotlib
 import matplotlib.pyplot as plt
 import seaborn as sns
 import plotly.graph_objects as go
@@ -9,6 +10,7 @@ import plotly.express as px
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
+from collections.abc import Mapping
 from typing import Dict, Any, Optional, List
 
 
@@ -37,7 +39,7 @@ def create_exchange_rate_chart(results_df: pd.DataFrame, currencies: Optional[Li
         if 'exchange_rates' in results_df.columns:
             rates = []
             for idx, row_data in results_df.iterrows():
-                if isinstance(row_data['exchange_rates'], dict):
+                if isinstance(row_data['exchange_rates'], Mapping):
                     rates.append(row_data['exchange_rates'].get(currency, np.nan))
                 else:
                     rates.append(np.nan)
@@ -169,7 +171,7 @@ def create_risk_dashboard(results_df: pd.DataFrame) -> go.Figure:
         # Extract average volatility
         avg_vol = []
         for idx, row_data in results_df.iterrows():
-            if isinstance(row_data['volatilities'], dict):
+            if isinstance(row_data['volatilities'], Mapping):
                 # Ensure values are floats before calculating mean
                 vols = [float(v) for k, v in row_data['volatilities'].items() if k != 'USD' and isinstance(v, (int, float))]
                 avg_vol.append(np.mean(vols) if vols else 0)
@@ -207,7 +209,7 @@ def create_reserve_allocation_chart(results_df: pd.DataFrame) -> go.Figure:
         allocation_data = {}
         
         for idx, row_data in results_df.iterrows():
-            if isinstance(row_data['current_allocation'], dict):
+            if isinstance(row_data['current_allocation'], Mapping):
                 for asset, allocation in row_data['current_allocation'].items():
                     if asset not in allocation_data:
                         allocation_data[asset] = []
@@ -319,8 +321,9 @@ def save_charts_to_html(figures: Dict[str, go.Figure], output_dir: str = "output
         print(f"Saved {name} chart to {filepath}")
 
 
-def create_matplotlib_summary(results_df: pd.DataFrame) -> None:
-    """Create summary charts using matplotlib"""
+def create_matplotlib_summary(results_df: pd.DataFrame,
+                              output_path: str = 'reserveflow_summary.png') -> None:
+    """Create summary charts using matplotlib and save them to output_path"""
     # Identify numeric columns for plotting
     numeric_cols = results_df.select_dtypes(include=np.number).columns.tolist()
     
@@ -361,5 +364,7 @@ def create_matplotlib_summary(results_df: pd.DataFrame) -> None:
         fig.delaxes(axes[i])
         
     plt.tight_layout(rect=[0, 0.03, 1, 0.95])
-    plt.savefig('reserveflow_summary.png', dpi=300, bbox_inches='tight')
-    plt.show() 
\ No newline at end of file
+    fig.savefig(output_path, dpi=150, bbox_inches='tight')
+    # Only open a window when a GUI backend is active
+    if plt.get_backend() in matplotlib.rcsetup.interactive_bk:
+        plt.show() 
\ No newline at end of file
@@ -12,6 +12,7 @@ import numpy as np
 import traceback
 import sys
 import os
+from collections.abc import Mapping
 from datetime import datetime, timedelta
 import json
 
@@ -535,7 +536,7 @@ class ReserveFlowDashboard:
             for idx, row_data in results.iterrows():
                 try:
                     allocation = row_data['current_allocation']
-                    if isinstance(allocation, dict) and allocation:
+                    if isinstance(allocation, Mapping) and allocation:
                         valid_rows += 1
                         for asset, alloc_value in allocation.items():
                             if asset not in allocation_data:
@@ -5,14 +5,18 @@ Basic tests for ReserveFlow simulation framework
 
 import sys
 import os
+import tempfile
 import unittest
+from unittest import mock
 import pandas as pd
 import numpy as np
+import pytest
 
 # Add src to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from reserveflow import ReserveFlowSimulation, DefaultConfig
+from reserveflow import analysis
 from reserveflow.config import CrisisConfig, DepollarizationConfig, InflationSurgeConfig
 from reserveflow.core import (
     ExchangeRateEngine, 
@@ -53,6 +57,20 @@ class TestConfiguration(unittest.TestCase):
         self.assertIsInstance(config_dict, dict)
         self.assertIn('random_seed', config_dict)
         self.assertIn('major_currencies', config_dict)
+    
+    def test_spawn_rngs(self):
+        """Test spawning child generators without Generator.spawn"""
+        from reserveflow.config import make_rng, spawn_rngs
+        
+        children = spawn_rngs(make_rng(42), 3)
+        again = spawn_rngs(make_rng(42), 3)
+        
+        self.assertEqual(len(children), 3)
+        self.assertIsInstance(children[0].bit_generator, np.random.SFC64)
+        draws = [child.random(4) for child in children]
+        for child, expected in zip(again, draws):
+            np.testing.assert_array_equal(child.random(4), expected)
+        self.assertFalse(np.array_equal(draws[0], draws[1]))
 
 
 class TestEngines(unittest.TestCase):
@@ -81,7 +99,27 @@ class TestEngines(unittest.TestCase):
         self.assertIn("exchange_rates", output)
         self.assertIn("volatilities", output)
         self.assertIn("regime", output)
-    
+
+    def test_exchange_rate_cross_rates(self):
+        """Test that every cross rate is the ratio of the two USD rates"""
+        from datetime import datetime
+        engine = ExchangeRateEngine(self.config)
+        engine.initialize()
+        engine.step(datetime.now(), {"geopolitical_risk": 0.3})
+
+        rates = engine.exchange_rates
+        cross_rates = engine.get_all_cross_rates()
+        n = len(engine.currencies)
+        self.assertEqual(len(cross_rates), n * (n - 1))
+        for from_currency in engine.currencies:
+            for to_currency in engine.currencies:
+                if from_currency == to_currency:
+                    continue
+                with self.subTest(pair=f"{from_currency}/{to_currency}"):
+                    expected = rates[from_currency] / rates[to_currency]
+                    self.assertAlmostEqual(cross_rates[f"{from_currency}/{to_currency}"], expected, places=12)
+                    self.assertAlmostEqual(engine.get_cross_rate(from_currency, to_currency), expected, places=12)
+
     def test_precious_metals_engine(self):
         """Test precious metals engine"""
         engine = PreciousMetalsEngine(self.config)
@@ -100,7 +138,47 @@ class TestEngines(unittest.TestCase):
         self.assertIn("silver_price", output)
         self.assertIn("gold_silver_ratio", output)
         self.assertGreater(output["gold_price"], 0)
-    
+
+    def test_precious_metals_monte_carlo_paths(self):
+        """Test simulating many gold and silver price paths at once"""
+        engine = PreciousMetalsEngine(self.config)
+        engine.initialize()
+
+        paths = engine.simulate_paths(100, 60, market_state={"geopolitical_risk": 0.5})
+
+        self.assertEqual(paths["gold_price"].shape, (60, 100))
+        self.assertEqual(paths["silver_return"].shape, (60, 100))
+        self.assertTrue((paths["gold_price"] > 0).all())
+        self.assertTrue((paths["silver_price"] > 0).all())
+        self.assertEqual(engine.gold_price, self.config.initial_gold_price)
+
+        # Without a start date the paths continue from the engine's clock
+        engines = [PreciousMetalsEngine(self.config, random_state=5) for _ in range(2)]
+        for engine in engines:
+            engine.initialize()
+        engines[0].current_time = pd.Timestamp("2020-06-30")
+        continued = engines[0].simulate_paths(3, 60)
+        explicit = engines[1].simulate_paths(3, 60, start_time=pd.Timestamp("2020-07-01"))
+        np.testing.assert_array_equal(continued["silver_price"], explicit["silver_price"])
+
+    def test_precious_metals_time_varying_path(self):
+        """Test that a batched path matches stepping with a time-varying market state"""
+        times = pd.date_range("2020-01-01", periods=30, freq="D")
+        risk = np.linspace(0.1, 0.9, 30)
+
+        batched = PreciousMetalsEngine(self.config, random_state=7)
+        batched.initialize()
+        path = batched.simulate_path(times, {"geopolitical_risk": risk, "usd_index": 95.0})
+
+        stepped = PreciousMetalsEngine(self.config, random_state=7)
+        stepped.initialize()
+        gold_prices = []
+        for i, time in enumerate(times):
+            stepped.step(time, {"geopolitical_risk": risk[i], "usd_index": 95.0})
+            gold_prices.append(stepped.gold_price)
+
+        np.testing.assert_allclose(path["gold_price"].to_numpy(), gold_prices, rtol=1e-10)
+
     def test_geopolitical_engine(self):
         """Test geopolitical risk engine"""
         engine = GeopoliticalRiskEngine(self.config)
@@ -117,7 +195,112 @@ class TestEngines(unittest.TestCase):
         self.assertIn("geopolitical_risk", output)
         self.assertIn("regional_risks", output)
         self.assertBetween(output["geopolitical_risk"], 0, 1)
-    
+        
+        # Regional risks are recorded as one float column per region, in
+        # single precision
+        history = engine.get_history_df()
+        self.assertEqual(history["regional_risks.europe"].dtype, np.float32)
+        self.assertAlmostEqual(history["regional_risks.europe"].iloc[0], output["regional_risks"]["europe"], places=6)
+
+    def test_geopolitical_batch_simulation(self):
+        """Test running the geopolitical engine over a whole horizon at once"""
+        engine = GeopoliticalRiskEngine(self.config)
+        engine.initialize()
+
+        results = engine.simulate(90, market_state={"market_stress": 0.2})
+
+        self.assertEqual(len(results), 90)
+        self.assertIn("geopolitical_risk", results.columns)
+        self.assertIn("asia_pacific", results.columns)
+        self.assertTrue(((results["geopolitical_risk"] >= 0) & (results["geopolitical_risk"] <= 1)).all())
+
+        # Stepping day by day through the same draws reaches the same state
+        stepped = GeopoliticalRiskEngine(self.config, random_state=3)
+        batched = GeopoliticalRiskEngine(self.config, random_state=3)
+        stepped.initialize()
+        batched.initialize()
+        results = batched.simulate(400)
+        stepped.prefill_rng(400)
+        for current_time in results.index:
+            stepped.step(current_time, {})
+        self.assertAlmostEqual(stepped.current_risk, batched.current_risk)
+        self.assertEqual(stepped.active_events, batched.active_events)
+
+    def test_geopolitical_batch_simulation_continues_clock(self):
+        """Test that consecutive batch runs continue the calendar and expire carried events"""
+        engine = GeopoliticalRiskEngine(self.config, random_state=3)
+        engine.initialize()
+        first = engine.simulate(400)
+        self.assertEqual(engine.current_time, first.index[-1])
+        carried = list(engine.active_events)
+        self.assertTrue(carried)
+
+        # With no new events, each carried event stays active through its end date only
+        engine._event_daily_probs[:] = 0.0
+        second = engine.simulate(600)
+        self.assertEqual(second.index[0], first.index[-1] + pd.Timedelta(days=1))
+        self.assertEqual(engine.current_time, second.index[-1])
+        expected = [sum(event.end_date >= day for event in carried) for day in second.index]
+        self.assertEqual(second["active_events"].tolist(), expected)
+        self.assertEqual(engine.active_events, [])
+
+    def test_geopolitical_monte_carlo_paths(self):
+        """Test simulating many geopolitical risk paths at once"""
+        engine = GeopoliticalRiskEngine(self.config)
+        engine.initialize()
+
+        paths = engine.simulate_paths(50, 60)
+
+        self.assertEqual(paths["geopolitical_risk"].shape, (60, 50))
+        self.assertEqual(paths["regional_risks"].shape, (60, 50, len(paths["regions"])))
+        self.assertTrue(((paths["geopolitical_risk"] >= 0) & (paths["geopolitical_risk"] <= 1)).all())
+        self.assertEqual(engine.current_risk, engine.baseline_risk)
+
+    def test_geopolitical_monte_carlo_paths_expire_carried_events(self):
+        """Test that events active on an advanced engine expire on their end dates in every path"""
+        engine = GeopoliticalRiskEngine(self.config, random_state=3)
+        engine.initialize()
+        engine.simulate(400)
+        engine._event_daily_probs[:] = 0.0
+        carried = list(engine.active_events)
+        self.assertTrue(carried)
+
+        # Continuing from the engine's clock, and from an earlier explicit
+        # start, where the events expire further out than the longest duration
+        for start_time in (None, pd.Timestamp(self.config.start_date)):
+            with self.subTest(start_time=start_time):
+                paths = engine.simulate_paths(2, 900, start_time=start_time)
+                first_day = start_time if start_time is not None else engine.current_time + pd.Timedelta(days=1)
+                days = pd.date_range(first_day, periods=900, freq="D")
+                expected = np.array([sum(event.end_date >= day for event in carried) for day in days])
+                np.testing.assert_array_equal(paths["active_events"], np.repeat(expected[:, None], 2, axis=1))
+
+    def test_geopolitical_currency_risk_premiums(self):
+        """Test currency premia against a direct scan of the active events"""
+        from datetime import datetime
+        engine = GeopoliticalRiskEngine(self.config)
+        engine.initialize()
+        # Start one event of every type
+        start = datetime(2024, 1, 1)
+        engine._check_for_events(start, engine._epoch_day(start), np.zeros(len(engine.event_probabilities)))
+        self.assertEqual(len(engine.active_events), len(engine.event_probabilities))
+
+        adjustments = engine._initialize_currency_risk_adjustments()
+        premiums = engine.get_currency_risk_premiums()
+        for currency in ["USD", "EUR", "CNY", "CHF", "RUB", "BRL"]:
+            with self.subTest(currency=currency):
+                event_impact = sum(event.impact for event in engine.active_events
+                                   if currency in event.affected_currencies
+                                   or "all" in event.affected_currencies)
+                expected = engine.current_risk * 0.1 + adjustments.get(currency, 0.0) + event_impact * 0.1
+                self.assertAlmostEqual(engine.get_currency_risk_premium(currency), expected, places=12)
+                if currency in premiums:
+                    self.assertAlmostEqual(premiums[currency], expected, places=12)
+        # Currencies named only by an event type are tabulated too; others
+        # are priced on demand from the "all" events
+        self.assertIn("RUB", premiums)
+        self.assertNotIn("BRL", premiums)
+
     def test_sdr_engine(self):
         """Test SDR engine"""
         engine = SDREngine(self.config)
@@ -133,9 +316,50 @@ class TestEngines(unittest.TestCase):
         market_state = {"exchange_rates": {"EUR": 1.12, "GBP": 1.31}}
         output = engine.step(datetime.now(), market_state)
         
-        self.assertIn("sdr_value_usd", output)
-        self.assertIn("sdr_interest_rate", output)
-    
+        self.assertGreater(output.sdr_value_usd, 0)
+        self.assertAlmostEqual(output.sdr_value_usd, engine.sdr_value_usd)
+        self.assertEqual(list(output.sdr_transactions), engine.sdr_transactions)
+
+    def test_sdr_transaction_running_sums(self):
+        """Test that the running transaction sums track the last 90 and 30 amounts"""
+        engine = SDREngine(self.config)
+        engine.initialize()
+        amounts = np.random.default_rng(1).uniform(10.0, 500.0, 250)
+
+        for n, amount in enumerate(amounts, start=1):
+            engine._record_transaction_amount(amount)
+            if n in (1, 29, 30, 31, 89, 90, 91, 250):
+                with self.subTest(n=n):
+                    self.assertAlmostEqual(engine._txn_sum_window, amounts[max(0, n - 90):n].sum(), places=8)
+                    self.assertAlmostEqual(engine._txn_sum_recent, amounts[max(0, n - 30):n].sum(), places=8)
+
+    def test_reserve_interventions(self):
+        """Test FX intervention triggers, directions and strengths"""
+        # CHF is eligible for intervention but not held in reserves
+        self.config.major_currencies = ["USD", "EUR", "JPY", "GBP", "CNY", "CHF"]
+        engine = ReserveManagementEngine(self.config)
+        engine.initialize()
+        market_state = {"volatilities": {"EUR": 0.08, "GBP": 0.12, "CHF": 0.2}}
+
+        # One trigger uniform per currency, then one direction uniform per currency
+        triggers = [0.0, 0.9, 0.01, 0.9, 0.0]
+        directions = [0.9, 0.1, 0.1, 0.9, 0.9]
+        with mock.patch.object(engine, "next_random_draws",
+                               return_value=(np.empty(0), np.array(triggers + directions))):
+            interventions = engine._calculate_interventions(market_state)
+
+        strength = self.config.intervention_strength
+        allocation = engine.current_allocation
+        self.assertEqual(set(interventions), {"EUR", "GBP", "CHF"})
+        self.assertAlmostEqual(interventions["EUR"], allocation["EUR"] * 0.08 * strength)
+        self.assertAlmostEqual(interventions["GBP"], -allocation["GBP"] * 0.12 * strength)
+        self.assertEqual(interventions["CHF"], 0.0)
+
+        # Nothing triggers when every draw is above the intervention probability
+        with mock.patch.object(engine, "next_random_draws",
+                               return_value=(np.empty(0), np.full(10, 0.99))):
+            self.assertEqual(engine._calculate_interventions(market_state), {})
+
     def assertBetween(self, value, min_val, max_val):
         """Custom assertion for range checking"""
         self.assertGreaterEqual(value, min_val)
@@ -181,6 +405,14 @@ class TestSimulation(unittest.TestCase):
         self.assertTrue(all(results['geopolitical_risk'] >= 0))
         self.assertTrue(all(results['geopolitical_risk'] <= 1))
     
+    def test_results_timestamps(self):
+        """Test that results are indexed by consecutive simulation days"""
+        results = self.sim.run_simulation(duration_months=1)
+
+        self.assertIsInstance(results.index, pd.DatetimeIndex)
+        self.assertEqual(results.index[0], pd.Timestamp(self.config.start_date))
+        self.assertTrue((results.index.to_series().diff().iloc[1:] == pd.Timedelta(days=1)).all())
+
     def test_scenario_runs(self):
         """Test running different scenarios"""
         scenarios = ['baseline', 'crisis', 'dedollarization', 'inflation_surge']
@@ -208,6 +440,57 @@ class TestSimulation(unittest.TestCase):
             self.assertIn('total_return', gold_stats)
             self.assertIn('volatility', gold_stats)
     
+    def test_running_stats_match_results(self):
+        """Test that streamed statistics agree with the results DataFrame"""
+        results = self.sim.run_simulation(duration_months=1)
+        gold = self.sim.running_stats['gold_price']
+        
+        self.assertEqual(gold.count, len(results))
+        self.assertAlmostEqual(gold.mean, results['gold_price'].mean(), places=8)
+        self.assertAlmostEqual(gold.std(), results['gold_price'].std(), places=8)
+        self.assertEqual(gold.first, results['gold_price'].iloc[0])
+        
+        streamed = self.sim.get_summary_statistics()
+        batch = self.sim.get_summary_statistics(results)
+        for metric, value in streamed['gold_stats'].items():
+            self.assertAlmostEqual(value, batch['gold_stats'][metric], places=8)
+    
+    def test_default_scenarios_keep_prices_positive(self):
+        """Test that 12-month default and crisis runs give finite, positive metal prices"""
+        for config in (DefaultConfig(), CrisisConfig()):
+            with self.subTest(config=type(config).__name__):
+                results = ReserveFlowSimulation(config).run_simulation(duration_months=12)
+                for column in ('gold_price', 'silver_price'):
+                    prices = results[column].to_numpy(dtype=np.float64)
+                    self.assertTrue(np.isfinite(prices).all())
+                    self.assertTrue((prices > 0).all())
+
+    def test_result_columns_upcast_and_mark_missing(self):
+        """Test that result columns keep later floats and read missing steps as NaN"""
+        days = np.datetime64('2024-01-01', 'ns') + np.arange(3) * np.timedelta64(1, 'D')
+        self.sim._allocate_results(2)
+        self.sim._record_step({'timestamp': days[0], 'reserves': 12000, 'flag': True})
+        self.sim._record_step({'timestamp': days[1], 'reserves': 12000.5, 'late': 0.25})
+        # Past the preallocated capacity, so the columns grow
+        self.sim._record_step({'timestamp': days[2], 'flag': False})
+        results = self.sim._results_frame()
+
+        self.assertEqual(results['reserves'].dtype, np.float64)
+        np.testing.assert_array_equal(results['reserves'], [12000.0, 12000.5, np.nan])
+        np.testing.assert_array_equal(results['late'], [np.nan, 0.25, np.nan])
+        self.assertEqual(results['flag'].dtype, np.bool_)
+        pd.testing.assert_index_equal(results.index, pd.DatetimeIndex(days, name='timestamp'))
+
+    def test_reset_switches_config(self):
+        """Test that reset rebuilds engines from the new configuration"""
+        self.sim.run_simulation(duration_months=1)
+        self.sim.reset(CrisisConfig(), seed=7)
+
+        self.assertEqual(self.sim.simulation_results, [])
+        self.assertEqual(self.sim.config.random_seed, 7)
+        self.assertEqual(self.sim.geopolitical_engine.baseline_risk,
+                         CrisisConfig().geopolitical_risk_baseline)
+
     def test_reproducibility(self):
         """Test that results are reproducible with same seed"""
         # Run simulation twice with same seed
@@ -228,6 +511,176 @@ class TestSimulation(unittest.TestCase):
             decimal=10
         )
 
+    def test_reproducibility_with_rng(self):
+        """Test that a pre-seeded generator gives reproducible results"""
+        from reserveflow import make_rng
+        
+        results = []
+        for _ in range(2):
+            config = DefaultConfig()
+            config.rng = make_rng(123)
+            results.append(ReserveFlowSimulation(config).run_simulation(duration_months=1))
+        
+        np.testing.assert_array_almost_equal(
+            results[0]['gold_price'].values,
+            results[1]['gold_price'].values,
+            decimal=10
+        )
+
+
+class TestAnalysis(unittest.TestCase):
+    """Test result summary and export helpers"""
+    
+    def setUp(self):
+        """Set up a small results frame and a scratch directory"""
+        self.results = pd.DataFrame(
+            {
+                'gold_price': [2000.0, 2012.3456789012, 1998.75],
+                'market_stress': [0.2, 0.75, 0.9],
+                'exchange_rates': [{'EUR': 1.1}, {'EUR': 1.2}, {'EUR': 1.15}],
+            },
+            index=pd.date_range('2024-01-01', periods=3, freq='D', name='date')
+        )
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+    
+    def test_save_results_csv_round_trip(self):
+        """Test that CSV results read back with the same index and values"""
+        path = os.path.join(self.tmpdir.name, 'results.csv')
+        with mock.patch.object(analysis, 'RESULTS_FORMAT', 'csv'):
+            written = analysis.save_results(self.results, path)
+        
+        self.assertEqual(written, path)
+        loaded = pd.read_csv(written, index_col='date', parse_dates=True)
+        pd.testing.assert_index_equal(loaded.index, self.results.index)
+        np.testing.assert_allclose(loaded['gold_price'], self.results['gold_price'], rtol=1e-9)
+        self.assertEqual(loaded['exchange_rates'].iloc[0], str({'EUR': 1.1}))
+    
+    def test_save_results_csv_float_format(self):
+        """Test that CSV floats are written with the fixed float format"""
+        path = os.path.join(self.tmpdir.name, 'results.csv')
+        with mock.patch.object(analysis, 'RESULTS_FORMAT', 'csv'):
+            analysis.save_results(self.results, path, index=False)
+        
+        with open(path) as f:
+            rows = f.read().splitlines()
+        self.assertEqual(rows[0].split(',')[:2], ['gold_price', 'market_stress'])
+        self.assertEqual(rows[2].split(',')[0],
+                         analysis.CSV_FLOAT_FORMAT % self.results['gold_price'].iloc[1])
+
+    def test_save_results_parquet_round_trip(self):
+        """Test that parquet output swaps the extension and stores nested values as text"""
+        pytest.importorskip("pyarrow")
+        path = os.path.join(self.tmpdir.name, 'results.csv')
+        with mock.patch.object(analysis, 'RESULTS_FORMAT', 'parquet'):
+            written = analysis.save_results(self.results, path)
+        
+        self.assertEqual(written, os.path.join(self.tmpdir.name, 'results.parquet'))
+        loaded = pd.read_parquet(written)
+        pd.testing.assert_series_equal(loaded['gold_price'], self.results['gold_price'],
+                                       check_freq=False)
+        self.assertEqual(loaded['exchange_rates'].tolist(),
+                         [str(value) for value in self.results['exchange_rates']])
+
+    def test_save_results_many(self):
+        """Test saving several frames concurrently, each to its own path"""
+        frames = {
+            os.path.join(self.tmpdir.name, f'{scenario}_results.csv'): self.results.iloc[:n]
+            for n, scenario in enumerate(['baseline', 'crisis', 'dedollarization'], start=1)
+        }
+        with mock.patch.object(analysis, 'RESULTS_FORMAT', 'csv'):
+            written = analysis.save_results_many(frames)
+
+        self.assertEqual(written, {path: path for path in frames})
+        for path, frame in frames.items():
+            loaded = pd.read_csv(path, index_col='date', parse_dates=True)
+            self.assertEqual(len(loaded), len(frame))
+            np.testing.assert_allclose(loaded['market_stress'], frame['market_stress'])
+        self.assertEqual(analysis.save_results_many({}), {})
+
+    def test_save_records_round_trip(self):
+        """Test saving row dicts in CSV and parquet without a DataFrame"""
+        records = [
+            {'scenario': 'baseline', 'gold_return': 0.0123456789012},
+            {'scenario': 'crisis', 'gold_return': 0.25, 'max_stress': 0.9},
+        ]
+        path = os.path.join(self.tmpdir.name, 'comparison.csv')
+        with mock.patch.object(analysis, 'RESULTS_FORMAT', 'csv'):
+            written = analysis.save_records(records, path)
+
+        loaded = pd.read_csv(written)
+        self.assertEqual(list(loaded.columns), ['scenario', 'gold_return', 'max_stress'])
+        self.assertEqual(loaded['scenario'].tolist(), ['baseline', 'crisis'])
+        np.testing.assert_allclose(loaded['gold_return'], [0.0123456789012, 0.25], rtol=1e-9)
+        self.assertTrue(np.isnan(loaded['max_stress'].iloc[0]))
+
+        pytest.importorskip("pyarrow")
+        with mock.patch.object(analysis, 'RESULTS_FORMAT', 'parquet'):
+            written = analysis.save_records(records, path)
+
+        self.assertEqual(written, os.path.join(self.tmpdir.name, 'comparison.parquet'))
+        loaded = pd.read_parquet(written)
+        self.assertEqual(loaded['gold_return'].tolist(), [0.0123456789012, 0.25])
+
+    def test_crisis_days(self):
+        """Test counting steps strictly above a crisis threshold"""
+        self.assertEqual(analysis.crisis_days(self.results), 2)
+        self.assertEqual(analysis.crisis_days(self.results, threshold=0.75), 1)
+        self.assertEqual(analysis.crisis_days(self.results, threshold=0.9), 0)
+        self.assertEqual(analysis.crisis_days(self.results, column='gold_price', threshold=1999.0), 2)
+
+    def test_endpoints(self):
+        """Test reading the first and last values of a column"""
+        self.assertEqual(analysis.endpoints(self.results, 'gold_price'), (2000.0, 1998.75))
+        first, last = analysis.endpoints(self.results, 'exchange_rates')
+        self.assertEqual(first, {'EUR': 1.1})
+        self.assertEqual(last, {'EUR': 1.15})
+
+    def test_as_scalar(self):
+        """Test converting scalars and size-1 arrays to floats"""
+        for value in (1.5, np.float32(1.5), np.array([1.5]), np.array([[1.5]])):
+            with self.subTest(value=value):
+                scalar = analysis.as_scalar(value)
+                self.assertIsInstance(scalar, float)
+                self.assertEqual(scalar, 1.5)
+
+    def test_online_stats_match_numpy(self):
+        """Test that single and batched updates agree with NumPy statistics"""
+        values = np.random.default_rng(0).normal(100.0, 5.0, 500)
+        stats = analysis.OnlineStats(threshold=105.0)
+        for value in values[:200]:
+            stats.update(value)
+        stats.update_many(values[200:450])
+        stats.update_many(values[450:])
+
+        self.assertEqual(stats.count, len(values))
+        self.assertAlmostEqual(stats.mean, np.mean(values), places=10)
+        self.assertAlmostEqual(stats.variance(), np.var(values, ddof=1), places=8)
+        self.assertAlmostEqual(stats.variance(ddof=0), np.var(values), places=8)
+        self.assertAlmostEqual(stats.std(), np.std(values, ddof=1), places=10)
+        self.assertEqual((stats.min, stats.max), (values.min(), values.max()))
+        self.assertEqual((stats.first, stats.last), (values[0], values[-1]))
+        self.assertEqual(stats.above, np.count_nonzero(values > 105.0))
+        self.assertTrue(np.isnan(analysis.OnlineStats().variance()))
+
+
+class TestCLI(unittest.TestCase):
+    """Test command line entry points"""
+
+    def test_precompile_command(self):
+        """Test that precompile succeeds and compiles every numeric kernel"""
+        from reserveflow import cli
+        from reserveflow.core import kernels
+
+        with mock.patch.object(sys, 'argv', ['reserveflow', 'precompile']):
+            self.assertEqual(cli.main(), 0)
+
+        kernel_names = [name for name in dir(kernels) if name.endswith('_kernel')]
+        self.assertTrue(kernel_names)
+        for name in kernel_names:
+            with self.subTest(kernel=name):
+                self.assertTrue(getattr(kernels, name).signatures)
+
 
 class TestVisualization(unittest.TestCase):
     """Test visualization components"""